@@ -17,6 +17,26 @@ from src.application.use_cases.run_realtime_trading import (
     run_realtime_from_exchange,
 )
 
+try:  # pragma: no cover - uvloop есть не во всех окружениях (и не на Windows)
+    import uvloop  # type: ignore[import]
+except Exception:  # pragma: no cover - без uvloop работаем на стандартном цикле
+    uvloop = None  # type: ignore[assignment]
+
+
+def _install_event_loop_policy() -> str:
+    """Поставить uvloop как политику event loop, если он установлен.
+
+    uvloop (libuv) заметно дешевле стандартного цикла asyncio на
+    сетевом I/O websocket‑потока тиков. Без него остаётся штатная
+    политика. Возвращает имя активной реализации цикла.
+    """
+
+    if uvloop is None:
+        return "asyncio"
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return "uvloop"
+
 
 def _parse_cli_pair(argv: list[str]) -> str:
     """Извлечь символ валютной пары из аргументов командной строки.
@@ -33,12 +53,14 @@ def _parse_cli_pair(argv: list[str]) -> str:
         raise SystemExit("Usage: python main.py BTC/USDT")
 
     symbol = argv[1].strip()
-    if "/" not in symbol or symbol.count("/") != 1:
+    if symbol.count("/") != 1:
         raise SystemExit(
             f"Invalid pair symbol: {symbol!r}. Expected format BASE/QUOTE, e.g. BTC/USDT"
         )
 
-    return symbol
+    # Символ интернируется: он становится ключом словарей контекста, и
+    # поиск по нему сводится к сравнению указателей.
+    return sys.intern(symbol)
 
 
 def _run_cli(argv: list[str]) -> None:
@@ -55,6 +77,8 @@ def _run_cli(argv: list[str]) -> None:
 
     try:
         cli_symbol = _parse_cli_pair(argv)
+        loop_impl = _install_event_loop_policy()
+        log_stage("BOOT", "Event loop выбран", loop=loop_impl)
 
         # В текущей версии прототипа точка входа запускает боевой
         # async‑сценарий real‑time торговли. Выбор режима (offline/online)
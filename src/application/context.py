@@ -17,6 +17,7 @@ from src.config.config import AppConfig
 from src.domain.entities.currency_pair import CurrencyPair
 from src.domain.interfaces.cache import IIndicatorStore, IMarketCache
 from src.domain.interfaces.currency_pair_repository import ICurrencyPairRepository
+from src.domain.services.context.state import register_symbol
 from src.infrastructure.cache.in_memory import (
     InMemoryIndicatorStore,
     InMemoryMarketCache,
@@ -65,7 +66,7 @@ def build_context(
         base_symbol=config.symbol,
     )
 
-    active_pairs = list(pair_repository.list_active())
+    active_pairs = pair_repository.list_active()
     log_stage(
         "BOOT",
         "Активные пары, полученные из репозитория",
@@ -77,6 +78,7 @@ def build_context(
         pairs[symbol] = pair
         market_caches[symbol] = InMemoryMarketCache(pair)
         indicator_stores[symbol] = InMemoryIndicatorStore(pair, config)
+        register_symbol(context, symbol)
 
         log_stage(
             "BOOT",
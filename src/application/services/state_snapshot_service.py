@@ -7,6 +7,7 @@ from __future__ import annotations
 контекстом и высокоуровневым сервисом.
 """
 
+import threading
 from typing import Any, Dict
 
 from src.config.config import AppConfig
@@ -21,12 +22,34 @@ class StateSnapshotService:
     Работает поверх :class:`FileStateSnapshotStore` и типизированного
     ``AppConfig``. На этом уровне не знает деталей тик‑конвейера,
     оперирует только ``dict``‑контекстом.
+
+    Запись снапшотов вынесена из торгового цикла по схеме двойного
+    буфера: ``maybe_save`` только подменяет ссылку на «передний»
+    ожидающий снапшот, а фоновый поток забирает его себе («задний»
+    буфер) и пишет во внешнее хранилище. Все снапшоты пишутся под одним
+    ключом и вытесняют друг друга, поэтому ещё не записанный снапшот
+    просто заменяется более новым: тик никогда не ждёт диска, а в памяти
+    живёт не больше двух снапшотов. :meth:`flush` дожидается записи
+    ожидающего снапшота, :meth:`close` дополнительно останавливает
+    поток — его нужно вызывать при остановке конвейера.
     """
 
     def __init__(self, store: IStateSnapshotStore, cfg: AppConfig) -> None:
         self._store = store
         self._cfg = cfg
         self._key = f"{cfg.environment}:{cfg.symbol}"
+        # AppConfig неизменяем, поэтому интервал читаем один раз, а не на
+        # каждом тике; <= 0 сводим к 0 («снапшоты выключены»).
+        self._interval = max(getattr(cfg, "state_snapshot_interval_ticks", 0), 0)
+        # Хранилища с ``batch_save`` пишут через него: агрегированный лог
+        # завершает батч ``fsync``, а одиночный ``save_snapshot`` — нет.
+        self._batch_save = getattr(store, "batch_save", None)
+
+        self._pending: Dict[str, Any] | None = None
+        self._cond = threading.Condition()
+        self._writer: threading.Thread | None = None
+        self._writing = False
+        self._closed = False
 
     def load(self, context: Dict[str, Any]) -> int:
         """Загрузить снапшот и применить его к ``context``.
@@ -64,11 +87,8 @@ class StateSnapshotService:
         ничего не делает.
         """
 
-        interval = getattr(self._cfg, "state_snapshot_interval_ticks", 0)
-        if interval <= 0:
-            return
-
-        if ticker_id % interval != 0:
+        interval = self._interval
+        if not interval or ticker_id % interval:
             return
 
         snapshot = make_state_snapshot(
@@ -76,7 +96,70 @@ class StateSnapshotService:
             symbol=self._cfg.symbol,
             ticker_id=ticker_id,
         )
-        self._store.save_snapshot(self._key, snapshot)
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StateSnapshotService is closed")
+            # Подмена ссылки: незаписанный снапшот заменяется новым.
+            self._pending = snapshot
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop,
+                    name=f"state-snapshot-writer[{self._key}]",
+                    daemon=True,
+                )
+                self._writer.start()
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Дождаться записи ожидающего снапшота."""
+
+        with self._cond:
+            while self._pending is not None or self._writing:
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Записать ожидающий снапшот и остановить фоновый поток."""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        writer = self._writer
+        if writer is not None:
+            writer.join()
+            self._writer = None
+
+    def _write_loop(self) -> None:
+        """Фоновый поток: забирать ожидающий снапшот и писать в store."""
+
+        cond = self._cond
+        while True:
+            with cond:
+                while self._pending is None and not self._closed:
+                    cond.wait()
+                snapshot = self._pending
+                if snapshot is None:
+                    return
+                self._pending = None
+                self._writing = True
+
+            try:
+                if self._batch_save is not None:
+                    self._batch_save({self._key: snapshot})
+                else:
+                    self._store.save_snapshot(self._key, snapshot)
+            except Exception as exc:  # noqa: BLE001 - поток записи не должен падать
+                log_stage(
+                    "ERROR",
+                    "Не удалось сохранить снапшот state",
+                    key=self._key,
+                    ticker_id=snapshot.get("ticker_id"),
+                    error=str(exc),
+                )
+            finally:
+                with cond:
+                    self._writing = False
+                    cond.notify_all()
 
 
 __all__ = ["StateSnapshotService"]
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import List, Sequence
 
 from src.config.config import AppConfig
+from src.domain.entities.action import Action
+from src.domain.entities.tick_event import TickEvent
 from src.domain.services.context.state import (
+    Context,
+    Decision,
     update_market_state,
     update_metrics,
     record_intents,
@@ -34,12 +38,14 @@ class TickPipelineService:
     - В будущем можно отключить подробное логирование одной опцией.
     """
 
+    __slots__ = ("_cfg",)
+
     def __init__(self, cfg: AppConfig) -> None:
         self._cfg = cfg
 
     def process_tick(
         self,
-        context: Dict[str, Any],
+        context: Context,
         *,
         symbol: str,
         ticker_id: int,
@@ -52,6 +58,44 @@ class TickPipelineService:
         и не выполняют внешних операций.
         """
 
+        self._run_stages(context, symbol, ticker_id, price, ts)
+
+        # STATE: обновление агрегированных метрик по конвейеру.
+        log_info(f"📂 [STATE] Обновление метрик | ticker_id: {ticker_id}", _LOG)
+        update_metrics(context, ticker_id=ticker_id)
+
+    def process_batch(self, context: Context, ticks: Sequence[TickEvent]) -> List[Decision]:
+        """Обработать пачку тиков, накопившихся к моменту вызова.
+
+        Каждый тик проходит те же стадии FEEDS → … → EXEC, что и в
+        :meth:`process_tick` (стратегии зависят от истории, поэтому тики
+        идут строго по порядку), а общая бухгалтерия — метрики — обновляется
+        один раз на пачку по последнему тику. Итоговое состояние контекста
+        совпадает с последовательными вызовами ``process_tick``.
+        Возвращает решения по каждому тику пачки.
+        """
+
+        run_stages = self._run_stages
+        decisions = [
+            run_stages(context, event.symbol, event.ticker_id, event.price, event.ts)
+            for event in ticks
+        ]
+        if decisions:
+            last_ticker_id = ticks[-1].ticker_id
+            log_info(f"📂 [STATE] Обновление метрик по пачке | ticker_id: {last_ticker_id} | batch_size: {len(decisions)}", _LOG)
+            update_metrics(context, ticker_id=last_ticker_id)
+        return decisions
+
+    def _run_stages(
+        self,
+        context: Context,
+        symbol: str,
+        ticker_id: int,
+        price: float,
+        ts: int,
+    ) -> Decision:
+        """Стадии одного тика от FEEDS до EXEC (без обновления метрик)."""
+
         # FEEDS: обновление market‑state и тикерного кэша.
         log_info(f"🌐 [FEEDS] Обновление market-state | ticker_id: {ticker_id} | symbol: {symbol} | price: {price:.8f} | ts: {ts}", _LOG)
         update_market_state(context, symbol=symbol, price=price, ts=ts)
@@ -68,6 +112,26 @@ class TickPipelineService:
         has_indicators = bool(indicators)
         log_info(f"🧠 [CTX] Сбор контекста для стратегий | ticker_id: {ticker_id} | symbol: {symbol} | has_indicators: {has_indicators} | positions: {len(positions)}", _LOG)
 
+        # STRAT → ORCH → EXEC одним вызовом.
+        return self.process_and_emit(context, symbol=symbol, ticker_id=ticker_id, price=price)
+
+    def process_and_emit(
+        self,
+        context: Context,
+        *,
+        symbol: str,
+        ticker_id: int,
+        price: float,
+    ) -> Decision:
+        """Стадии STRAT → ORCH → EXEC одним проходом.
+
+        Intents стратегий сразу уходят в оркестратор, решение — в
+        исполнение, без повторного чтения из контекста между стадиями.
+        Intents и решение сохраняются в контекст (они же попадают в
+        историю), поэтому объекты не переиспользуются между тиками.
+        Возвращает принятое решение.
+        """
+
         # STRAT: оценка стратегий и формирование intents.
         log_info(f"🎯 [STRAT] Оценка стратегий | ticker_id: {ticker_id} | symbol: {symbol}", _LOG)
         intents = evaluate_strategies(context, ticker_id=ticker_id, symbol=symbol)
@@ -83,16 +147,29 @@ class TickPipelineService:
         record_decision(context, symbol=symbol, decision=decision)
 
         # EXEC: выполнение торгового решения.
-        if action and action != "HOLD":
+        if action and action != Action.HOLD:
             log_info(f"⚙️ [EXEC] Исполнение решения | ticker_id: {ticker_id} | symbol: {symbol} | action: {action} | reason: {reason}", _LOG)
             execute(decision, context, ticker_id=ticker_id, symbol=symbol)
             log_info(f"⚙️ [EXEC] ✅ Решение исполнено | ticker_id: {ticker_id} | action: {action} | price: {price:.8f}", _LOG)
         else:
             log_info(f"⚙️ [EXEC] HOLD - заявки не отправляются | ticker_id: {ticker_id} | reason: {reason}", _LOG)
 
-        # STATE: обновление агрегированных метрик по конвейеру.
-        log_info(f"📂 [STATE] Обновление метрик | ticker_id: {ticker_id}", _LOG)
-        update_metrics(context, ticker_id=ticker_id)
+        return decision
+
+    def process_event(self, context: Context, event: TickEvent) -> None:
+        """Обработать тик, заданный структурой :class:`TickEvent`.
+
+        Удобно для источников, которые уже держат тик в нормализованном
+        виде: поля читаются как атрибуты слотов, без промежуточного dict.
+        """
+
+        self.process_tick(
+            context,
+            symbol=event.symbol,
+            ticker_id=event.ticker_id,
+            price=event.price,
+            ts=event.ts,
+        )
 
 
 __all__ = ["TickPipelineService"]
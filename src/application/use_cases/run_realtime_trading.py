@@ -1,5 +1,8 @@
 import asyncio
+import sys
 import time
+from dataclasses import dataclass
+from operator import itemgetter
 from typing import List
 
 from src.infrastructure.logging.logging_setup import (
@@ -21,10 +24,12 @@ from src.config.config import load_config, AppConfig
 from src.application.context import build_context
 from src.application.services.ticker_pipeline_service import TickPipelineService
 from src.application.services.state_snapshot_service import StateSnapshotService
+from src.domain.interfaces.state_snapshot_store import IStateSnapshotStore
+from src.infrastructure.state.aggregated_file_state_snapshot_store import AggregatedFileStateSnapshotStore
 from src.infrastructure.state.file_state_snapshot_store import FileStateSnapshotStore
-from src.domain.services.ticker.ticker_source import TickSource
-from src.infrastructure.connectors.ccxt_pro_exchange_connector import (
-    CcxtProExchangeConnector,
+from src.domain.services.ticker.ticker_source import TickSource, TupleTickSource, iter_bursts
+from src.infrastructure.connectors.interfaces.exchange_connector import (
+    IExchangeConnector,
 )
 from src.application.workers.order_book_refresh_worker import (
     order_book_refresh_worker,
@@ -36,6 +41,69 @@ __version__ = "0.1.0"
 # Интервал логирования статистики (каждые N тиков)
 TICKER_LOG_INTERVAL = 10
 
+# Сколько ждать штатного выхода воркера стакана при остановке, прежде
+# чем отменить его (например, если он висит в ``fetch_order_book``).
+_ORDERBOOK_STOP_TIMEOUT_SEC = 1.0
+
+
+@dataclass(slots=True)
+class TickLoopStats:
+    """Счётчики торгового цикла между периодическими сводками.
+
+    Вместо списка длительностей всех тиков интервала держим только
+    агрегаты (count/total/min/max): O(1) памяти и без роста списка
+    на каждом тике. ``__slots__`` даёт быстрый доступ к атрибутам
+    в горячем цикле.
+
+    Сквозные ``ticker_id`` и последняя цена сюда не входят: оба цикла
+    держат их в локальных переменных, которые дешевле атрибутов.
+    """
+
+    count: int = 0
+    total_ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, elapsed_ms: float) -> None:
+        """Учесть длительность обработки одного тика."""
+
+        if self.count == 0:
+            self.min_ms = self.max_ms = elapsed_ms
+        elif elapsed_ms < self.min_ms:
+            self.min_ms = elapsed_ms
+        elif elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.count += 1
+        self.total_ms += elapsed_ms
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def reset_interval(self) -> None:
+        """Сбросить статистику интервала."""
+
+        self.count = 0
+        self.total_ms = self.min_ms = self.max_ms = 0.0
+
+
+def _build_snapshot_store(cfg: AppConfig) -> IStateSnapshotStore:
+    """Создать хранилище снапшотов state по ``cfg.state_snapshot_backend``."""
+
+    if cfg.state_snapshot_backend == "aggregated":
+        if cfg.state_snapshot_compress:
+            log_warning("⚠️ Агрегированный лог снапшотов не сжимается, STATE_SNAPSHOT_COMPRESS игнорируется", _LOG)
+        return AggregatedFileStateSnapshotStore()
+    return FileStateSnapshotStore(compress=cfg.state_snapshot_compress)
+
+
+def _close_snapshot_store(store: IStateSnapshotStore) -> None:
+    """Закрыть хранилище снапшотов, если оно держит ресурсы (файл лога)."""
+
+    close = getattr(store, "close", None)
+    if close is not None:
+        close()
+
 
 def run_demo_offline(
     pair_repository: ICurrencyPairRepository | None = None,
@@ -53,7 +121,7 @@ def run_demo_offline(
     Используются:
 
     * ``generate_ticks`` – фейковый генератор тиков;
-    * ``update_orderflow_from_tick`` – симуляция стакана/ордерфлоу;
+    * ``make_orderflow_handler`` – симуляция стакана/ордерфлоу;
     * ``TickPipelineService`` – чистый конвейер обработки тика;
     * ``StateSnapshotService`` – загрузка/сохранение состояния.
 
@@ -96,7 +164,7 @@ def run_demo_offline(
     log_info("✅ Контекст обогащён кэшами и CurrencyPair (build_context)", _LOG)
 
     # --- Загрузка state из снапшота (если есть) ---
-    snapshot_store = FileStateSnapshotStore()
+    snapshot_store = _build_snapshot_store(cfg)
     snapshot_svc = StateSnapshotService(snapshot_store, cfg)
     loaded_ticker_id = snapshot_svc.load(context)
 
@@ -129,19 +197,21 @@ def run_demo_offline(
     log_info("🔄 Начинаем основной торговый цикл (offline demo)...", _LOG)
 
     start_ts = time.time()
+    stats = TickLoopStats()
     ticker_id = loaded_ticker_id
     last_price = 0.0
 
-    # Статистика для периодических сводок
-    ticker_times: list[float] = []
-
     # Локальный импорт симулятора стакана, чтобы он не «подтягивался»
     # в модульный scope и не был доступен боевому сценарию
     # run_realtime_from_exchange.
     from src.domain.services.market_data.orderflow_simulator import (
-        update_orderflow_from_tick,
+        make_orderflow_handler,
     )
 
+    # Демо гоняет один символ, поэтому обработчик симуляции собирается
+    # один раз: кэш и пара уже замкнуты в нём, без поиска по context.
+    simulate_orderflow = make_orderflow_handler(context, cfg.symbol)
+
     try:
         for ticker in generate_ticks(
             cfg.symbol, max_ticks=cfg.max_ticks, sleep_sec=cfg.ticker_sleep_sec
@@ -154,12 +224,8 @@ def run_demo_offline(
             ts = ticker["ts"]
 
             # Симуляция стакана/ордерфлоу (только для демо)
-            update_orderflow_from_tick(
-                context,
-                symbol=symbol,
-                price=price,
-                ts=ts,
-            )
+            if simulate_orderflow is not None:
+                simulate_orderflow(price, ts)
 
             # Весь остальной конвейер по тику выполняет TickPipelineService.
             pipeline.process_tick(
@@ -174,26 +240,22 @@ def run_demo_offline(
             snapshot_svc.maybe_save(context, ticker_id=ticker_id)
 
             # Замер времени обработки
-            ticker_elapsed = (time.time() - ticker_start) * 1000  # ms
-            ticker_times.append(ticker_elapsed)
+            stats.add((time.time() - ticker_start) * 1000)  # ms
 
             # Периодическая сводка каждые TICKER_LOG_INTERVAL тиков
             if ticker_id % TICKER_LOG_INTERVAL == 0:
                 elapsed = time.time() - start_ts
                 tps = ticker_id / elapsed if elapsed > 0 else 0.0
-                avg_time = sum(ticker_times) / len(ticker_times) if ticker_times else 0.0
-                min_time = min(ticker_times) if ticker_times else 0.0
-                max_time = max(ticker_times) if ticker_times else 0.0
 
                 log_info(
                     f"📊 Тик {ticker_id} | Цена: {price:.8f} | "
-                    f"TPS: {tps:.1f} | Среднее время: {avg_time:.1f}ms | "
-                    f"Мин/Макс: {min_time:.1f}/{max_time:.1f}ms",
+                    f"TPS: {tps:.1f} | Среднее время: {stats.avg_ms:.1f}ms | "
+                    f"Мин/Макс: {stats.min_ms:.1f}/{stats.max_ms:.1f}ms",
                     _LOG
                 )
 
                 # Сбрасываем статистику для следующего интервала
-                ticker_times.clear()
+                stats.reset_interval()
 
     except KeyboardInterrupt:
         log_warning(f"⚠️ Прерывание по Ctrl+C на тике {ticker_id}", _LOG)
@@ -201,6 +263,10 @@ def run_demo_offline(
         log_warning(f"❌ Критическая ошибка в торговом цикле: {type(exc).__name__}: {exc}", _LOG)
         raise
     finally:
+        # Дописываем отложенные снапшоты и останавливаем поток записи.
+        snapshot_svc.close()
+        _close_snapshot_store(snapshot_store)
+
         # Финальная сводка при остановке
         elapsed = time.time() - start_ts
         log_separator(_LOG)
@@ -214,11 +280,12 @@ def run_demo_offline(
 
 
 async def _run_order_book_refresh_worker(
-    connector: CcxtProExchangeConnector,
+    connector: IExchangeConnector,
     context: dict,
     cfg: AppConfig,
     *,
     symbol: str,
+    stop_event: asyncio.Event | None = None,
 ) -> None:
     """Вспомогательная обёртка для запуска воркера стакана.
 
@@ -236,12 +303,13 @@ async def _run_order_book_refresh_worker(
         market_cache,
         symbol,
         cfg,
+        stop_event=stop_event,
     )
 
 
 async def _run_realtime_core(
     *,
-    ticker_source: TickSource,
+    ticker_source: TickSource | TupleTickSource,
     pipeline: TickPipelineService,
     snapshot_svc: StateSnapshotService,
     context: dict,
@@ -263,57 +331,80 @@ async def _run_realtime_core(
 
     loop = asyncio.get_event_loop()
     start_ts = loop.time()
+    stats = TickLoopStats()
     ticker_id = start_ticker_id
     last_price = 0.0
-
-    # Статистика для периодических сводок
-    ticker_times: list[float] = []
+    # Символ — ключ словарей контекста на каждом тике; интернированная
+    # строка сравнивается с ключами по указателю.
+    symbol = sys.intern(symbol)
+
+    # Горячий цикл: связываем методы и поля тика с локальными именами
+    # заранее, чтобы не платить за LOAD_ATTR/LOAD_GLOBAL на каждом тике.
+    now = loop.time
+    process_tick = pipeline.process_tick
+    maybe_save = snapshot_svc.maybe_save
+    add_elapsed = stats.add
+    get_fields = itemgetter("timestamp", "last")
+    bursts = None
 
     try:
-        async for ticker in ticker_source.stream():
-            ticker_start = loop.time()
-            ticker_id += 1
-
-            price = float(ticker["last"])
-            last_price = price
-            ts = ticker["timestamp"] or int(loop.time() * 1000)
-
-            # Обработка тика через конвейер (без отдельного лога на каждый тик)
-            pipeline.process_tick(
-                context,
-                symbol=symbol,
-                ticker_id=ticker_id,
-                price=price,
-                ts=ts,
-            )
+        # Источник с stream_batches() отдаёт пачки уже пришедших тиков:
+        # одно ожидание event loop на пачку вместо одного на каждый тик.
+        stream_batches = getattr(ticker_source, "stream_batches", None)
+        bursts = stream_batches() if stream_batches is not None else iter_bursts(ticker_source.stream())
+
+        async for burst in bursts:
+            for ticker in burst:
+                ticker_start = now()
+                ticker_id += 1
+
+                # Быстрый путь для TupleTickSource: (symbol, timestamp, last).
+                if type(ticker) is tuple:
+                    _, ts, last = ticker
+                else:
+                    ts, last = get_fields(ticker)
+                price = float(last)
+                last_price = price
+                ts = ts or int(now() * 1000)
+
+                # Обработка тика через конвейер (без отдельного лога на каждый тик)
+                process_tick(
+                    context,
+                    symbol=symbol,
+                    ticker_id=ticker_id,
+                    price=price,
+                    ts=ts,
+                )
 
-            snapshot_svc.maybe_save(context, ticker_id=ticker_id)
+                maybe_save(context, ticker_id=ticker_id)
 
-            # Замер времени обработки
-            ticker_elapsed = (loop.time() - ticker_start) * 1000  # ms
-            ticker_times.append(ticker_elapsed)
+                # Замер времени обработки
+                add_elapsed((now() - ticker_start) * 1000)  # ms
 
-            # Периодическая сводка каждые TICKER_LOG_INTERVAL тиков
-            # Формат как в bad_example:
-            # 📊 Тик 100 | Цена: 0.45800000 | TPS: 0.9 | Среднее время: 0.0ms | Мин/Макс: 0.0/1.6ms
-            if ticker_id % TICKER_LOG_INTERVAL == 0:
-                elapsed = loop.time() - start_ts
-                tps = ticker_id / elapsed if elapsed > 0 else 0.0
-                avg_time = sum(ticker_times) / len(ticker_times) if ticker_times else 0.0
-                min_time = min(ticker_times) if ticker_times else 0.0
-                max_time = max(ticker_times) if ticker_times else 0.0
+                # Периодическая сводка каждые TICKER_LOG_INTERVAL тиков
+                # Формат как в bad_example:
+                # 📊 Тик 100 | Цена: 0.45800000 | TPS: 0.9 | Среднее время: 0.0ms | Мин/Макс: 0.0/1.6ms
+                if ticker_id % TICKER_LOG_INTERVAL == 0:
+                    elapsed = loop.time() - start_ts
+                    tps = ticker_id / elapsed if elapsed > 0 else 0.0
 
-                log_info(
-                    f"📊 Тик {ticker_id} | Цена: {price:.8f} | "
-                    f"TPS: {tps:.1f} | Среднее время: {avg_time:.1f}ms | "
-                    f"Мин/Макс: {min_time:.1f}/{max_time:.1f}ms",
-                    _LOG
-                )
+                    log_info(
+                        f"📊 Тик {ticker_id} | Цена: {price:.8f} | "
+                        f"TPS: {tps:.1f} | Среднее время: {stats.avg_ms:.1f}ms | "
+                        f"Мин/Макс: {stats.min_ms:.1f}/{stats.max_ms:.1f}ms",
+                        _LOG
+                    )
 
-                # Сбрасываем статистику для следующего интервала
-                ticker_times.clear()
+                    # Сбрасываем статистику для следующего интервала
+                    stats.reset_interval()
 
     finally:
+        # Закрываем поток пачек явно, чтобы остановить фоновую перекачку
+        # тиков сразу, а не при сборке мусора.
+        aclose = getattr(bursts, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
         # Финальная сводка при остановке
         elapsed = loop.time() - start_ts
         log_separator(_LOG)
@@ -361,7 +452,7 @@ async def run_realtime_from_exchange(symbol: str | None = None) -> None:
     context = build_context(cfg, context, pair_repository=pair_repo)
     log_info("✅ Контекст обогащён кэшами и CurrencyPair (build_context)", _LOG)
 
-    snapshot_store = FileStateSnapshotStore()
+    snapshot_store = _build_snapshot_store(cfg)
     snapshot_svc = StateSnapshotService(snapshot_store, cfg)
     loaded_ticker_id = snapshot_svc.load(context)
 
@@ -378,6 +469,12 @@ async def run_realtime_from_exchange(symbol: str | None = None) -> None:
         log_info("📦 Снапшот не найден, старт с нуля", _LOG)
 
     # Сетевой коннектор и источник тиков
+    # ccxt.pro тяжёлый при импорте, поэтому подключаем коннектор только
+    # в боевом сценарии, а не при импорте модуля (тесты, offline‑демо).
+    from src.infrastructure.connectors.ccxt_pro_exchange_connector import (
+        CcxtProExchangeConnector,
+    )
+
     connector = CcxtProExchangeConnector(cfg)
     ticker_source = TickSource(connector, symbol=active_symbol)
 
@@ -385,8 +482,11 @@ async def run_realtime_from_exchange(symbol: str | None = None) -> None:
     log_info(f"✅ Коннектор инициализирован ({cfg.exchange_id}, {mode_str})", _LOG)
 
     # Воркер стакана
+    orderbook_stop = asyncio.Event()
     orderbook_task = asyncio.create_task(
-        _run_order_book_refresh_worker(connector, context, cfg, symbol=active_symbol)
+        _run_order_book_refresh_worker(
+            connector, context, cfg, symbol=active_symbol, stop_event=orderbook_stop
+        )
     )
     log_info("✅ Воркер стакана запущен", _LOG)
 
@@ -418,7 +518,14 @@ async def run_realtime_from_exchange(symbol: str | None = None) -> None:
             start_ticker_id=0,
         )
     finally:
-        orderbook_task.cancel()
+        snapshot_svc.close()
+        _close_snapshot_store(snapshot_store)
+        # Воркер стакана выходит по событию сразу, если не ждёт ответа
+        # биржи; зависший ``fetch_order_book`` отменяем по таймауту.
+        orderbook_stop.set()
+        await asyncio.wait((orderbook_task,), timeout=_ORDERBOOK_STOP_TIMEOUT_SEC)
+        if not orderbook_task.done():
+            orderbook_task.cancel()
         try:
             await orderbook_task
         except asyncio.CancelledError:
@@ -7,7 +7,6 @@ from __future__ import annotations
 """
 
 import asyncio
-from collections.abc import Callable
 
 from src.config.config import AppConfig
 from src.domain.interfaces.cache import IMarketCache
@@ -23,7 +22,7 @@ async def order_book_refresh_worker(
     symbol: str,
     config: AppConfig,
     *,
-    is_stopped: Callable[[], bool] | None = None,
+    stop_event: asyncio.Event | None = None,
 ) -> None:
     """Простейший асинхронный воркер обновления стакана.
 
@@ -31,6 +30,11 @@ async def order_book_refresh_worker(
     результат в ``market_cache.update_orderbook``. Интервал обновления
     задаётся полем ``order_book_refresh_interval_seconds`` конфигурации.
 
+    Остановка — через ``stop_event``: пауза между обновлениями — это
+    ожидание события с таймаутом ``interval``, поэтому воркер выходит
+    сразу после ``stop_event.set()``, а не после очередного ``sleep`` и
+    без опроса флага на каждой итерации.
+
     В реальной реализации сюда стоит добавить подробный ``try/except``,
     backoff и более сложную стратегию восстановления соединения.
     """
@@ -44,18 +48,25 @@ async def order_book_refresh_worker(
         interval=interval,
     )
 
+    if stop_event is None:
+        stop_event = asyncio.Event()
+
     while True:
         # Всегда делаем хотя бы одну попытку обновления стакана, даже если
-        # флаг остановки уже поднят – это упрощает использование воркера в
-        # unit‑тестах и при кратковременных джобах.
+        # событие остановки уже поднято – это упрощает использование
+        # воркера в unit‑тестах и при кратковременных джобах.
         order_book = await connector.fetch_order_book(symbol)
         market_cache.update_orderbook(order_book)
 
-        if is_stopped is not None and is_stopped():
-            log_stage("STOP", "Остановка воркера обновления стакана", symbol=symbol)
+        if stop_event.is_set():
             break
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except TimeoutError:
+            continue
+        break
 
-        await asyncio.sleep(interval)
+    log_stage("STOP", "Остановка воркера обновления стакана", symbol=symbol)
 
 
 __all__ = ["order_book_refresh_worker"]
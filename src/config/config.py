@@ -17,18 +17,22 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, Tuple
 
 from src.infrastructure.logging.logging_setup import log_stage
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     """Конфигурация раннего прототипа.
 
     На этом этапе сюда выносятся только действительно необходимые
     параметры. При развитии прототипа класс можно расширять, но
     стараться не тянуть внутрь бизнес‑логику.
+
+    Конфиг неизменяем: один экземпляр безопасно разделяется между
+    сервисами и потоками, а точечные переопределения делаются через
+    ``dataclasses.replace(cfg, ...)``.
     """
 
     # Общие параметры окружения
@@ -73,6 +77,12 @@ class AppConfig:
     # отключает периодическое сохранение снапшотов.
     state_snapshot_interval_ticks: int = 100
 
+    # Сжимать файловые снапшоты state zstd (нужен пакет ``zstandard``).
+    state_snapshot_compress: bool = False
+    # Backend снапшотов state: ``file`` — файл на ключ, ``aggregated`` —
+    # общий append‑only лог (сжатие к нему не применяется).
+    state_snapshot_backend: str = "file"
+
     def validate(self) -> None:
         """Проверить базовые инварианты конфига.
 
@@ -81,24 +91,11 @@ class AppConfig:
         с некорректными настройками.
         """
 
-        if self.indicator_fast_interval < 1:
-            raise ValueError("indicator_fast_interval must be >= 1")
-
-        if self.indicator_medium_interval < 1:
-            raise ValueError("indicator_medium_interval must be >= 1")
-
-        if self.indicator_heavy_interval < 1:
-            raise ValueError("indicator_heavy_interval must be >= 1")
-
-        if self.indicator_medium_interval < self.indicator_fast_interval:
-            raise ValueError(
-                "indicator_medium_interval must be >= indicator_fast_interval"
-            )
-
-        if self.indicator_heavy_interval < self.indicator_medium_interval:
-            raise ValueError(
-                "indicator_heavy_interval must be >= indicator_medium_interval"
-            )
+        fast = self.indicator_fast_interval
+        medium = self.indicator_medium_interval
+        heavy = self.indicator_heavy_interval
+        if not 1 <= fast <= medium <= heavy:
+            raise ValueError(_format_interval_error(fast, medium, heavy))
 
         if self.max_ticks <= 0:
             raise ValueError("max_ticks must be > 0")
@@ -112,6 +109,29 @@ class AppConfig:
         if self.state_snapshot_interval_ticks < 0:
             raise ValueError("state_snapshot_interval_ticks must be >= 0")
 
+        if self.state_snapshot_backend not in _STATE_SNAPSHOT_BACKENDS:
+            raise ValueError("state_snapshot_backend must be 'file' or 'aggregated'")
+
+
+_STATE_SNAPSHOT_BACKENDS = frozenset({"file", "aggregated"})
+
+
+def _format_interval_error(fast: int, medium: int, heavy: int) -> str:
+    """Сообщение о первом нарушенном инварианте интервалов индикаторов.
+
+    Вызывается только при ошибке валидации.
+    """
+
+    if fast < 1:
+        return "indicator_fast_interval must be >= 1"
+    if medium < 1:
+        return "indicator_medium_interval must be >= 1"
+    if heavy < 1:
+        return "indicator_heavy_interval must be >= 1"
+    if medium < fast:
+        return "indicator_medium_interval must be >= indicator_fast_interval"
+    return "indicator_heavy_interval must be >= indicator_medium_interval"
+
 
 def _parse_int(value: str | None, default: int) -> int:
     if value is None or value == "":
@@ -145,6 +165,42 @@ def _parse_bool(value: str | None, default: bool) -> bool:
     raise ValueError(f"Invalid bool value in env: {value!r}") from None
 
 
+def _parse_str(value: str | None, default: str) -> str:
+    # Пустая строка в env трактуется как «не задано».
+    return value or default
+
+
+# ``src/config/config.py`` -> корень проекта
+_ROOT_DIR = Path(__file__).resolve().parents[2]
+
+_EnvParser = Callable[[Any, Any], Any]
+
+# Таблица «переменная окружения → (парсер, поле AppConfig)». Env
+# переопределяет значения по умолчанию; пустое значение трактуется как
+# «не задано».
+_ENV_SPEC: Tuple[Tuple[str, _EnvParser, str], ...] = (
+    ("APP_ENV", _parse_str, "environment"),
+    ("INDICATOR_FAST_INTERVAL", _parse_int, "indicator_fast_interval"),
+    ("INDICATOR_MEDIUM_INTERVAL", _parse_int, "indicator_medium_interval"),
+    ("INDICATOR_HEAVY_INTERVAL", _parse_int, "indicator_heavy_interval"),
+    ("EXCHANGE_ID", _parse_str, "exchange_id"),
+    ("EXCHANGE_SANDBOX_MODE", _parse_bool, "sandbox_mode"),
+    ("ORDER_BOOK_REFRESH_INTERVAL_SECONDS", _parse_float, "order_book_refresh_interval_seconds"),
+    ("STATE_SNAPSHOT_INTERVAL_TICKS", _parse_int, "state_snapshot_interval_ticks"),
+    ("STATE_SNAPSHOT_COMPRESS", _parse_bool, "state_snapshot_compress"),
+    ("STATE_SNAPSHOT_BACKEND", _parse_str, "state_snapshot_backend"),
+)
+
+# Поля, которые можно задать и аргументом ``load_config``: аргумент
+# используется, только если переменной окружения нет.
+_ENV_OR_ARG_SPEC: Tuple[Tuple[str, _EnvParser, str], ...] = (
+    ("MAX_TICKS", _parse_int, "max_ticks"),
+    ("TICKER_SLEEP_SEC", _parse_float, "ticker_sleep_sec"),
+)
+
+# Значения по умолчанию для парсеров (только чтение).
+_DEFAULTS = AppConfig()
+
 _ENV_LOADED = False
 
 
@@ -165,9 +221,7 @@ def _load_local_env_file() -> None:
 
     _ENV_LOADED = True
 
-    # ``src/config/config.py`` -> корень проекта
-    root_dir = Path(__file__).resolve().parents[2]
-    env_path = root_dir / ".env"
+    env_path = _ROOT_DIR / ".env"
 
     if not env_path.is_file():
         return
@@ -198,6 +252,34 @@ def _load_local_env_file() -> None:
         return
 
 
+def _read_key_file(var_name: str) -> str | None:
+    """Прочитать API‑ключ из файла, путь к которому задан в env.
+
+    Путь может быть как абсолютным, так и относительным к корню
+    репозитория.
+    """
+
+    path_value = os.getenv(var_name)
+    if not path_value:
+        return None
+
+    file_path = Path(path_value)
+    if not file_path.is_absolute():
+        file_path = _ROOT_DIR / file_path
+
+    try:
+        return file_path.read_text(encoding="utf-8").strip()
+    except OSError as exc:  # pragma: no cover - защита от средовых ошибок
+        log_stage(
+            "WARN",
+            "Не удалось прочитать файл API‑ключа",
+            env_var=var_name,
+            path=str(file_path),
+            error=str(exc),
+        )
+        return None
+
+
 def load_config(
     *,
     # Параметры могут уточнять конфиг, но не перекрывают env.
@@ -223,12 +305,13 @@ def load_config(
     # Перед чтением os.getenv подгружаем локальный .env (если есть)
     _load_local_env_file()
 
-    base = AppConfig()
+    environ = os.environ
+    overrides: Dict[str, Any] = {}
 
-    # environment
-    env_environment = os.getenv("APP_ENV")
-    if env_environment:
-        base.environment = env_environment
+    for env_key, parse, attr in _ENV_SPEC:
+        value = environ.get(env_key)
+        if value is not None:
+            overrides[attr] = parse(value, getattr(_DEFAULTS, attr))
 
     # symbol
     # На этом этапе **одна** торговая пара берётся либо из значений по
@@ -237,100 +320,32 @@ def load_config(
     # точкой агрегации оставалась CurrencyPair через репозиторий, а не
     # сырые строки из env.
     if symbol is not None:
-        base.symbol = symbol
-
-    # max_ticks
-    env_max_ticks = os.getenv("MAX_TICKS")
-    if env_max_ticks is not None:
-        # Env имеет наивысший приоритет
-        base.max_ticks = _parse_int(env_max_ticks, base.max_ticks)
-    elif max_ticks is not None:
-        base.max_ticks = max_ticks
-
-    # ticker_sleep_sec
-    env_ticker_sleep = os.getenv("TICKER_SLEEP_SEC")
-    if env_ticker_sleep is not None:
-        base.ticker_sleep_sec = _parse_float(env_ticker_sleep, base.ticker_sleep_sec)
-    elif ticker_sleep_sec is not None:
-        base.ticker_sleep_sec = ticker_sleep_sec
-
-    # indicator intervals
-    env_fast = os.getenv("INDICATOR_FAST_INTERVAL")
-    env_medium = os.getenv("INDICATOR_MEDIUM_INTERVAL")
-    env_heavy = os.getenv("INDICATOR_HEAVY_INTERVAL")
-
-    base.indicator_fast_interval = _parse_int(
-        env_fast, base.indicator_fast_interval
-    )
-    base.indicator_medium_interval = _parse_int(
-        env_medium, base.indicator_medium_interval
-    )
-    base.indicator_heavy_interval = _parse_int(
-        env_heavy, base.indicator_heavy_interval
-    )
-
-    # exchange / connector settings (env только переопределяет дефолты)
-    env_exchange_id = os.getenv("EXCHANGE_ID")
-    if env_exchange_id:
-        base.exchange_id = env_exchange_id
-
-    env_sandbox = os.getenv("EXCHANGE_SANDBOX_MODE")
-    base.sandbox_mode = _parse_bool(env_sandbox, base.sandbox_mode)
-
-    env_ob_interval = os.getenv("ORDER_BOOK_REFRESH_INTERVAL_SECONDS")
-    base.order_book_refresh_interval_seconds = _parse_float(
-        env_ob_interval,
-        base.order_book_refresh_interval_seconds,
-    )
+        overrides["symbol"] = symbol
+
+    # max_ticks / ticker_sleep_sec: env имеет наивысший приоритет
+    explicit = {"max_ticks": max_ticks, "ticker_sleep_sec": ticker_sleep_sec}
+    for env_key, parse, attr in _ENV_OR_ARG_SPEC:
+        value = environ.get(env_key)
+        if value is not None:
+            overrides[attr] = parse(value, getattr(_DEFAULTS, attr))
+        elif explicit[attr] is not None:
+            overrides[attr] = explicit[attr]
 
     # --- API‑ключи биржи ---
     # Приоритет: прямые значения в env, затем файлы.
-    env_api_key = os.getenv("EXCHANGE_API_KEY")
-    env_api_secret = os.getenv("EXCHANGE_API_SECRET")
-
-    # Вспомогательная функция для чтения ключей из файла. Путь может быть
-    # как абсолютным, так и относительным к корню репозитория.
-    def _read_key_file(var_name: str) -> str | None:
-        path_value = os.getenv(var_name)
-        if not path_value:
-            return None
-
-        root_dir = Path(__file__).resolve().parents[2]
-        file_path = Path(path_value)
-        if not file_path.is_absolute():
-            file_path = root_dir / file_path
-
-        try:
-            return file_path.read_text(encoding="utf-8").strip()
-        except OSError as exc:  # pragma: no cover - защита от средовых ошибок
-            log_stage(
-                "WARN",
-                "Не удалось прочитать файл API‑ключа",
-                env_var=var_name,
-                path=str(file_path),
-                error=str(exc),
-            )
-            return None
-
-    if env_api_key is not None:
-        base.exchange_api_key = env_api_key
-    else:
-        file_key = _read_key_file("EXCHANGE_API_KEY_FILE")
-        if file_key is not None:
-            base.exchange_api_key = file_key
-
-    if env_api_secret is not None:
-        base.exchange_api_secret = env_api_secret
-    else:
-        file_secret = _read_key_file("EXCHANGE_API_SECRET_FILE")
-        if file_secret is not None:
-            base.exchange_api_secret = file_secret
-
-    # state snapshot interval (env переопределяет дефолт)
-    env_snapshot_interval = os.getenv("STATE_SNAPSHOT_INTERVAL_TICKS")
-    base.state_snapshot_interval_ticks = _parse_int(
-        env_snapshot_interval, base.state_snapshot_interval_ticks
-    )
+    api_key = environ.get("EXCHANGE_API_KEY")
+    if api_key is None:
+        api_key = _read_key_file("EXCHANGE_API_KEY_FILE")
+    if api_key is not None:
+        overrides["exchange_api_key"] = api_key
+
+    api_secret = environ.get("EXCHANGE_API_SECRET")
+    if api_secret is None:
+        api_secret = _read_key_file("EXCHANGE_API_SECRET_FILE")
+    if api_secret is not None:
+        overrides["exchange_api_secret"] = api_secret
+
+    base = AppConfig(**overrides)
 
     # Финальная проверка инвариантов
     base.validate()
@@ -1,5 +1,7 @@
 """Domain entities."""
 
+from .action import Action
 from .currency_pair import CurrencyPair
+from .tick_event import TickEvent
 
-__all__ = ["CurrencyPair"]
+__all__ = ["Action", "CurrencyPair", "TickEvent"]
@@ -0,0 +1,20 @@
+"""Action entity: допустимые действия intents и решений оркестратора."""
+
+from __future__ import annotations
+
+from enum import StrEnum
+
+
+class Action(StrEnum):
+    """Действие стратегии/оркестратора.
+
+    ``StrEnum`` вместо строковых литералов: член перечисления и есть
+    строка, поэтому сравнение ``action != Action.HOLD`` остаётся
+    C‑уровневым сравнением строк, intents из снапшотов (обычные строки)
+    сравниваются с ним без преобразований, а ``json.dumps`` пишет
+    значение как есть.
+    """
+
+    HOLD = "HOLD"
+    BUY = "BUY"
+    SELL = "SELL"
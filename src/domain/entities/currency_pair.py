@@ -1,7 +1,70 @@
 """CurrencyPair entity with trading and cache settings."""
 
+import inspect
 import time
-from typing import Literal
+from typing import Any, Literal
+
+
+# Порядок полей совпадает с форматом :meth:`CurrencyPair.to_dict`.
+_FIELDS: tuple[str, ...] = (
+    "pair_id",
+    "symbol",
+    "base_currency",
+    "quote_currency",
+    "enabled",
+    # Trading
+    "deal_quota",
+    "profit_markup",
+    "deal_count",
+    "order_life_time",
+    # Exchange
+    "min_step",
+    "price_step",
+    # Cache
+    "bar_timeframe",
+    "bar_window_size",
+    "orderbook_depth",
+    "trades_history_size",
+    "indicator_window_size",
+    # Meta
+    "created_at",
+    "updated_at",
+)
+_FIELD_SET = frozenset(_FIELDS)
+
+# Служебные атрибуты экземпляра, не входящие в сериализованную форму.
+_PRIVATE_ATTRS: tuple[str, ...] = ("_cache_mb", "_repr")
+
+# Поля, от которых зависит :meth:`CurrencyPair.estimate_cache_size_mb`.
+_CACHE_SIZE_FIELDS = frozenset(
+    ("orderbook_depth", "trades_history_size", "bar_window_size", "indicator_window_size")
+)
+
+# Поля, попадающие в ``repr`` (вместе с оценкой размера кеша).
+_REPR_FIELDS = frozenset(("symbol", "deal_quota", "profit_markup", "deal_count")) | _CACHE_SIZE_FIELDS
+
+
+def _slot_name(name: str) -> str:
+    """Имя слота поля: поля из ``repr`` хранятся в приватных слотах ``_<name>``."""
+
+    return f"_{name}" if name in _REPR_FIELDS else name
+
+
+def _check_invariants(symbol: str, min_step: float, price_step: float) -> None:
+    # Символ всегда в формате BASE/QUOTE. Это базовый инвариант,
+    # вокруг которого строится вся конфигурация процесса
+    # (один процесс = одна пара). На раннем этапе фиксируем только
+    # наличие разделителя, без агрессивного парсинга.
+    if "/" not in symbol:
+        raise ValueError("CurrencyPair.symbol must be in 'BASE/QUOTE' format")
+
+    # Биржевые шаги количества и цены должны быть строго > 0.
+    # Это отражает контракт с провайдером прецизионов и защищает
+    # от конфигураций, при которых расчёт объёма/цены теряет смысл.
+    if min_step <= 0:
+        raise ValueError("CurrencyPair.min_step must be > 0")
+    if price_step <= 0:
+        raise ValueError("CurrencyPair.price_step must be > 0")
 
 
 class CurrencyPair:
@@ -11,8 +74,20 @@ class CurrencyPair:
     - Торговые настройки (из bad_example config.json)
     - Настройки кеша рыночных данных (стакан, трейды, бары)
     - Технические параметры биржи (шаги цены и количества)
+
+    Атрибуты объявлены через ``__slots__``: у пары нет per‑instance
+    ``__dict__``, а чтение полей вроде ``pair.trades_history_size`` в
+    кэшах идёт через дескриптор слота, без поиска по словарю. Пара
+    остаётся изменяемой — репозиторий подменяет прецизионы и флаг
+    ``enabled`` на месте.
+
+    Поля из ``repr`` (и размеры кешей) доступны через свойства, сеттер
+    которых сбрасывает закэшированные ``repr`` и оценку размера кеша;
+    остальные поля пишутся напрямую в слоты.
     """
 
+    __slots__ = tuple(_slot_name(name) for name in _FIELDS) + _PRIVATE_ATTRS
+
     def __init__(
         self,
         symbol: str = "BTC/USDT",
@@ -68,14 +143,14 @@ class CurrencyPair:
             created_at: Timestamp создания (ms)
             updated_at: Timestamp последнего обновления (ms)
         """
-        # --- Core ---
+        _check_invariants(symbol, min_step, price_step)
+
+        # Лениво вычисляемые оценка размера кеша (см. estimate_cache_size_mb)
+        # и строковое представление.
+        self._cache_mb: float | None = None
+        self._repr: str | None = None
 
-        # Символ всегда в формате BASE/QUOTE. Это базовый инвариант,
-        # вокруг которого строится вся конфигурация процесса
-        # (один процесс = одна пара). На раннем этапе фиксируем только
-        # наличие разделителя, без агрессивного парсинга.
-        if "/" not in symbol:
-            raise ValueError("CurrencyPair.symbol must be in 'BASE/QUOTE' format")
+        # --- Core ---
 
         self.pair_id = pair_id
         self.symbol = symbol
@@ -91,14 +166,6 @@ class CurrencyPair:
 
         # --- Exchange params ---
 
-        # Биржевые шаги количества и цены должны быть строго > 0.
-        # Это отражает контракт с провайдером прецизионов и защищает
-        # от конфигураций, при которых расчёт объёма/цены теряет смысл.
-        if min_step <= 0:
-            raise ValueError("CurrencyPair.min_step must be > 0")
-        if price_step <= 0:
-            raise ValueError("CurrencyPair.price_step must be > 0")
-
         self.min_step = min_step
         self.price_step = price_step
 
@@ -116,9 +183,18 @@ class CurrencyPair:
     def estimate_cache_size_mb(self) -> float:
         """Оценить размер кеша в памяти для этой пары.
 
+        Оценка зависит только от размеров кешей, поэтому считается один
+        раз и пересчитывается лишь после изменения этих полей.
+
         Returns:
             Размер в MB (приблизительная оценка)
         """
+        cache_mb = self._cache_mb
+        if cache_mb is None:
+            cache_mb = self._cache_mb = self._compute_cache_size_mb()
+        return cache_mb
+
+    def _compute_cache_size_mb(self) -> float:
         # Оценки на один элемент:
         # - 1 уровень стакана: ~100 байт
         # - 1 трейд: ~100 байт
@@ -140,43 +216,81 @@ class CurrencyPair:
         return orderbook_mb + trades_mb + bars_mb + indicators_mb
 
     def __repr__(self) -> str:
-        cache_mb = self.estimate_cache_size_mb()
-        return (
-            f"<CurrencyPair(symbol={self.symbol}, "
-            f"deal_quota={self.deal_quota}, "
-            f"profit_markup={self.profit_markup}%, "
-            f"deal_count={self.deal_count}, "
-            f"cache≈{cache_mb:.2f}MB)>"
-        )
+        text = self._repr
+        if text is None:
+            cache_mb = self.estimate_cache_size_mb()
+            text = self._repr = (
+                f"<CurrencyPair(symbol={self.symbol}, "
+                f"deal_quota={self.deal_quota}, "
+                f"profit_markup={self.profit_markup}%, "
+                f"deal_count={self.deal_count}, "
+                f"cache≈{cache_mb:.2f}MB)>"
+            )
+        return text
 
     def to_dict(self) -> dict:
-        """Сериализовать в dict для БД."""
-        return {
-            "pair_id": self.pair_id,
-            "symbol": self.symbol,
-            "base_currency": self.base_currency,
-            "quote_currency": self.quote_currency,
-            "enabled": self.enabled,
-            # Trading
-            "deal_quota": self.deal_quota,
-            "profit_markup": self.profit_markup,
-            "deal_count": self.deal_count,
-            "order_life_time": self.order_life_time,
-            # Exchange
-            "min_step": self.min_step,
-            "price_step": self.price_step,
-            # Cache
-            "bar_timeframe": self.bar_timeframe,
-            "bar_window_size": self.bar_window_size,
-            "orderbook_depth": self.orderbook_depth,
-            "trades_history_size": self.trades_history_size,
-            "indicator_window_size": self.indicator_window_size,
-            # Meta
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-        }
+        """Сериализовать в dict для БД.
+
+        Все поля пары — неизменяемые скаляры, поэтому достаточно
+        прочитать слоты полей в порядке :data:`_FIELDS`.
+        """
+        return {name: getter(self) for name, getter in _FIELD_GETTERS}
 
     @classmethod
     def from_dict(cls, data: dict) -> "CurrencyPair":
-        """Десериализовать из dict (из БД)."""
-        return cls(**data)
+        """Десериализовать из dict (из БД).
+
+        Объект собирается без вызова ``__init__``: значения по умолчанию
+        берутся из заранее посчитанной таблицы, инварианты проверяются
+        той же функцией, что и в конструкторе.
+        """
+        unknown = data.keys() - _FIELD_SET
+        if unknown:
+            raise TypeError(f"Unexpected CurrencyPair fields: {sorted(unknown)}")
+
+        values = _DEFAULTS.copy()
+        values.update(data)
+        _check_invariants(values["symbol"], values["min_step"], values["price_step"])
+        if not values["created_at"] or not values["updated_at"]:
+            now_ms = int(time.time() * 1000)
+            values["created_at"] = values["created_at"] or now_ms
+            values["updated_at"] = values["updated_at"] or now_ms
+
+        obj = object.__new__(cls)
+        # Запись напрямую в слоты, минуя свойства со сбросом кэшей.
+        for name, setter in _SLOT_SETTERS:
+            setter(obj, values[name])
+        obj._cache_mb = None
+        obj._repr = None
+        return obj
+
+
+# Значения по умолчанию конструктора, посчитанные один раз для from_dict.
+# Порядок ключей — как в _FIELDS, чтобы from_dict и to_dict давали ту же форму.
+_INIT_PARAMS = inspect.signature(CurrencyPair.__init__).parameters
+_DEFAULTS: dict[str, Any] = {name: _INIT_PARAMS[name].default for name in _FIELDS}
+
+
+def _cache_resetting_property(name: str) -> property:
+    """Свойство поля ``name``: чтение из слота, запись со сбросом кэшей."""
+
+    slot = getattr(CurrencyPair, _slot_name(name))
+    set_slot = slot.__set__
+    resets_cache_mb = name in _CACHE_SIZE_FIELDS
+
+    def fset(self: CurrencyPair, value: Any) -> None:
+        set_slot(self, value)
+        self._repr = None
+        if resets_cache_mb:
+            self._cache_mb = None
+
+    return property(slot.__get__, fset)
+
+
+for _name in _REPR_FIELDS:
+    setattr(CurrencyPair, _name, _cache_resetting_property(_name))
+del _name
+
+# Дескрипторы слотов полей: чтение/запись без поиска атрибута по MRO.
+_FIELD_GETTERS = tuple((name, getattr(CurrencyPair, _slot_name(name)).__get__) for name in _FIELDS)
+_SLOT_SETTERS = tuple((name, getattr(CurrencyPair, _slot_name(name)).__set__) for name in _FIELDS)
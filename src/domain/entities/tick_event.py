@@ -0,0 +1,21 @@
+"""TickEvent entity: один нормализованный тик для конвейера."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class TickEvent:
+    """Тик, уже приведённый к полям, которые читает конвейер.
+
+    Компактная структура со ``__slots__`` вместо dict: без хеширования
+    ключей при доступе к полям и без per‑instance ``__dict__``. Символ
+    ожидается интернированным (см. репозиторий пар), чтобы сравнения с
+    ключами контекста шли по указателю.
+    """
+
+    symbol: str
+    ticker_id: int
+    price: float
+    ts: int
@@ -11,7 +11,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Protocol, runtime_checkable
+from typing import Any, Callable, Dict, List, Protocol, Set, runtime_checkable
 
 
 @runtime_checkable
@@ -78,3 +78,36 @@ class IIndicatorStore(Protocol):
 
     def should_update_heavy(self, ticker_id: int) -> bool:
         """Нужно ли обновить тяжёлые индикаторы на этом тике."""
+
+
+def _memoized_protocol_check(protocol: type) -> Callable[[Any], bool]:
+    """Построить быструю проверку ``isinstance(obj, protocol)``.
+
+    ``isinstance`` с ``runtime_checkable``‑протоколом на каждом вызове
+    перебирает все члены протокола через ``hasattr``. Проверки стоят на
+    пути каждого тика, а типы кэшей за время жизни процесса не меняются,
+    поэтому положительный результат запоминается по типу объекта и
+    дальше проверка сводится к поиску в множестве. Отрицательные
+    результаты не кэшируются: экземпляры одного класса могут отличаться
+    атрибутами‑данными.
+    """
+
+    verified: Set[type] = set()
+
+    def check(obj: Any) -> bool:
+        cls = type(obj)
+        if cls in verified:
+            return True
+        if obj is None or not isinstance(obj, protocol):
+            return False
+        verified.add(cls)
+        return True
+
+    return check
+
+
+is_market_cache = _memoized_protocol_check(IMarketCache)
+is_market_cache.__doc__ = "Быстрый аналог ``isinstance(obj, IMarketCache)``."
+
+is_indicator_store = _memoized_protocol_check(IIndicatorStore)
+is_indicator_store.__doc__ = "Быстрый аналог ``isinstance(obj, IIndicatorStore)``."
@@ -13,7 +13,7 @@
 
 from __future__ import annotations
 
-from typing import List, Protocol, runtime_checkable
+from typing import Protocol, Sequence, runtime_checkable
 
 from src.domain.entities.currency_pair import CurrencyPair
 
@@ -27,15 +27,23 @@ class ICurrencyPairRepository(Protocol):
     сохранение новых настроек и т.п.).
     """
 
-    def list_all(self, include_disabled: bool = True) -> List[CurrencyPair]:
+    def list_all(self, include_disabled: bool = True) -> Sequence[CurrencyPair]:
         """Вернуть все пары.
 
         Args:
             include_disabled: если False, вернуть только enabled-пары.
+
+        Результат может быть закэшированной неизменяемой
+        последовательностью; если нужен список, вызывающий код делает
+        ``list(repo.list_all())``.
         """
 
-    def list_active(self) -> List[CurrencyPair]:
-        """Вернуть только активные (``enabled``) пары."""
+    def list_active(self) -> Sequence[CurrencyPair]:
+        """Вернуть только активные (``enabled``) пары.
+
+        Как и :meth:`list_all`, может вернуть неизменяемую
+        последовательность.
+        """
 
     def get_by_symbol(self, symbol: str) -> CurrencyPair | None:
         """Найти пару по символу биржи ("BTC/USDT")."""
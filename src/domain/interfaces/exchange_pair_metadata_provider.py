@@ -14,7 +14,7 @@
 
 from __future__ import annotations
 
-from typing import Protocol, TypedDict, runtime_checkable
+from typing import Mapping, Protocol, Sequence, TypedDict, runtime_checkable
 
 
 class PairPrecisions(TypedDict):
@@ -48,4 +48,25 @@ class IExchangePairMetadataProvider(Protocol):
         """
 
 
-__all__ = ["PairPrecisions", "IExchangePairMetadataProvider"]
+@runtime_checkable
+class IBulkExchangePairMetadataProvider(IExchangePairMetadataProvider, Protocol):
+    """Провайдер, умеющий отдать прецизионы сразу для набора символов.
+
+    Опциональное расширение :class:`IExchangePairMetadataProvider`: если
+    провайдер ходит в REST/биржу, один пакетный запрос заменяет N
+    отдельных вызовов :meth:`get_precisions`.
+    """
+
+    def get_precisions_bulk(self, symbols: Sequence[str]) -> Mapping[str, PairPrecisions | None]:
+        """Вернуть прецизионы для всех ``symbols``.
+
+        Отсутствующий в результате символ трактуется так же, как
+        ``None`` из :meth:`get_precisions`.
+        """
+
+
+__all__ = [
+    "PairPrecisions",
+    "IExchangePairMetadataProvider",
+    "IBulkExchangePairMetadataProvider",
+]
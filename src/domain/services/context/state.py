@@ -1,12 +1,27 @@
-from typing import Dict, Any, List
+import sys
+from collections import deque
+from typing import Deque, Dict, Any, List
 
 from src.config.config import AppConfig
-from src.domain.interfaces.cache import IMarketCache
+from src.domain.interfaces.cache import is_market_cache
 from src.infrastructure.logging.logging_setup import log_info
 
 # Имя логгера для этого модуля
 _LOG = __name__
 
+# Общие типы конвейера. Контекст и сообщения стадий остаются dict'ами,
+# алиасы лишь дают сигнатурам конкретные имена (и готовы для mypy/mypyc).
+Context = Dict[str, Any]
+Intent = Dict[str, Any]
+Decision = Dict[str, Any]
+
+# Разделы контекста с последним срезом и с историей по инструменту.
+_LATEST_SECTIONS = ("indicators", "intents", "decisions")
+_HISTORY_SECTIONS = ("indicators_history", "intents_history", "decisions_history")
+
+# Окно историй, пока для инструмента нет CurrencyPair в ``context["pairs"]``.
+_DEFAULT_HISTORY_WINDOW = 1000
+
 
 def init_context(config: AppConfig) -> Dict[str, Any]:
     """Создать in-memory контекст с обязательными разделами.
@@ -37,6 +52,7 @@ def init_context(config: AppConfig) -> Dict[str, Any]:
         "intents_history": {},
         "decisions_history": {},
     }
+    register_symbol(ctx, config.symbol)
     log_info(
         f"🚀 [BOOT] Инициализация базового in‑memory контекста | sections: {sorted(ctx.keys())}",
         _LOG
@@ -44,6 +60,50 @@ def init_context(config: AppConfig) -> Dict[str, Any]:
     return ctx
 
 
+def register_symbol(context: Dict[str, Any], symbol: str) -> None:
+    """Заранее завести per-symbol истории для инструмента.
+
+    Вызывается при старте (``init_context``/``build_context``), чтобы
+    ``record_*`` на каждом тике брали готовую историю прямой индексацией,
+    без ``setdefault(symbol, [])`` и аллокации пустого списка на тик.
+
+    Истории — ``deque(maxlen=N)`` с окном из настроек пары: вытеснение
+    старых элементов идёт в ``append`` за O(1), без ``del`` головы списка.
+    Повторный вызов сохраняет накопленные элементы и лишь подгоняет окно
+    (например, когда ``build_context`` добавил пару в контекст).
+
+    Символ интернируется до того, как станет ключом: dict сохраняет
+    объект ключа первой вставки, и если бы первым пришёл, скажем, символ
+    из argv, поиск интернированным символом с горячего пути каждый раз
+    сравнивал бы строки посимвольно, а не по указателю.
+    """
+
+    symbol = sys.intern(symbol)
+    window = _get_window_size_for_symbol(context, symbol)
+    for section in _LATEST_SECTIONS:
+        context.setdefault(section, {})
+    for section in _HISTORY_SECTIONS:
+        histories = context.setdefault(section, {})
+        history = histories.get(symbol)
+        if not isinstance(history, deque) or history.maxlen != window:
+            histories[symbol] = deque(history or (), maxlen=window)
+
+
+def _history_for(context: Dict[str, Any], section: str, symbol: str) -> Deque[Any]:
+    """Взять историю инструмента.
+
+    Быстрый путь — прямая индексация заранее зарегистрированной истории.
+    Для контекстов, собранных не через ``init_context``/``build_context``,
+    символ регистрируется лениво при первой записи.
+    """
+
+    try:
+        return context[section][symbol]
+    except KeyError:
+        register_symbol(context, symbol)
+        return context[section][symbol]
+
+
 def update_market_state(
     context: Dict[str, Any], *, symbol: str, price: float, ts: int
 ) -> None:
@@ -52,16 +112,28 @@ def update_market_state(
     Используется синхронным демо‑конвейером: тик описывается минимальным
     набором полей (``symbol``, ``price``, ``ts``). Функция не делает
     внешнего I/O и работает только с in‑memory структурами контекста.
+
+    Срез ``market[symbol]`` создаётся на первом тике и дальше обновляется
+    на месте — без нового dict на каждый тик. Снапшот state копирует его
+    (см. :func:`make_state_snapshot`). Кэш рынка получает тикер через
+    ``update_ticker``: это контракт :class:`IMarketCache`, и backend
+    кэша может хранить переданный объект по ссылке.
     """
 
     # Высокоуровневый срез рынка для стратегий/оркестратора.
     market = context.setdefault("market", {})
-    market[symbol] = {"last_price": price, "ts": ts}
+    view = market.get(symbol)
+    if view is None:
+        market[symbol] = {"last_price": price, "ts": ts}
+    else:
+        view["last_price"] = price
+        view["ts"] = ts
 
     # Если в контексте есть кэш рынка для этой пары, обновляем и его.
     caches = context.get("market_caches") or {}
     cache = caches.get(symbol)
-    if isinstance(cache, IMarketCache):
+    has_cache = is_market_cache(cache)
+    if has_cache:
         ticker = {
             "symbol": symbol,
             "last": price,
@@ -70,7 +142,7 @@ def update_market_state(
         cache.update_ticker(ticker)
 
     log_info(
-        f"🌐 [FEEDS] Обновление market‑state по тику | symbol: {symbol} | price: {price:.8f} | ts: {ts} | has_cache: {isinstance(cache, IMarketCache)}",
+        f"🌐 [FEEDS] Обновление market‑state по тику | symbol: {symbol} | price: {price:.8f} | ts: {ts} | has_cache: {has_cache}",
         _LOG
     )
 
@@ -82,7 +154,9 @@ def update_metrics(context: Dict[str, Any], ticker_id: int) -> None:
     log_info(f"📂 [STATE] Обновление метрик состояния | ticker_id: {ticker_id}", _LOG)
 
 
-def _get_window_size_for_symbol(context: Dict[str, Any], symbol: str, *, default: int = 1000) -> int:
+def _get_window_size_for_symbol(
+    context: Dict[str, Any], symbol: str, *, default: int = _DEFAULT_HISTORY_WINDOW
+) -> int:
     """Вспомогательно: взять размер окна по паре, если она есть в контексте.
 
     Сейчас используем ``CurrencyPair.indicator_window_size`` как единый
@@ -96,19 +170,15 @@ def _get_window_size_for_symbol(context: Dict[str, Any], symbol: str, *, default
     return getattr(pair, "indicator_window_size", default) if pair is not None else default
 
 
-def _append_with_window(sequence: List[Any], item: Any, *, maxlen: int) -> bool:
-    """Добавить элемент в список с обрезкой по ``maxlen`` с начала.
+def _append_with_window(sequence: Deque[Any], item: Any) -> bool:
+    """Добавить элемент в ограниченную историю.
 
-    Возвращает ``True``, если при добавлении пришлось обрезать голову
-    списка (старые элементы вытеснены).
+    Возвращает ``True``, если при добавлении ``deque`` вытеснил самый
+    старый элемент (история уже была заполнена до ``maxlen``).
     """
 
+    truncated = len(sequence) == sequence.maxlen
     sequence.append(item)
-    truncated = False
-    if len(sequence) > maxlen:
-        # откусываем только из начала, чтобы сохранить порядок последних
-        del sequence[0 : len(sequence) - maxlen]
-        truncated = True
     return truncated
 
 
@@ -121,19 +191,16 @@ def record_indicators(
     * ``context["indicators_history"][symbol]`` – окно последних N
       снимков, где ``N == CurrencyPair.indicator_window_size``.
 
-    История живёт в простом dict/list, чтобы в будущем можно было
+    История живёт в простом dict/deque, чтобы в будущем можно было
     прозрачно заменить backend (например, на Redis), оставив контракт
     этой функции прежним.
     """
 
-    indicators = context.setdefault("indicators", {})
-    indicators[symbol] = snapshot
-
-    history_all = context.setdefault("indicators_history", {})
-    history_for_symbol: List[Dict[str, Any]] = history_all.setdefault(symbol, [])
+    history_for_symbol: Deque[Dict[str, Any]] = _history_for(context, "indicators_history", symbol)
+    context["indicators"][symbol] = snapshot
 
-    window = _get_window_size_for_symbol(context, symbol)
-    truncated = _append_with_window(history_for_symbol, snapshot, maxlen=window)
+    window = history_for_symbol.maxlen
+    truncated = _append_with_window(history_for_symbol, snapshot)
 
     log_info(
         f"📊 [IND] Снимок индикаторов записан в историю | symbol: {symbol} | history_len: {len(history_for_symbol)} | window: {window} | truncated: {truncated}",
@@ -155,14 +222,11 @@ def record_intents(
       intents по тикам, размер окна берётся из настроек пары.
     """
 
-    current = context.setdefault("intents", {})
-    current[symbol] = intents
+    history_for_symbol: Deque[List[Dict[str, Any]]] = _history_for(context, "intents_history", symbol)
+    context["intents"][symbol] = intents
 
-    history_all = context.setdefault("intents_history", {})
-    history_for_symbol: List[List[Dict[str, Any]]] = history_all.setdefault(symbol, [])
-
-    window = _get_window_size_for_symbol(context, symbol)
-    truncated = _append_with_window(history_for_symbol, intents, maxlen=window)
+    window = history_for_symbol.maxlen
+    truncated = _append_with_window(history_for_symbol, intents)
 
     log_info(
         f"📂 [STATE] Intents сохранены в истории | symbol: {symbol} | intents_count: {len(intents)} | history_len: {len(history_for_symbol)} | window: {window} | truncated: {truncated}",
@@ -180,14 +244,11 @@ def record_decision(
       решений, N определяется настройками пары.
     """
 
-    current = context.setdefault("decisions", {})
-    current[symbol] = decision
-
-    history_all = context.setdefault("decisions_history", {})
-    history_for_symbol: List[Dict[str, Any]] = history_all.setdefault(symbol, [])
+    history_for_symbol: Deque[Dict[str, Any]] = _history_for(context, "decisions_history", symbol)
+    context["decisions"][symbol] = decision
 
-    window = _get_window_size_for_symbol(context, symbol)
-    truncated = _append_with_window(history_for_symbol, decision, maxlen=window)
+    window = history_for_symbol.maxlen
+    truncated = _append_with_window(history_for_symbol, decision)
 
     action = decision.get("action")
     log_info(
@@ -215,17 +276,25 @@ def make_state_snapshot(
     decisions_history = (context.get("decisions_history") or {}).get(symbol, [])
     metrics = context.get("metrics") or {}
 
+    # Срез рынка, истории и метрики конвейер меняет на месте, поэтому в снапшот
+    # попадают их копии: снапшот может сериализоваться позже и в другом
+    # потоке (см. StateSnapshotService), пока цикл продолжает работать.
+    # Копии неглубокие: элементы историй и последние indicators/intents/
+    # decision на каждом тике создаются заново и после записи не меняются,
+    # поэтому делятся со снапшотом по ссылке. Copy‑on‑write для историй не
+    # нужен: снапшот строится раз в ``state_snapshot_interval_ticks``, а
+    # отслеживание «поколений» легло бы на каждый append горячего пути.
     snapshot: Dict[str, Any] = {
         "symbol": symbol,
         "ticker_id": ticker_id,
-        "market": market,
+        "market": dict(market) if market is not None else None,
         "indicators": indicators,
-        "indicators_history": indicators_history,
+        "indicators_history": list(indicators_history),
         "intents": intents,
-        "intents_history": intents_history,
+        "intents_history": list(intents_history),
         "decision": decision,
-        "decisions_history": decisions_history,
-        "metrics": metrics,
+        "decisions_history": list(decisions_history),
+        "metrics": dict(metrics),
     }
 
     log_info(
@@ -254,21 +323,23 @@ def apply_state_snapshot(
     if snapshot.get("indicators") is not None:
         indicators_section[symbol] = snapshot["indicators"]
 
+    window = _get_window_size_for_symbol(context, symbol)
+
     indicators_history_all = context.setdefault("indicators_history", {})
-    indicators_history_all[symbol] = list(snapshot.get("indicators_history") or [])
+    indicators_history_all[symbol] = deque(snapshot.get("indicators_history") or (), maxlen=window)
 
     intents_section = context.setdefault("intents", {})
     intents_section[symbol] = list(snapshot.get("intents") or [])
 
     intents_history_all = context.setdefault("intents_history", {})
-    intents_history_all[symbol] = list(snapshot.get("intents_history") or [])
+    intents_history_all[symbol] = deque(snapshot.get("intents_history") or (), maxlen=window)
 
     decisions_section = context.setdefault("decisions", {})
     if snapshot.get("decision") is not None:
         decisions_section[symbol] = snapshot["decision"]
 
     decisions_history_all = context.setdefault("decisions_history", {})
-    decisions_history_all[symbol] = list(snapshot.get("decisions_history") or [])
+    decisions_history_all[symbol] = deque(snapshot.get("decisions_history") or (), maxlen=window)
 
     metrics = snapshot.get("metrics") or {}
     if metrics:
@@ -1,12 +1,11 @@
-from typing import Dict, Any
-
+from src.domain.services.context.state import Context, Decision
 from src.infrastructure.logging.logging_setup import log_info
 
 # Имя логгера для этого модуля
 _LOG = __name__
 
 
-def execute(decision: Dict[str, Any], context: Dict[str, Any], *, ticker_id: int, symbol: str) -> None:
+def execute(decision: Decision, context: Context, *, ticker_id: int, symbol: str) -> None:
     """Заглушка исполнения: только логирование, без реальных сайд‑эффектов.
 
     В боевой системе здесь бы вызывался коннектор биржи и ордерный
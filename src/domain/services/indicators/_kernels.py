@@ -0,0 +1,44 @@
+"""Числовые ядра индикаторов.
+
+Если установлен ``numba``, ядра компилируются в nopython‑режиме с явной
+сигнатурой — компиляция происходит при импорте модуля, а не на первом
+тике. Без numba используется прежняя SMA на Python (``sum / window``)
+с тем же порядком суммирования, поэтому результаты совпадают бит в бит.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+try:  # pragma: no cover - numba есть не во всех окружениях
+    from numba import float64, int64, njit  # type: ignore[import]
+except Exception:  # pragma: no cover - без numba работаем на Python‑реализации
+    njit = None  # type: ignore[assignment]
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def _sma_last_py(prices: Sequence[float], window: int) -> float:
+    """Среднее последних ``window`` значений (``1 <= window <= len(prices)``).
+
+    Принимает список или ndarray: numpy для расчёта не требуется.
+    """
+
+    return float(sum(prices[len(prices) - window :])) / window
+
+
+if njit is not None:  # pragma: no cover - нужен numba
+
+    @njit(float64(float64[::1], int64), cache=True)
+    def sma_last(prices, window):  # type: ignore[no-untyped-def]
+        total = 0.0
+        n = prices.shape[0]
+        for i in range(n - window, n):
+            total += prices[i]
+        return total / window
+
+else:
+    sma_last = _sma_last_py
+
+
+__all__ = ["NUMBA_AVAILABLE", "sma_last"]
@@ -1,7 +1,9 @@
 from collections import deque
+from itertools import islice
 from typing import Any, Deque, Dict
 
-from src.domain.interfaces.cache import IIndicatorStore
+from src.domain.interfaces.cache import is_indicator_store
+from src.domain.services.indicators._kernels import sma_last
 from src.domain.services.context.state import record_indicators
 from src.domain.services.ticker.ticker_source import Ticker
 from src.infrastructure.logging.logging_setup import log_stage, log_info
@@ -9,22 +11,61 @@ from src.infrastructure.logging.logging_setup import log_stage, log_info
 # Имя логгера для этого модуля
 _LOG = __name__
 
-try:  # pragma: no cover - окружения без numpy/talib
+_EMPTY: Dict[str, Any] = {}
+
+# Глубина истории цен и тикеров на символ.
+_HISTORY_WINDOW = 500
+
+try:  # pragma: no cover - окружения без numpy
     import numpy as _np  # type: ignore[import]
-    import talib as _talib  # type: ignore[import]
+
+    from src.infrastructure.cache.ring import FloatRing
 except Exception:  # pragma: no cover - защитный импорт
     _np = None  # type: ignore[assignment]
+    FloatRing = None  # type: ignore[assignment,misc]
+
+try:  # pragma: no cover - окружения без talib
+    import talib as _talib  # type: ignore[import]
+except Exception:  # pragma: no cover - защитный импорт
     _talib = None  # type: ignore[assignment]
 
 
-def _sma(values: list[float]) -> float:
-    """Простейшая скользящая средняя по списку значений.
+def _tail(history: Deque[float], count: int) -> list[float]:
+    """Последние ``count`` значений истории в исходном порядке.
+
+    В отличие от ``list(history)[-count:]`` не копирует всю историю:
+    обходит deque с конца, поэтому стоимость O(count).
+    """
+
+    if count >= len(history):
+        return list(history)
+    tail = list(islice(reversed(history), count))
+    tail.reverse()
+    return tail
+
+
+def _price_history_for(root: Dict[str, Any], symbol: str) -> Any:
+    """История цен символа.
 
-    Предполагается, что ``values`` не пустой (контролируется вызывающим
-    кодом через длину history).
+    С numpy — кольцо float64 (:class:`FloatRing`): хвост под окна
+    индикаторов читается готовым ndarray одним срезом. Без numpy —
+    обычный ``deque`` питоновских float.
     """
 
-    return sum(values) / len(values)
+    history = root.get(symbol)
+    if history is None:
+        if FloatRing is not None:
+            history = root[symbol] = FloatRing(_HISTORY_WINDOW)
+        else:
+            history = root[symbol] = deque(maxlen=_HISTORY_WINDOW)
+    return history
+
+
+def _history_for(root: Dict[str, Deque[Any]], symbol: str) -> Deque[Any]:
+    history = root.get(symbol)
+    if history is None:
+        history = root[symbol] = deque(maxlen=_HISTORY_WINDOW)
+    return history
 
 
 class IndicatorEngine:
@@ -56,56 +97,77 @@ class IndicatorEngine:
         )
 
         # --- История цен по инструменту (общая для всех индикаторов) ---
-        price_history_root: Dict[str, Deque[float]] = context.setdefault(
-            "price_history", {}
-        )
-        history: Deque[float] = price_history_root.setdefault(
-            symbol, deque(maxlen=500)
-        )
+        price_history_root: Dict[str, Any] | None = context.get("price_history")
+        if price_history_root is None:
+            price_history_root = context["price_history"] = {}
+        history = _price_history_for(price_history_root, symbol)
         history.append(last_price)
 
         # Также храним историю тикеров – на будущее для объёмных и
         # спред‑зависимых индикаторов.
-        ticker_history_root: Dict[str, Deque[Ticker]] = context.setdefault(
-            "ticker_history", {}
-        )
-        ticker_hist: Deque[Ticker] = ticker_history_root.setdefault(
-            symbol, deque(maxlen=500)
-        )
+        ticker_history_root: Dict[str, Deque[Ticker]] | None = context.get("ticker_history")
+        if ticker_history_root is None:
+            ticker_history_root = context["ticker_history"] = {}
+        ticker_hist: Deque[Ticker] = _history_for(ticker_history_root, symbol)
         ticker_hist.append(ticker)
 
         # --- Достаём IndicatorStore для символа (если настроен) ---
         stores = context.get("indicator_stores") or {}
         store = stores.get(symbol)
 
-        indicators: Dict[str, Any] = {}
+        # Базовые поля snapshot (обратная совместимость) идут первыми;
+        # индикаторы пишутся прямо в тот же dict — без промежуточного
+        # словаря и слияния ``{**base, **indicators}`` на каждом тик.
+        # Snapshot уходит в историю индикаторов, поэтому на каждый тик
+        # он свой и не переиспользуется.
+        ts = ((context.get("market") or _EMPTY).get(symbol) or _EMPTY).get("ts")
+        snapshot: Dict[str, Any] = {
+            "symbol": symbol,
+            "ticker_id": ticker_id,
+            "price": last_price,
+            "sma": last_price,
+            "rsi": 50.0,
+            "ts": ts,
+        }
+        indicators = snapshot
 
-        if isinstance(store, IIndicatorStore):
+        if is_indicator_store(store):
             # Окна для примера fast/medium/heavy. В дальнейшем можно
             # вынести в конфиг/пару, не меняя общий каркас.
             fast_window = 5
             medium_window = 20
             heavy_window = 100
 
-            history_list = list(history)
-            n = len(history_list)
+            # Гейты слоёв вычисляются один раз за тик. На тиках, где ни
+            # один слой не срабатывает, хвост истории не копируется.
+            update_fast = store.should_update_fast(ticker_id)
+            update_medium = store.should_update_medium(ticker_id)
+            update_heavy = store.should_update_heavy(ticker_id)
+
+            # Хвост истории под самое длинное окно копируется один раз за
+            # тик (из кольца float64 или с хвоста deque); все SMA и ta-lib
+            # читают его срезы.
+            n = len(history)
+            if update_fast or update_medium or update_heavy:
+                if isinstance(history, deque):
+                    closes = _tail(history, heavy_window)
+                else:
+                    closes = history.tail(heavy_window)
 
             # --- FAST слой ---
-            if store.should_update_fast(ticker_id):
+            if update_fast:
                 # Исторический демо‑индикатор: SMA по 5 последним тикам.
                 if n >= fast_window:
-                    indicators["sma_fast_5"] = _sma(history_list[-fast_window:])
+                    indicators["sma_fast_5"] = sma_last(closes, fast_window)
 
                 # Реальные быстрые индикаторы из старого проекта:
                 # SMA‑7 и SMA‑25 по истории цен (см.
                 # bad_example/src/domain/services/indicators/indicator_calculator_service.py).
                 if n >= 1:
-                    sma_7_window = history_list[-7:]
-                    indicators["sma_7"] = _sma(sma_7_window)
+                    indicators["sma_7"] = sma_last(closes, min(7, n))
 
                 if n >= 25:
-                    sma_25_window = history_list[-25:]
-                    indicators["sma_25"] = _sma(sma_25_window)
+                    indicators["sma_25"] = sma_last(closes, 25)
 
                 # Простейший быстрый индикатор на основе стакана: спред и mid.
                 bid = float(ticker["bid"])
@@ -119,21 +181,19 @@ class IndicatorEngine:
                 store.fast_history.append(last_price)  # type: ignore[attr-defined]
 
             # --- MEDIUM слой ---
-            if store.should_update_medium(ticker_id):
+            if update_medium:
                 # Демонстрационная SMA по 20 последним тикам.
                 if n >= medium_window:
-                    indicators["sma_medium_20"] = _sma(
-                        history_list[-medium_window:]
-                    )
+                    indicators["sma_medium_20"] = sma_last(closes, medium_window)
 
                 # Средние индикаторы из старого проекта: RSI‑5 и RSI‑15.
                 # Формулы основаны на IndicatorCalculatorService, но
                 # используют необязательный talib, если он доступен.
                 if _np is not None and _talib is not None and n >= 30:
-                    closes = _np.array(history_list[-30:], dtype="float64")  # type: ignore[arg-type]
+                    rsi_closes = closes[-30:]
                     try:
-                        rsi_5 = _talib.RSI(closes, timeperiod=5)  # type: ignore[call-arg]
-                        rsi_15 = _talib.RSI(closes, timeperiod=15)  # type: ignore[call-arg]
+                        rsi_5 = _talib.RSI(rsi_closes, timeperiod=5)  # type: ignore[call-arg]
+                        rsi_15 = _talib.RSI(rsi_closes, timeperiod=15)  # type: ignore[call-arg]
 
                         if len(rsi_5) > 0 and not _np.isnan(rsi_5[-1]):
                             indicators["rsi_5"] = round(float(rsi_5[-1]), 8)
@@ -150,16 +210,13 @@ class IndicatorEngine:
                 store.medium_history.append(last_price)  # type: ignore[attr-defined]
 
             # --- HEAVY слой ---
-            if store.should_update_heavy(ticker_id):
+            if update_heavy:
                 # Демонстрационная SMA по 100 последним тикам.
                 if n >= heavy_window:
-                    indicators["sma_heavy_100"] = _sma(
-                        history_list[-heavy_window:]
-                    )
+                    indicators["sma_heavy_100"] = sma_last(closes, heavy_window)
 
                 # Тяжёлые индикаторы из старого проекта: MACD и Bollinger Bands.
                 if _np is not None and _talib is not None and n >= 50:
-                    closes = _np.array(history_list[-100:], dtype="float64")  # type: ignore[arg-type]
                     try:
                         macd, macdsignal, macdhist = _talib.MACD(  # type: ignore[call-arg]
                             closes,
@@ -222,29 +279,13 @@ class IndicatorEngine:
                 # История heavy‑слоя.
                 store.heavy_history.append(last_price)  # type: ignore[attr-defined]
 
-        # --- Базовые поля snapshot (обратная совместимость) ---
-        ts = context.get("market", {}).get(symbol, {}).get("ts")
-
         # Поля "sma" и "rsi" поддерживаем для обратной совместимости:
         # если доступны реальные индикаторы, используем их, иначе
         # остаёмся на простых заглушках.
-        sma_placeholder = float(last_price)
-        if "sma_7" in indicators:
-            sma_placeholder = float(indicators["sma_7"])
-
-        rsi_placeholder = 50.0
-        if "rsi_5" in indicators:
-            rsi_placeholder = float(indicators["rsi_5"])
-
-        snapshot: Dict[str, Any] = {
-            "symbol": symbol,
-            "ticker_id": ticker_id,
-            "price": float(last_price),
-            "sma": sma_placeholder,
-            "rsi": rsi_placeholder,
-            "ts": ts,
-            **indicators,
-        }
+        if "sma_7" in snapshot:
+            snapshot["sma"] = float(snapshot["sma_7"])
+        if "rsi_5" in snapshot:
+            snapshot["rsi"] = float(snapshot["rsi_5"])
 
         # Сохраняем снимок в общем контексте и его историю, чтобы потом
         # можно было заменить in‑memory стор на Redis/БД без правки
@@ -280,7 +321,7 @@ def compute_indicators(
     использоваться реальный тикер из :class:`TickSource`.
     """
 
-    ts = context.get("market", {}).get(symbol, {}).get("ts")
+    ts = ((context.get("market") or _EMPTY).get(symbol) or _EMPTY).get("ts")
 
     # Упрощённый тикер: один и тот же price во всех ценовых полях,
     # объёмы считаем неизвестными (0.0). Этого достаточно для текущих
@@ -21,11 +21,22 @@ and orchestrator.
 
 from typing import Any, Dict
 
-from src.domain.interfaces.cache import IMarketCache
+from src.domain.interfaces.cache import IMarketCache, is_market_cache
+
+
+def resolve_market_cache(context: Dict[str, Any], symbol: str) -> IMarketCache | None:
+    """Return the :class:`IMarketCache` for ``symbol`` or ``None``.
+
+    Loops that poll the same symbol can resolve the cache once and pass
+    it to :func:`get_order_book_from_context` as ``cache=``.
+    """
+
+    cache = (context.get("market_caches") or {}).get(symbol)
+    return cache if is_market_cache(cache) else None
 
 
 def get_order_book_from_context(
-    context: Dict[str, Any], *, symbol: str
+    context: Dict[str, Any], *, symbol: str, cache: IMarketCache | None = None
 ) -> Dict[str, Any] | None:
     """Return the latest order book snapshot for ``symbol`` from context.
 
@@ -35,7 +46,9 @@ def get_order_book_from_context(
       :class:`IMarketCache`, returns ``cache.get_orderbook()``;
     * never touches the exchange connector directly;
     * returns ``None`` if there is no cache for the given symbol or if
-      the cache does not yet contain an order book.
+      the cache does not yet contain an order book;
+    * if ``cache`` is given (resolved once by the caller via
+      :func:`resolve_market_cache`), the context lookup is skipped.
 
     The snapshot format is the unified ccxt-like dict used across the
     project (see ``doc/ccxt_data_structures.md``, ``fetch_order_book()``):
@@ -52,12 +65,12 @@ def get_order_book_from_context(
         }
     """
 
-    caches = context.get("market_caches") or {}
-    cache = caches.get(symbol)
-    if not isinstance(cache, IMarketCache):
-        return None
+    if cache is None:
+        cache = resolve_market_cache(context, symbol)
+        if cache is None:
+            return None
 
     return cache.get_orderbook()
 
 
-__all__ = ["get_order_book_from_context"]
+__all__ = ["get_order_book_from_context", "resolve_market_cache"]
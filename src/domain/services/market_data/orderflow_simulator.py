@@ -14,12 +14,105 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
-from src.domain.interfaces.cache import IMarketCache
+from src.domain.interfaces.cache import is_market_cache
 from src.infrastructure.logging.logging_setup import log_stage
 
 
+OrderflowHandler = Callable[[float, int], None]
+
+# Ограничиваемся небольшим количеством уровней для симуляции, реальный
+# depth всё равно нарежет InMemoryMarketCache.update_orderbook().
+_MAX_LEVELS = 10
+
+
+def make_orderflow_handler(context: Dict[str, Any], symbol: str) -> OrderflowHandler | None:
+    """Собрать обработчик тиков симуляции, специализированный под ``symbol``.
+
+    Кэш, пара, глубина стакана и bound‑методы кэша резолвятся один раз
+    и замыкаются в обработчик, поэтому горячий вызов ``handle(price, ts)``
+    не ходит в ``context["market_caches"]``/``context["pairs"]``. Цикл,
+    который гоняет один символ, получает обработчик до старта.
+
+    Возвращает ``None``, если для символа нет :class:`IMarketCache`.
+    """
+
+    caches = context.get("market_caches") or {}
+    cache = caches.get(symbol)
+    if not is_market_cache(cache):
+        return None
+
+    pairs = context.get("pairs") or {}
+    pair = pairs.get(symbol)
+    depth = getattr(pair, "orderbook_depth", _MAX_LEVELS)
+    levels = min(depth, _MAX_LEVELS)
+
+    update_orderbook = cache.update_orderbook
+    add_trade = cache.add_trade
+    add_bar = cache.add_bar
+    # Если кэш ведёт пул dict'ов трейдов, берём объект из него — кэш вернёт
+    # его обратно при вытеснении из окна истории.
+    trade_pool = getattr(cache, "trade_pool", None)
+    new_trade: Callable[[], Dict[str, Any]] = trade_pool.get if trade_pool is not None else dict
+
+    def handle(price: float, ts: int) -> None:
+        spread = max(price * 0.0005, 0.01)  # минимальный спред ~0.01
+        bids = []
+        asks = []
+        for i in range(levels):
+            # Чем дальше от mid, тем хуже цена и больше объём
+            bid_price = price - spread * (i + 1)
+            ask_price = price + spread * (i + 1)
+            volume = 1.0 + i
+            bids.append([round(bid_price, 2), volume])
+            asks.append([round(ask_price, 2), volume])
+
+        update_orderbook(
+            {
+                "symbol": symbol,
+                "bids": bids,
+                "asks": asks,
+                "timestamp": ts,
+            }
+        )
+
+        # Один упрощённый trade на тик: сделка по текущей цене.
+        # Минимальный набор полей под формат ccxt; при замене провайдера
+        # сюда можно будет подставить реальные id/side и т.п.
+        close = float(price)
+        trade = new_trade()
+        trade["symbol"] = symbol
+        trade["price"] = close
+        trade["amount"] = 1.0
+        trade["timestamp"] = ts
+        add_trade(trade)
+
+        # Простейший бар OHLCV: один тик == один бар.
+        add_bar(
+            {
+                "symbol": symbol,
+                "timestamp": ts,
+                "open": close,
+                "high": close,
+                "low": close,
+                "close": close,
+                "volume": 1.0,
+            }
+        )
+
+        log_stage(
+            "FEEDS",
+            "Симуляция стакана, трейда и бара по тику",
+            symbol=symbol,
+            price=price,
+            ts=ts,
+            levels=levels,
+        )
+
+    return handle
+
+
 def update_orderflow_from_tick(
     context: Dict[str, Any], *, symbol: str, price: float, ts: int
 ) -> None:
@@ -38,75 +131,18 @@ def update_orderflow_from_tick(
       (``CurrencyPair.orderbook_depth``) через реализацию
       :class:`InMemoryMarketCache`.
 
+    Разовый вызов: обработчик собирается через
+    :func:`make_orderflow_handler` и сразу применяется к тику. Циклы по
+    одному символу должны получать обработчик один раз.
+
     В реальной системе эта функция будет заменена коннектором к бирже
     или внешнему поставщику ордерфлоу, но контракт для бизнес‑кода
     останется прежним.
     """
 
-    caches = context.get("market_caches") or {}
-    cache = caches.get(symbol)
-    if not isinstance(cache, IMarketCache):
-        return
+    handle = make_orderflow_handler(context, symbol)
+    if handle is not None:
+        handle(price, ts)
 
-    pairs = context.get("pairs") or {}
-    pair = pairs.get(symbol)
 
-    # Ограничиваемся небольшим количеством уровней для симуляции, реальный
-    # depth всё равно нарежет InMemoryMarketCache.update_orderbook().
-    max_levels = 10
-    depth = getattr(pair, "orderbook_depth", max_levels)
-    levels = min(depth, max_levels)
-
-    spread = max(price * 0.0005, 0.01)  # минимальный спред ~0.01
-    bids = []
-    asks = []
-    for i in range(levels):
-        # Чем дальше от mid, тем хуже цена и больше объём
-        bid_price = price - spread * (i + 1)
-        ask_price = price + spread * (i + 1)
-        volume = 1.0 + i
-        bids.append([round(bid_price, 2), volume])
-        asks.append([round(ask_price, 2), volume])
-
-    orderbook = {
-        "symbol": symbol,
-        "bids": bids,
-        "asks": asks,
-        "timestamp": ts,
-    }
-    cache.update_orderbook(orderbook)
-
-    # Один упрощённый trade на тик: сделка по текущей цене.
-    trade = {
-        "symbol": symbol,
-        "price": float(price),
-        "amount": 1.0,
-        "timestamp": ts,
-        # Минимальный набор полей под формат ccxt; при замене
-        # провайдера сюда можно будет подставить реальные id/side и т.п.
-    }
-    cache.add_trade(trade)
-
-    # Простейший бар OHLCV: один тик == один бар.
-    bar = {
-        "symbol": symbol,
-        "timestamp": ts,
-        "open": float(price),
-        "high": float(price),
-        "low": float(price),
-        "close": float(price),
-        "volume": 1.0,
-    }
-    cache.add_bar(bar)
-
-    log_stage(
-        "FEEDS",
-        "Симуляция стакана, трейда и бара по тику",
-        symbol=symbol,
-        price=price,
-        ts=ts,
-        levels=levels,
-    )
-
-
-__all__ = ["update_orderflow_from_tick"]
+__all__ = ["OrderflowHandler", "make_orderflow_handler", "update_orderflow_from_tick"]
@@ -1,12 +1,29 @@
 from typing import Dict, Any, List
 
+from src.domain.entities.action import Action
+from src.domain.services.context.state import Context, Decision, Intent
 from src.infrastructure.logging.logging_setup import log_info
 
 # Имя логгера для этого модуля
 _LOG = __name__
 
+# Действие «ничего не делать»; ``Action`` — ``StrEnum``, поэтому
+# сравнение с ним у intents из стратегий остаётся сравнением строк.
+_HOLD = Action.HOLD
 
-def decide(intents: List[Dict[str, Any]], context: Dict[str, Any], *, ticker_id: int, symbol: str) -> Dict[str, Any]:
+
+# Общий пустой mapping для цепочек ``.get`` вместо временных ``{}``.
+_EMPTY: Dict[str, Any] = {}
+
+
+def _hold(context: Context, symbol: str, reason: str) -> Decision:
+    """Решение HOLD с timestamp последнего тика пары (если он есть)."""
+
+    market = (context.get("market") or _EMPTY).get(symbol) or _EMPTY
+    return {"action": _HOLD, "reason": reason, "ts": market.get("ts")}
+
+
+def decide(intents: List[Intent], context: Context, *, ticker_id: int, symbol: str) -> Decision:
     """Простейший оркестратор принятия решения по intents.
 
     Контракт (на текущем этапе прототипа):
@@ -54,21 +71,16 @@ def decide(intents: List[Dict[str, Any]], context: Dict[str, Any], *, ticker_id:
         _LOG
     )
 
-    # Базовое решение: HOLD, если стратегий нет или все бездействуют.
-    decision: Dict[str, Any] = {
-        "action": "HOLD",
-        "reason": "no_action",
-        "ts": context.get("market", {}).get(symbol, {}).get("ts"),
-    }
-
-    # 1. Выбираем первый не-HOLD intent.
-    chosen_intent: Dict[str, Any] | None = None
-    for intent in intents:
-        if intent.get("action") != "HOLD":
-            chosen_intent = intent
-            break
-
-    if chosen_intent is not None:
+    # 1. Выбираем первый не-HOLD intent (сканирование через next() по
+    # генератору, без явного цикла с break).
+    chosen_intent: Intent | None = next(
+        (intent for intent in intents if intent.get("action") != _HOLD), None
+    )
+
+    if chosen_intent is None:
+        # Базовое решение: HOLD, если стратегий нет или все бездействуют.
+        decision: Decision = _hold(context, symbol, "no_action")
+    else:
         decision = {
             "action": chosen_intent.get("action"),
             "reason": chosen_intent.get("reason", "intent"),
@@ -76,9 +88,9 @@ def decide(intents: List[Dict[str, Any]], context: Dict[str, Any], *, ticker_id:
         }
 
         # 2. Применяем простой риск‑чек по объёму, если он настроен.
-        risk_cfg = context.get("risk", {}).get(symbol) or {}
+        risk_cfg = (context.get("risk") or _EMPTY).get(symbol) or _EMPTY
         max_amount = risk_cfg.get("max_amount")
-        params = decision.get("params") or {}
+        params = decision["params"] or _EMPTY
         amount = params.get("amount")
 
         try:
@@ -95,11 +107,7 @@ def decide(intents: List[Dict[str, Any]], context: Dict[str, Any], *, ticker_id:
             if max_amount_value is not None and amount_value > max_amount_value:
                 # Лимит превышен — решение понижается до HOLD, заявка не
                 # будет отправлена в Execution‑слой.
-                decision = {
-                    "action": "HOLD",
-                    "reason": "risk_limit_exceeded",
-                    "ts": context.get("market", {}).get(symbol, {}).get("ts"),
-                }
+                decision = _hold(context, symbol, "risk_limit_exceeded")
 
     log_info(
         f"🧩 [ORCH] Решение принято | ticker_id: {ticker_id} | symbol: {symbol} | action: {decision.get('action')} | reason: {decision.get('reason')}",
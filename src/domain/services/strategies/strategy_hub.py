@@ -1,12 +1,14 @@
-from typing import Dict, Any, List
+from typing import List
 
+from src.domain.entities.action import Action
+from src.domain.services.context.state import Context, Intent
 from src.infrastructure.logging.logging_setup import log_info
 
 # Имя логгера для этого модуля
 _LOG = __name__
 
 
-def evaluate_strategies(context: Dict[str, Any], *, ticker_id: int, symbol: str) -> List[Dict[str, Any]]:
+def evaluate_strategies(context: Context, *, ticker_id: int, symbol: str) -> List[Intent]:
     """Вернуть список намерений (intents) для указанного инструмента.
 
     Сейчас реализована лишь очень простая демонстрационная логика, но
@@ -20,11 +22,11 @@ def evaluate_strategies(context: Dict[str, Any], *, ticker_id: int, symbol: str)
 
     # Extremely simple placeholder: alternate HOLD and BUY/SELL for demonstration
     if ticker_id % 3 == 0:
-        intents = [{"action": "SELL", "confidence": 0.4, "reason": "demo_down", "params": {}}]
+        intents = [{"action": Action.SELL, "confidence": 0.4, "reason": "demo_down", "params": {}}]
     elif ticker_id % 2 == 0:
-        intents = [{"action": "BUY", "confidence": 0.7, "reason": "demo_up", "params": {"budget": 100}}]
+        intents = [{"action": Action.BUY, "confidence": 0.7, "reason": "demo_up", "params": {"budget": 100}}]
     else:
-        intents = [{"action": "HOLD", "confidence": 0.1, "reason": "no_signal", "params": {}}]
+        intents = [{"action": Action.HOLD, "confidence": 0.1, "reason": "no_signal", "params": {}}]
 
     log_info(
         f"🎯 [STRAT] Intents сформированы | ticker_id: {ticker_id} | symbol: {symbol} | intents: {intents}",
@@ -10,14 +10,121 @@ from __future__ import annotations
 оставаясь при этом полностью изолированным от деталей инфраструктуры.
 """
 
+import asyncio
+import sys
 from collections.abc import AsyncIterator
-from typing import TypedDict
+from operator import itemgetter
+from typing import List, Tuple, TypedDict, TypeVar
 
 from src.infrastructure.connectors.interfaces.exchange_connector import (
     IExchangeConnector,
 )
 
 
+T = TypeVar("T")
+
+# Поля CCXT‑тикера в порядке объявления :class:`Ticker`; один itemgetter
+# достаёт их из сырого тика за вызов вместо двенадцати ``raw[...]``.
+_TICKER_FIELDS = itemgetter(
+    "symbol",
+    "timestamp",
+    "datetime",
+    "last",
+    "open",
+    "high",
+    "low",
+    "close",
+    "bid",
+    "ask",
+    "baseVolume",
+    "quoteVolume",
+)
+
+# Маркер конца потока в очереди iter_bursts.
+_END = object()
+
+# Верхняя граница размера пачки у источников тиков: первый тик пачки не
+# ждёт обработки тысяч следующих. Тот же размер по умолчанию ограничивает
+# очередь iter_bursts — backpressure держит именно она.
+DEFAULT_MAX_BURST = 64
+
+
+class _PumpFailure:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+async def iter_bursts(
+    source: AsyncIterator[T], *, max_burst: int | None = None
+) -> AsyncIterator[List[T]]:
+    """Перегруппировать асинхронный поток в «пачки» уже пришедших элементов.
+
+    Фоновая задача перекачивает ``source`` в :class:`asyncio.Queue`, а
+    потребитель ждёт только первый элемент пачки и затем забирает всё,
+    что уже лежит в очереди, через ``get_nowait()``. Если биржа присылает
+    десятки тиков одним WebSocket‑кадром, цикл обработки платит за
+    переключение event loop один раз на пачку, а не на каждый тик.
+
+    Порядок элементов сохраняется; исключение источника пробрасывается
+    потребителю после уже полученных элементов. ``max_burst`` ограничивает
+    размер пачки (``None`` — забирать всё, что уже в очереди).
+
+    Очередь ограничена (``max_burst`` или :data:`DEFAULT_MAX_BURST`
+    элементов): когда потребитель отстаёт, перекачка ждёт на ``put`` и
+    перестаёт читать ``source``, как прежний ``async for`` без пачек.
+    """
+
+    if max_burst is not None and max_burst <= 0:
+        raise ValueError("max_burst must be > 0")
+    limit = max_burst or 0
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_burst or DEFAULT_MAX_BURST)
+
+    async def pump() -> None:
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as exc:  # noqa: BLE001 - пробрасываем потребителю
+            await queue.put(_PumpFailure(exc))
+        else:
+            await queue.put(_END)
+        finally:
+            # Отмена прерывает ``async for``, но не закрывает генератор
+            # источника — закрываем явно, не дожидаясь сборщика мусора.
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            burst: List[T] = []
+            while True:
+                if item is _END:
+                    if burst:
+                        yield burst
+                    return
+                if isinstance(item, _PumpFailure):
+                    if burst:
+                        yield burst
+                    raise item.exc
+                burst.append(item)
+                if len(burst) == limit:
+                    break
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            yield burst
+    finally:
+        # Дожидаемся отмены, чтобы источник был закрыт до выхода.
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
 class Ticker(TypedDict):
     """Доменный тикер в формате CCXT ``fetch_ticker()``.
 
@@ -69,7 +176,7 @@ class TickSource:
 
     def __init__(self, connector: IExchangeConnector, symbol: str) -> None:
         self._connector = connector
-        self._symbol = symbol
+        self._symbol = sys.intern(symbol)
 
     async def stream(self) -> AsyncIterator[Ticker]:
         """Асинхронно итерироваться по унифицированным CCXT‑тикерам.
@@ -83,24 +190,66 @@ class TickSource:
         * ``bid``, ``ask``, ``baseVolume``, ``quoteVolume``.
 
         Здесь мы лишь жёстко приводим типы и фиксируем контракт через
-        :class:`Ticker`.
+        :class:`Ticker`. Тикер собирается dict‑литералом с константными
+        ключами: вызов ``Ticker(...)`` у TypedDict — это ``dict(**kwargs)``
+        с упаковкой аргументов на каждом тике.
         """
 
+        fields = _TICKER_FIELDS
+        async for raw in self._connector.stream_ticks(self._symbol):
+            symbol, timestamp, dt, last, open_, high, low, close, bid, ask, base_vol, quote_vol = fields(raw)
+            ticker: Ticker = {
+                "symbol": str(symbol),
+                "timestamp": int(timestamp),
+                "datetime": str(dt),
+                "last": float(last),
+                "open": float(open_),
+                "high": float(high),
+                "low": float(low),
+                "close": float(close),
+                "bid": float(bid),
+                "ask": float(ask),
+                "baseVolume": float(base_vol),
+                "quoteVolume": float(quote_vol),
+            }
+            yield ticker
+
+    def stream_batches(self, max_burst: int | None = DEFAULT_MAX_BURST) -> AsyncIterator[List[Ticker]]:
+        """Поток тикеров пачками уже пришедших значений (см. :func:`iter_bursts`)."""
+
+        return iter_bursts(self.stream(), max_burst=max_burst)
+
+
+# Компактное представление тика для горячего пути: (symbol, timestamp, last).
+TickTuple = Tuple[str, int, float]
+
+
+class TupleTickSource:
+    """Облегчённый источник тиков в виде кортежей :data:`TickTuple`.
+
+    Core‑цикл читает из тика только ``symbol``/``timestamp``/``last``,
+    поэтому вместо полного :class:`Ticker` на 12 полей здесь отдаётся
+    позиционный кортеж из трёх значений — без построения dict на каждый
+    тик. Удобен для реплея и нагрузочных прогонов на миллионах тиков.
+    """
+
+    def __init__(self, connector: IExchangeConnector, symbol: str) -> None:
+        self._connector = connector
+        self._symbol = sys.intern(symbol)
+
+    async def stream(self) -> AsyncIterator[TickTuple]:
         async for raw in self._connector.stream_ticks(self._symbol):
-            yield Ticker(
-                symbol=str(raw["symbol"]),
-                timestamp=int(raw["timestamp"]),
-                datetime=str(raw["datetime"]),
-                last=float(raw["last"]),
-                open=float(raw["open"]),
-                high=float(raw["high"]),
-                low=float(raw["low"]),
-                close=float(raw["close"]),
-                bid=float(raw["bid"]),
-                ask=float(raw["ask"]),
-                baseVolume=float(raw["baseVolume"]),
-                quoteVolume=float(raw["quoteVolume"]),
-            )
-
-
-__all__ = ["Ticker", "TickSource"]
+            yield (str(raw["symbol"]), int(raw["timestamp"]), float(raw["last"]))
+
+    def stream_batches(self, max_burst: int | None = DEFAULT_MAX_BURST) -> AsyncIterator[List[TickTuple]]:
+        return iter_bursts(self.stream(), max_burst=max_burst)
+
+
+__all__ = [
+    "DEFAULT_MAX_BURST",
+    "Ticker",
+    "TickSource",
+    "TickTuple",
+    "TupleTickSource",
+    "iter_bursts",
+]
@@ -7,13 +7,113 @@
 
 from __future__ import annotations
 
-from collections import deque
-from typing import Any, Deque, Dict, List
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
 
 from src.config.config import AppConfig
 from src.domain.entities.currency_pair import CurrencyPair
 from src.domain.interfaces.cache import IIndicatorStore, IMarketCache
+from src.infrastructure.cache.ring import FloatRing, ring_capacity, ring_read
 from src.infrastructure.logging.logging_setup import log_stage
+from src.infrastructure.pool.dict_pool import DictPool
+
+
+def _build_update_predicate(interval: int) -> Callable[[int], bool]:
+    """Собрать предикат «обновлять ли уровень на тике ``ticker_id``».
+
+    Интервал фиксирован на время жизни стора, поэтому проверка
+    специализируется один раз: интервал 1 – всегда ``True``, степень
+    двойки – битовая маска вместо деления, иначе – остаток от деления.
+    Неположительный интервал отключает обновление уровня.
+    """
+
+    if interval <= 0:
+        return lambda ticker_id: False
+    if interval == 1:
+        return lambda ticker_id: True
+    if interval & (interval - 1) == 0:
+        mask = interval - 1
+        return lambda ticker_id: ticker_id & mask == 0
+    return lambda ticker_id: ticker_id % interval == 0
+
+
+def _top_levels(levels: Sequence[Any], depth: int) -> List[Any]:
+    """Первые ``depth`` уровней стороны стакана новым списком.
+
+    Срез копирует только ``depth`` ссылок; ``list()`` нужен лишь для
+    не‑списочных последовательностей (например, кортежей).
+    """
+
+    head = levels[:depth]
+    return head if type(head) is list else list(head)
+
+
+class _ObjectRing:
+    """Кольцевой буфер объектов фиксированной ёмкости 2**k.
+
+    Замена ``deque(maxlen=window)`` для горячих историй кэша: список
+    слотов выделяется один раз, позиция записи сдвигается битовой маской,
+    вытесняемый элемент просто снимается со слота. Хранится не больше
+    ``window`` последних элементов; ``window == 0`` — ничего не хранит.
+    """
+
+    __slots__ = ("_items", "_mask", "_window", "head", "count")
+
+    def __init__(self, window: int) -> None:
+        window = max(window, 0)
+        capacity = ring_capacity(window)
+        self._items: List[Any] = [None] * capacity
+        self._mask = capacity - 1
+        self._window = window
+        self.head = 0  # индекс следующей записи
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        return self._mask + 1
+
+    def append(self, item: Any) -> Any:
+        """Добавить элемент; вернуть вытесненный из окна элемент или ``None``."""
+
+        window = self._window
+        if not window:
+            return None
+        items = self._items
+        head = self.head
+        evicted = None
+        if self.count == window:
+            tail = (head - window) & self._mask
+            evicted = items[tail]
+            items[tail] = None
+        else:
+            self.count += 1
+        items[head] = item
+        self.head = (head + 1) & self._mask
+        return evicted
+
+    def tail(self, count: int) -> List[Any]:
+        """Последние ``count`` (<= len) элементов в порядке добавления."""
+
+        items = self._items
+        start = (self.head - count) & self._mask
+        stop = start + count
+        if stop <= len(items):
+            return items[start:stop]
+        return items[start:] + items[: stop - len(items)]
+
+    def to_list(self, limit: int | None = None) -> List[Any]:
+        """Список элементов с семантикой ``list(deque)[-limit:]``."""
+
+        count = self.count
+        if limit is None or limit >= count:
+            return self.tail(count)
+        if limit > 0:
+            return self.tail(limit)
+        return self.tail(count)[-limit:]
 
 
 class InMemoryMarketCache(IMarketCache):
@@ -24,18 +124,36 @@ class InMemoryMarketCache(IMarketCache):
     * bar_window_size – длина истории баров;
     * trades_history_size – длина истории трейдов;
     * orderbook_depth – максимальное число уровней стакана на сторону.
+
+    Помимо dict‑истории трейдов (контракт :class:`IMarketCache`) кэш
+    ведёт колоночное представление тех же трейдов: кольцевые массивы
+    NumPy ``price``/``amount`` (float64) и ``timestamp`` (int64). Оконные
+    агрегаты (SMA, VWAP и т.п.) берут их через :meth:`get_trade_columns`
+    одним копированием непрерывной памяти, без обхода dict'ов.
+    Отсутствующие в трейде поля пишутся как ``nan``/``0``.
+
+    Если передан ``trade_pool``, вытесненные из окна dict'ы трейдов
+    возвращаются в пул, а поставщик трейдов (симулятор ордерфлоу) берёт
+    новые dict'ы оттуда же. В этом режиме результат :meth:`get_trades`
+    нельзя хранить дольше, чем трейд живёт в окне истории.
     """
 
-    def __init__(self, pair: CurrencyPair):
+    def __init__(self, pair: CurrencyPair, *, trade_pool: DictPool | None = None):
         self.pair = pair
         self.symbol: str = pair.symbol
+        self.trade_pool = trade_pool
 
         self._ticker: Dict[str, Any] | None = None
         self._orderbook: Dict[str, Any] | None = None
-        self._bars: Deque[Dict[str, Any]] = deque(maxlen=pair.bar_window_size)
-        self._trades: Deque[Dict[str, Any]] = deque(
-            maxlen=pair.trades_history_size
-        )
+        # Истории баров и трейдов — предвыделенные кольца вместо deque.
+        self._bars = _ObjectRing(pair.bar_window_size)
+        self._trades = _ObjectRing(pair.trades_history_size)
+
+        # Колонки трейдов (SoA) делят индексы с кольцом self._trades.
+        capacity = self._trades.capacity
+        self._trade_price = np.full(capacity, np.nan, dtype=np.float64)
+        self._trade_amount = np.full(capacity, np.nan, dtype=np.float64)
+        self._trade_ts = np.zeros(capacity, dtype=np.int64)
 
         log_stage(
             "BOOT",
@@ -66,7 +184,13 @@ class InMemoryMarketCache(IMarketCache):
     # --- Order book ---
 
     def update_orderbook(self, orderbook: Dict[str, Any]) -> None:  # type: ignore[override]
-        """Сохранить стакан, обрезав списки bids/asks по depth пары."""
+        """Сохранить стакан, обрезав списки bids/asks по depth пары.
+
+        CCXT отдаёт уровни уже отсортированными (bids по убыванию цены,
+        asks по возрастанию), поэтому лучшие ``depth`` уровней — это
+        префикс списка: берётся срез на ``depth`` элементов без
+        копирования всей стороны и без сортировки/partition.
+        """
 
         depth = self.pair.orderbook_depth
         bids = orderbook.get("bids") or []
@@ -74,8 +198,8 @@ class InMemoryMarketCache(IMarketCache):
         trimmed = {
             **orderbook,
             "symbol": orderbook.get("symbol") or self.symbol,
-            "bids": list(bids)[:depth],
-            "asks": list(asks)[:depth],
+            "bids": _top_levels(bids, depth),
+            "asks": _top_levels(asks, depth),
         }
         self._orderbook = trimmed
 
@@ -94,7 +218,19 @@ class InMemoryMarketCache(IMarketCache):
     # --- Trades ---
 
     def add_trade(self, trade: Dict[str, Any]) -> None:  # type: ignore[override]
-        self._trades.append(trade)
+        trades = self._trades
+        head = trades.head
+        evicted = trades.append(trade)
+        if evicted is not None and self.trade_pool is not None:
+            self.trade_pool.put(evicted)
+        # Окно нулевой длины ничего не хранит. Сдвиг head для решения не
+        # годится: при ёмкости 1 маска равна 0 и head всегда остаётся 0.
+        if trades.count:
+            price = trade.get("price")
+            amount = trade.get("amount")
+            self._trade_price[head] = np.nan if price is None else price
+            self._trade_amount[head] = np.nan if amount is None else amount
+            self._trade_ts[head] = trade.get("timestamp") or 0
         log_stage(
             "FEEDS",
             "Добавлен трейд в историю InMemoryMarketCache",
@@ -105,10 +241,39 @@ class InMemoryMarketCache(IMarketCache):
         )
 
     def get_trades(self, limit: int | None = None) -> List[Dict[str, Any]]:  # type: ignore[override]
-        items = list(self._trades)
-        if limit is None or limit >= len(items):
-            return items
-        return items[-limit:]
+        return self._trades.to_list(limit)
+
+    def get_trade_columns(
+        self, limit: int | None = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Вернуть колонки ``(price, amount, timestamp)`` последних трейдов.
+
+        Массивы — копии в хронологическом порядке (старые → новые); при
+        ``limit`` берутся только последние ``limit`` трейдов.
+        """
+
+        count = self._trade_tail_count(limit)
+        head = self._trades.head
+        return (
+            ring_read(self._trade_price, head, count),
+            ring_read(self._trade_amount, head, count),
+            ring_read(self._trade_ts, head, count),
+        )
+
+    def get_prices(self, limit: int | None = None) -> np.ndarray:
+        """Цены последних трейдов одним непрерывным ``float64``‑массивом.
+
+        Быстрый путь для оконных агрегатов: одна копия из кольца без
+        сборки dict'ов и без колонок amount/timestamp.
+        """
+
+        return ring_read(self._trade_price, self._trades.head, self._trade_tail_count(limit))
+
+    def _trade_tail_count(self, limit: int | None) -> int:
+        count = self._trades.count
+        if limit is not None and limit < count:
+            count = max(limit, 0)
+        return count
 
     # --- Bars / OHLCV ---
 
@@ -124,10 +289,7 @@ class InMemoryMarketCache(IMarketCache):
         )
 
     def get_bars(self, limit: int | None = None) -> List[Dict[str, Any]]:  # type: ignore[override]
-        items = list(self._bars)
-        if limit is None or limit >= len(items):
-            return items
-        return items[-limit:]
+        return self._bars.to_list(limit)
 
 
 class InMemoryIndicatorStore(IIndicatorStore):
@@ -146,11 +308,18 @@ class InMemoryIndicatorStore(IIndicatorStore):
         self.medium_interval: int = config.indicator_medium_interval
         self.heavy_interval: int = config.indicator_heavy_interval
 
-        # Храним последние значения индикаторов в отдельных окнах.
+        # Политика обновления: предикаты специализируются под интервалы
+        # один раз и вызываются напрямую как атрибуты экземпляра.
+        self.should_update_fast: Callable[[int], bool] = _build_update_predicate(self.fast_interval)
+        self.should_update_medium: Callable[[int], bool] = _build_update_predicate(self.medium_interval)
+        self.should_update_heavy: Callable[[int], bool] = _build_update_predicate(self.heavy_interval)
+
+        # Храним последние значения индикаторов в отдельных окнах —
+        # кольцах float64 (см. :class:`FloatRing`).
         maxlen = pair.indicator_window_size
-        self.fast_history: Deque[float] = deque(maxlen=maxlen)
-        self.medium_history: Deque[float] = deque(maxlen=maxlen)
-        self.heavy_history: Deque[float] = deque(maxlen=maxlen)
+        self.fast_history = FloatRing(maxlen)
+        self.medium_history = FloatRing(maxlen)
+        self.heavy_history = FloatRing(maxlen)
 
         log_stage(
             "BOOT",
@@ -162,20 +331,6 @@ class InMemoryIndicatorStore(IIndicatorStore):
             heavy_interval=self.heavy_interval,
         )
 
-    # --- Политика обновления ---
-
-    def _should_update(self, interval: int, ticker_id: int) -> bool:
-        return interval > 0 and ticker_id % interval == 0
-
-    def should_update_fast(self, ticker_id: int) -> bool:  # type: ignore[override]
-        return self._should_update(self.fast_interval, ticker_id)
-
-    def should_update_medium(self, ticker_id: int) -> bool:  # type: ignore[override]
-        return self._should_update(self.medium_interval, ticker_id)
-
-    def should_update_heavy(self, ticker_id: int) -> bool:  # type: ignore[override]
-        return self._should_update(self.heavy_interval, ticker_id)
-
 
 __all__ = [
     "InMemoryMarketCache",
@@ -0,0 +1,87 @@
+"""Кольцевые буферы фиксированной ёмкости 2**k поверх NumPy.
+
+Общие примитивы для in‑memory историй: ёмкость округляется до степени
+двойки, позиция записи сдвигается битовой маской, а чтение окна в
+хронологическом порядке — один срез или один ``np.concatenate``.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy as np
+
+
+def ring_capacity(window: int) -> int:
+    """Ёмкость кольцевого буфера: ближайшая степень двойки ``>= window``.
+
+    Степень двойки позволяет переводить позицию в индекс битовой маской
+    (``pos & (capacity - 1)``) вместо деления по модулю.
+    """
+
+    return 1 << max(window - 1, 0).bit_length()
+
+
+def ring_read(column: np.ndarray, head: int, count: int) -> np.ndarray:
+    """Скопировать ``count`` последних элементов кольца в хронологическом порядке.
+
+    ``head`` — индекс следующей записи. Непрерывный участок копируется
+    одним срезом, перенос через конец буфера — одним ``np.concatenate``.
+    """
+
+    start = (head - count) & (len(column) - 1)
+    stop = start + count
+    if stop <= len(column):
+        return column[start:stop].copy()
+    return np.concatenate((column[start:], column[: stop - len(column)]))
+
+
+class FloatRing:
+    """Кольцевой буфер float64 фиксированной ёмкости 2**k.
+
+    Замена ``deque(maxlen=window)`` для числовых историй: значения
+    лежат в одном непрерывном ndarray, и :meth:`as_array` отдаёт окно
+    в хронологическом порядке одним срезом (или ``np.concatenate`` при
+    переносе через конец буфера) — готовый вход для векторных расчётов.
+    Итерация совместима с deque: ``list(ring)`` — значения по порядку.
+    """
+
+    __slots__ = ("_buf", "_mask", "_window", "_head", "_count")
+
+    def __init__(self, window: int) -> None:
+        window = max(window, 0)
+        capacity = ring_capacity(window)
+        self._buf = np.empty(capacity, dtype=np.float64)
+        self._mask = capacity - 1
+        self._window = window
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.as_array().tolist())
+
+    def append(self, value: float) -> None:
+        window = self._window
+        if not window:
+            return
+        head = self._head
+        self._buf[head] = value
+        self._head = (head + 1) & self._mask
+        if self._count < window:
+            self._count += 1
+
+    def as_array(self) -> np.ndarray:
+        """Копия окна в хронологическом порядке (старые значения первыми)."""
+
+        return ring_read(self._buf, self._head, self._count)
+
+    def tail(self, count: int) -> np.ndarray:
+        """Копия последних ``count`` значений (не больше длины) по порядку."""
+
+        return ring_read(self._buf, self._head, min(count, self._count))
+
+
+__all__ = ["FloatRing", "ring_capacity", "ring_read"]
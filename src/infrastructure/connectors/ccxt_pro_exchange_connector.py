@@ -19,6 +19,7 @@ from __future__ import annotations
 """
 
 from collections.abc import AsyncIterator
+from operator import itemgetter
 from typing import Any
 
 from src.config.config import AppConfig
@@ -46,6 +47,24 @@ else:  # pragma: no cover - ветка с успешно установленн
     _ccxt_import_error = None
 
 
+# Обязательные поля CCXT‑тикера (кроме ``symbol``, у которого есть
+# значение по умолчанию): один itemgetter на тик вместо одиннадцати
+# отдельных ``raw[...]``.
+_TICKER_FIELDS = itemgetter(
+    "timestamp",
+    "datetime",
+    "last",
+    "open",
+    "high",
+    "low",
+    "close",
+    "bid",
+    "ask",
+    "baseVolume",
+    "quoteVolume",
+)
+
+
 class CcxtProExchangeConnector(IExchangeConnector):
     """Минимальный пример коннектора под ccxt.pro.
 
@@ -136,27 +155,30 @@ class CcxtProExchangeConnector(IExchangeConnector):
         """
 
         symbols = [symbol]
+        watch_tickers = self._exchange.watch_tickers
+        fields = _TICKER_FIELDS
 
         while True:
             # Вызов ``watch_tickers`` возвращает dict symbol -> ticker.
-            tickers: dict[str, Any] = await self._exchange.watch_tickers(symbols)
+            tickers: dict[str, Any] = await watch_tickers(symbols)
 
             raw = tickers[symbol]
+            timestamp, dt, last, open_, high, low, close, bid, ask, base_vol, quote_vol = fields(raw)
 
             # Приведение к минимальному контракту CCXT‑тикера.
             yield {
                 "symbol": str(raw.get("symbol", symbol)),
-                "timestamp": int(raw["timestamp"]),
-                "datetime": str(raw["datetime"]),
-                "last": float(raw["last"]),
-                "open": float(raw["open"]),
-                "high": float(raw["high"]),
-                "low": float(raw["low"]),
-                "close": float(raw["close"]),
-                "bid": float(raw["bid"]),
-                "ask": float(raw["ask"]),
-                "baseVolume": float(raw["baseVolume"]),
-                "quoteVolume": float(raw["quoteVolume"]),
+                "timestamp": int(timestamp),
+                "datetime": str(dt),
+                "last": float(last),
+                "open": float(open_),
+                "high": float(high),
+                "low": float(low),
+                "close": float(close),
+                "bid": float(bid),
+                "ask": float(ask),
+                "baseVolume": float(base_vol),
+                "quoteVolume": float(quote_vol),
             }
 
     async def fetch_order_book(self, symbol: str) -> dict:
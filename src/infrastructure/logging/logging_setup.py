@@ -1,6 +1,5 @@
 import logging
 import os
-import time
 from logging.handlers import RotatingFileHandler
 from typing import Any
 
@@ -34,28 +33,21 @@ class StageFallbackFormatter(logging.Formatter):
       как в боевых логах из ``bad_example``::
 
           2025-08-14 11:43:29,142 - __main__ - INFO - ...
+
+    Время форматирует стандартный ``Formatter.formatTime`` через
+    ``default_time_format``/``default_msec_format``. Миллисекунды он
+    добавляет только когда ``datefmt`` не задан, поэтому форматтер
+    создаётся без ``datefmt``.
     """
 
+    default_time_format = DATE_FORMAT
+    default_msec_format = "%s,%03d"
+
     def format(self, record: logging.LogRecord) -> str:  # type: ignore[name-defined]
         if not hasattr(record, "stage"):
             record.stage = "-"  # type: ignore[attr-defined]
         return super().format(record)
 
-    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:  # type: ignore[name-defined]
-        """Формат ``asctime`` с запятой и миллисекундами.
-
-        Стандартный :mod:`logging` при заданном ``datefmt`` отбрасывает
-        миллисекунды. Здесь мы вручную добавляем ``",%03d" % msecs`` к
-        строке времени, сохраняя привычный формат даты.
-        """
-
-        ct = self.converter(record.created)  # type: ignore[attr-defined]
-        if datefmt:
-            s = time.strftime(datefmt, ct)
-        else:
-            s = time.strftime(DATE_FORMAT, ct)
-        return f"{s},{int(record.msecs):03d}"
-
 
 # Небольшая «легенда» emoji по стадиям конвейера (для внутреннего использования)
 STAGE_ICONS: dict[str, str] = {
@@ -77,12 +69,25 @@ STAGE_ICONS: dict[str, str] = {
     "STOP": "🛑",        # остановка
 }
 
+# Готовые префиксы сообщений по stage: на горячем пути ``log_stage``
+# остаётся поиск в словаре и конкатенация.
+_STAGE_PREFIX: dict[str, str] = {stage: f"{icon} " for stage, icon in STAGE_ICONS.items()}
+_DEFAULT_STAGE_PREFIX = "ℹ️ "
+
+# Атрибут, которым ``setup_logging`` помечает свои хендлеры.
+_HANDLER_TAG_ATTR = "_autotrade_tag"
+
 
 def setup_logging(log_file: str = os.path.join("logs", "prototype.log"), level: int = logging.INFO) -> None:
     """Настроить корневой логгер: консоль + ротируемый файл.
 
     - Console: человеко‑читаемый вывод с единым форматом
     - File: RotatingFileHandler (5 MB x 5 backups)
+
+    Функция идемпотентна: созданные ею хендлеры помечаются тегом
+    (``console`` / ``file`` + путь), и при повторном вызове с теми же
+    параметрами уже подключённые хендлеры переиспользуются, а не
+    добавляются заново. Прочие хендлеры корневого логгера снимаются.
     """
 
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
@@ -90,23 +95,53 @@ def setup_logging(log_file: str = os.path.join("logs", "prototype.log"), level:
     logger = logging.getLogger()
     logger.setLevel(level)
 
-    # Clear existing handlers to make function idempotent
+    console_tag = ("console",)
+    file_tag = ("file", os.path.abspath(log_file))
+
+    existing: dict[tuple[str, ...], logging.Handler] = {}
     for h in list(logger.handlers):
+        tag = getattr(h, _HANDLER_TAG_ATTR, None)
+        if tag in (console_tag, file_tag) and tag not in existing:
+            existing[tag] = h
+            h.setLevel(level)
+            continue
         logger.removeHandler(h)
+        if tag is not None:
+            h.close()
 
-    formatter = StageFallbackFormatter(LINE_FORMAT, datefmt=DATE_FORMAT)
+    formatter = StageFallbackFormatter(LINE_FORMAT)
 
     # Console handler
-    ch = logging.StreamHandler()
-    ch.setLevel(level)
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
+    if console_tag not in existing:
+        ch = logging.StreamHandler()
+        ch.setLevel(level)
+        ch.setFormatter(formatter)
+        setattr(ch, _HANDLER_TAG_ATTR, console_tag)
+        logger.addHandler(ch)
 
     # Rotating file handler
-    fh = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=5, encoding="utf-8")
-    fh.setLevel(level)
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
+    if file_tag not in existing:
+        fh = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=5, encoding="utf-8")
+        fh.setLevel(level)
+        fh.setFormatter(formatter)
+        setattr(fh, _HANDLER_TAG_ATTR, file_tag)
+        logger.addHandler(fh)
+
+
+# Логгеры живут в logging.Manager до конца процесса, поэтому их можно
+# запомнить по имени и не брать на каждом вызове log_* глобальный lock
+# модуля logging внутри getLogger().
+_LOGGERS: dict[str | None, logging.Logger] = {}
+
+
+def _logger_for(logger_name: str | None) -> logging.Logger:
+    """Вернуть логгер по имени (пустое имя/None → root) с мемоизацией."""
+
+    logger = _LOGGERS.get(logger_name)
+    if logger is None:
+        logger = _LOGGERS[logger_name] = logging.getLogger(logger_name or None)
+    return logger
+
 
 def log_info(msg: str, logger_name: str | None = None) -> None:
     """Простое INFO-сообщение без stage-тегов.
@@ -119,7 +154,7 @@ def log_info(msg: str, logger_name: str | None = None) -> None:
         msg: Текст сообщения (может содержать emoji).
         logger_name: Имя логгера (по умолчанию root).
     """
-    logger = logging.getLogger(logger_name) if logger_name else logging.getLogger()
+    logger = _logger_for(logger_name)
     logger.info(msg)
 
 
@@ -130,7 +165,7 @@ def log_warning(msg: str, logger_name: str | None = None) -> None:
         msg: Текст сообщения.
         logger_name: Имя логгера (по умолчанию root).
     """
-    logger = logging.getLogger(logger_name) if logger_name else logging.getLogger()
+    logger = _logger_for(logger_name)
     logger.warning(msg)
 
 
@@ -141,7 +176,7 @@ def log_error(msg: str, logger_name: str | None = None) -> None:
         msg: Текст сообщения.
         logger_name: Имя логгера (по умолчанию root).
     """
-    logger = logging.getLogger(logger_name) if logger_name else logging.getLogger()
+    logger = _logger_for(logger_name)
     logger.error(msg)
 
 
@@ -152,7 +187,7 @@ def log_separator(logger_name: str | None = None) -> None:
 
         2025-08-14 11:43:33,026 - __main__ - INFO - ================================================================================
     """
-    logger = logging.getLogger(logger_name) if logger_name else logging.getLogger()
+    logger = _logger_for(logger_name)
     logger.info("=" * 80)
 
 
@@ -173,7 +208,7 @@ def log_stat_block(title: str, stats: list[str], logger_name: str | None = None)
         stats: Список строк статистики.
         logger_name: Имя логгера.
     """
-    logger = logging.getLogger(logger_name) if logger_name else logging.getLogger()
+    logger = _logger_for(logger_name)
     logger.info("=" * 80)
     logger.info(title)
     logger.info("=" * 80)
@@ -197,20 +232,19 @@ def log_stage(stage: str, msg: str, logger_name: str | None = None, **fields: An
         logger_name: Имя логгера (рекомендуется передавать __name__ модуля).
         fields: Дополнительные поля для отладки (выводятся через ``|``).
     """
-    icon = STAGE_ICONS.get(stage.upper(), "ℹ️")
+    prefix = _STAGE_PREFIX.get(stage)
+    if prefix is None:
+        prefix = _STAGE_PREFIX.get(stage.upper(), _DEFAULT_STAGE_PREFIX)
 
     # Формируем текст без технических тегов [STAGE]
     if fields:
         # Поля выводим в читаемом формате через |
-        kv_parts = []
-        for k, v in fields.items():
-            kv_parts.append(f"{k}: {_stringify(v)}")
-        kv_str = " | ".join(kv_parts)
-        text = f"{icon} {msg} | {kv_str}"
+        kv_str = " | ".join(f"{k}: {_stringify(v)}" for k, v in fields.items())
+        text = prefix + msg + " | " + kv_str
     else:
-        text = f"{icon} {msg}"
+        text = prefix + msg
 
-    logger = logging.getLogger(logger_name) if logger_name else logging.getLogger()
+    logger = _logger_for(logger_name)
     logger.info(text, extra={"stage": stage})
 
 
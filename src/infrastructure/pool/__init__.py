@@ -0,0 +1,5 @@
+"""Пулы переиспользуемых объектов для горячего пути ингеста."""
+
+from .dict_pool import DictPool
+
+__all__ = ["DictPool"]
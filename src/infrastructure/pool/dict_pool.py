@@ -0,0 +1,48 @@
+"""Пул переиспользуемых ``dict`` для записей ордерфлоу.
+
+Синтетический трейд создаётся на каждом тике и живёт ровно до вытеснения
+из окна истории кэша. Пул позволяет вернуть вытесненный dict и выдать его
+под следующий трейд вместо аллокации нового объекта.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+DEFAULT_DICT_POOL_SIZE = 1024
+
+
+class DictPool:
+    """LIFO‑пул очищенных ``dict``.
+
+    Не потокобезопасен: рассчитан на один поток конвейера. ``put`` можно
+    вызывать только для объектов, на которые больше никто не ссылается,
+    иначе владелец ссылки увидит чужие данные.
+    """
+
+    __slots__ = ("_free", "_max_size")
+
+    def __init__(self, max_size: int = DEFAULT_DICT_POOL_SIZE) -> None:
+        if max_size < 0:
+            raise ValueError("max_size must be >= 0")
+        self._free: List[Dict[str, Any]] = []
+        self._max_size = max_size
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def get(self) -> Dict[str, Any]:
+        """Выдать пустой dict: из пула, если есть, иначе новый."""
+
+        free = self._free
+        return free.pop() if free else {}
+
+    def put(self, item: Dict[str, Any]) -> None:
+        """Очистить ``item`` и вернуть его в пул (сверх лимита — отбросить)."""
+
+        item.clear()
+        if len(self._free) < self._max_size:
+            self._free.append(item)
+
+
+__all__ = ["DEFAULT_DICT_POOL_SIZE", "DictPool"]
@@ -7,15 +7,28 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+import sys
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 from src.domain.entities.currency_pair import CurrencyPair
 from src.domain.interfaces.currency_pair_repository import ICurrencyPairRepository
 from src.domain.interfaces.exchange_pair_metadata_provider import (
+    IBulkExchangePairMetadataProvider,
     IExchangePairMetadataProvider,
 )
 
 
+def _first_duplicate(symbols: List[str]) -> str:
+    """Найти первый повторяющийся символ (вызывается только при ошибке)."""
+
+    seen: set[str] = set()
+    for symbol in symbols:
+        if symbol in seen:
+            return symbol
+        seen.add(symbol)
+    raise AssertionError("no duplicate symbols")  # pragma: no cover - защитный путь
+
+
 class InMemoryCurrencyPairRepository(ICurrencyPairRepository):
     """Простая in-memory реализация репозитория валютных пар.
 
@@ -34,29 +47,54 @@ class InMemoryCurrencyPairRepository(ICurrencyPairRepository):
         запрошены актуальные прецизионы у провайдера и поля
         :attr:`CurrencyPair.min_step` и :attr:`CurrencyPair.price_step`
         будут **перезаписаны**, даже если у объекта уже были значения
-        (например, он пришёл из БД).
+        (например, он пришёл из БД). Провайдер с пакетным API
+        (:class:`IBulkExchangePairMetadataProvider`) опрашивается одним
+        вызовом на все пары.
         """
 
         pairs_list: List[CurrencyPair] = list(pairs)
-        index: Dict[str, CurrencyPair] = {}
+        # Символы интернируются: одни и те же строки дальше служат ключами
+        # всех словарей контекста, и сравнение ключей сводится к
+        # сравнению указателей.
+        intern = sys.intern
+        symbols: List[str] = []
+        for pair in pairs_list:
+            symbol = intern(pair.symbol)
+            if symbol is not pair.symbol:
+                pair.symbol = symbol
+            symbols.append(symbol)
+        if len(set(symbols)) != len(symbols):
+            raise ValueError(f"Duplicate currency pair symbol: {_first_duplicate(symbols)!r}")
+
+        bulk_precisions = None
+        if isinstance(precision_provider, IBulkExchangePairMetadataProvider):
+            bulk_precisions = precision_provider.get_precisions_bulk(symbols)
 
         for pair in pairs_list:
             # Обновляем биржевые прецизионы из внешнего провайдера,
             # если он передан. Это делает биржу источником правды,
             # а БД/дефолты – лишь стартовыми значениями.
             if precision_provider is not None:
-                precisions = precision_provider.get_precisions(pair.symbol)
+                if bulk_precisions is not None:
+                    precisions = bulk_precisions.get(pair.symbol)
+                else:
+                    precisions = precision_provider.get_precisions(pair.symbol)
                 if precisions is not None:
                     pair.min_step = precisions["min_step"]
                     pair.price_step = precisions["price_step"]
 
-            symbol = pair.symbol
-            if symbol in index:
-                raise ValueError(f"Duplicate currency pair symbol: {symbol!r}")
-            index[symbol] = pair
-
-        self._pairs: List[CurrencyPair] = pairs_list
-        self._by_symbol: Dict[str, CurrencyPair] = index
+        self._by_symbol: Dict[str, CurrencyPair] = dict(zip(symbols, pairs_list))
+        # Поиск по символу — прямой ``dict.get`` без промежуточного кадра
+        # Python‑метода (метод класса ниже остаётся для документации и
+        # совместимости с протоколом).
+        self.get_by_symbol = self._by_symbol.get  # type: ignore[method-assign]
+        # Представления отдаются наружу как неизменяемые кортежи и
+        # считаются один раз при создании, без копирования на каждый
+        # вызов. Флаг ``enabled`` читается только при пересборке, поэтому
+        # включать/выключать пары нужно через :meth:`set_enabled`.
+        self._all: Tuple[CurrencyPair, ...] = tuple(pairs_list)
+        self._active: Tuple[CurrencyPair, ...] = ()
+        self._rebuild_active()
 
     # --- Фабричный метод ---
 
@@ -73,17 +111,17 @@ class InMemoryCurrencyPairRepository(ICurrencyPairRepository):
         репозитории, чтобы не размазывать её по коду конвейера.
         """
 
+        pair_cls = CurrencyPair
         pairs: List[CurrencyPair] = []
         for symbol in symbols:
-            if "/" in symbol:
-                base, quote = symbol.split("/", 1)
-            else:
+            base, sep, quote = symbol.partition("/")
+            if not sep:
                 # Фолбэк на случай нестандартного символа, совместим с
                 # текущим поведением прототипа.
                 base, quote = symbol, "USDT"
 
             pairs.append(
-                CurrencyPair(
+                pair_cls(
                     symbol=symbol,
                     base_currency=base,
                     quote_currency=quote,
@@ -94,16 +132,32 @@ class InMemoryCurrencyPairRepository(ICurrencyPairRepository):
 
     # --- API репозитория ---
 
-    def list_all(self, include_disabled: bool = True) -> List[CurrencyPair]:  # type: ignore[override]
+    def list_all(self, include_disabled: bool = True) -> Sequence[CurrencyPair]:  # type: ignore[override]
         if include_disabled:
-            return list(self._pairs)
-        return [p for p in self._pairs if p.enabled]
+            return self._all
+        return self._active
 
-    def list_active(self) -> List[CurrencyPair]:  # type: ignore[override]
-        return [p for p in self._pairs if p.enabled]
+    def list_active(self) -> Sequence[CurrencyPair]:  # type: ignore[override]
+        return self._active
 
     def get_by_symbol(self, symbol: str) -> CurrencyPair | None:  # type: ignore[override]
         return self._by_symbol.get(symbol)
 
+    def set_enabled(self, symbol: str, enabled: bool) -> None:
+        """Включить/выключить пару и пересобрать кэш активных пар.
+
+        Неизвестный символ — ``KeyError``. Ранее выданные кортежи
+        :meth:`list_active` не меняются: вызывающий код получит новый
+        кортеж при следующем запросе.
+        """
+
+        pair = self._by_symbol[symbol]
+        if pair.enabled != enabled:
+            pair.enabled = enabled
+            self._rebuild_active()
+
+    def _rebuild_active(self) -> None:
+        self._active = tuple(p for p in self._all if p.enabled)
+
 
 __all__ = ["InMemoryCurrencyPairRepository"]
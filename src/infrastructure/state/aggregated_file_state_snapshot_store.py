@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+"""Агрегированное файловое хранилище снапшотов state.
+
+В отличие от :class:`FileStateSnapshotStore`, который пишет по одному
+JSON‑файлу на ключ, это хранилище дописывает все снапшоты в один
+append‑only лог ``state.log``. Формат записи::
+
+    <u32 длина ключа><u32 длина данных><ключ utf-8><JSON utf-8>
+
+В памяти держится индекс ``key -> (offset, length)`` на последнюю запись
+ключа; при старте индекс восстанавливается сканированием лога.
+Устаревшие записи периодически вычищаются компакцией.
+"""
+
+import os
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Tuple
+
+from src.domain.interfaces.state_snapshot_store import IStateSnapshotStore
+from src.infrastructure.logging.logging_setup import log_stage
+from src.infrastructure.state.snapshot_codec import decode_snapshot, encode_snapshot_into
+
+
+_HEADER = struct.Struct("<II")
+_HEADER_PLACEHOLDER = bytes(_HEADER.size)
+_LOG_FILENAME = "state.log"
+
+# Компакция запускается, когда лог вырос сверх порога и больше половины
+# его объёма занимают устаревшие записи.
+_DEFAULT_COMPACT_MIN_BYTES = 8 * 1024 * 1024
+
+
+def _encode_record_into(buffer: bytearray, key: str, snapshot: Dict[str, Any]) -> Tuple[int, int]:
+    """Дописать запись лога в конец ``buffer``.
+
+    Заголовок резервируется заранее и заполняется после сериализации,
+    поэтому JSON пишется прямо в буфер без промежуточных ``bytes``.
+    Возвращает смещение и длину JSON‑части внутри буфера.
+    """
+
+    record_start = len(buffer)
+    key_bytes = key.encode("utf-8")
+    data_start = record_start + _HEADER.size + len(key_bytes)
+    buffer[record_start:] = _HEADER_PLACEHOLDER + key_bytes
+    encode_snapshot_into(snapshot, buffer, data_start)
+    data_len = len(buffer) - data_start
+    _HEADER.pack_into(buffer, record_start, len(key_bytes), data_len)
+    return data_start, data_len
+
+
+class AggregatedFileStateSnapshotStore(IStateSnapshotStore):  # type: ignore[misc]
+    """Хранилище снапшотов в одном append‑only файле с индексом в памяти.
+
+    ``save_snapshot`` выполняет одну запись в конец лога без ``fsync``;
+    :meth:`batch_save` пишет весь батч одним вызовом и завершает его
+    ``fsync`` — это и есть граница долговечности.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | Path | None = None,
+        *,
+        compact_min_bytes: int = _DEFAULT_COMPACT_MIN_BYTES,
+    ) -> None:
+        if base_dir is None:
+            base_dir = Path("storage") / "state"
+        self._base_dir = Path(base_dir)
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._path = self._base_dir / _LOG_FILENAME
+        self._compact_min_bytes = compact_min_bytes
+
+        self._index: Dict[str, Tuple[int, int]] = {}
+        # Один буфер сериализации на хранилище: записи батча кодируются
+        # прямо в него (без конкатенаций и ``b"".join``) и уходят в лог
+        # одним ``write``. Пишет в хранилище один поток (писатель
+        # StateSnapshotService), так что пул из одного буфера достаточен.
+        self._buffer = bytearray()
+        self._size = 0
+        self._live_bytes = 0
+        self._file: BinaryIO = self._open_and_rebuild_index()
+
+    # ------------------------------------------------------------------
+    # Служебные методы
+    # ------------------------------------------------------------------
+
+    def _open_and_rebuild_index(self) -> BinaryIO:
+        """Открыть лог и восстановить индекс по его содержимому.
+
+        Неполная запись в хвосте (например, после аварийного завершения)
+        отбрасывается усечением файла до последней целой записи.
+        """
+
+        file: BinaryIO = open(self._path, "a+b", buffering=0)  # noqa: SIM115
+        file.seek(0)
+        raw = file.read()
+
+        index: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        header_size = _HEADER.size
+        while offset + header_size <= len(raw):
+            key_len, data_len = _HEADER.unpack_from(raw, offset)
+            end = offset + header_size + key_len + data_len
+            if end > len(raw):
+                break
+            key = raw[offset + header_size : offset + header_size + key_len].decode("utf-8")
+            index[key] = (offset + header_size + key_len, data_len)
+            offset = end
+
+        if offset < len(raw):
+            file.truncate(offset)
+            log_stage(
+                "WARN",
+                "Обрезан неполный хвост лога снапшотов",
+                path=str(self._path),
+                dropped_bytes=len(raw) - offset,
+            )
+
+        self._index = index
+        self._size = offset
+        self._live_bytes = sum(
+            _HEADER.size + len(key.encode("utf-8")) + length for key, (_, length) in index.items()
+        )
+        return file
+
+    def _append(self, payload: bytes | bytearray, entries: Dict[str, Tuple[int, int, int]]) -> None:
+        """Дописать ``payload`` в лог и обновить индекс.
+
+        ``entries``: ``key -> (смещение данных в payload, длина данных,
+        полная длина записи)``.
+        """
+
+        self._write_all(payload)
+        base = self._size
+        for key, (data_offset, data_len, record_len) in entries.items():
+            previous = self._index.get(key)
+            if previous is not None:
+                self._live_bytes -= _HEADER.size + len(key.encode("utf-8")) + previous[1]
+            self._index[key] = (base + data_offset, data_len)
+            self._live_bytes += record_len
+        self._size += len(payload)
+
+    def _write_all(self, payload: bytes | bytearray) -> None:
+        """Записать ``payload`` целиком, дописывая после коротких ``write``.
+
+        Небуферизованный файл может принять только часть байт. Если запись
+        оборвалась ошибкой, хвост лога усекается до последней целой записи,
+        чтобы смещения в индексе и ``self._size`` остались верными.
+        """
+
+        file = self._file
+        with memoryview(payload) as view:
+            written = 0
+            try:
+                while written < len(view):
+                    written += file.write(view[written:])
+            except OSError:
+                file.truncate(self._size)
+                raise
+
+    def _maybe_compact(self) -> None:
+        if self._size >= self._compact_min_bytes and self._live_bytes * 2 < self._size:
+            self.compact()
+
+    # ------------------------------------------------------------------
+    # IStateSnapshotStore
+    # ------------------------------------------------------------------
+
+    def save_snapshot(self, key: str, snapshot: Dict[str, Any]) -> None:  # type: ignore[override]
+        self.batch_save({key: snapshot}, fsync=False)
+
+    def load_snapshot(self, key: str) -> Dict[str, Any] | None:  # type: ignore[override]
+        location = self._index.get(key)
+        if location is None:
+            return None
+
+        offset, length = location
+        try:
+            self._file.seek(offset)
+            snapshot = decode_snapshot(self._file.read(length))
+            if not isinstance(snapshot, dict):
+                raise ValueError("Snapshot root must be a JSON object")
+            log_stage(
+                "LOAD",
+                "Снапшот state загружен из лога",
+                key=key,
+                path=str(self._path),
+            )
+            return snapshot
+        except (OSError, ValueError) as exc:  # pragma: no cover - защитный путь
+            log_stage(
+                "ERROR",
+                "Не удалось загрузить снапшот state",
+                key=key,
+                path=str(self._path),
+                error=str(exc),
+            )
+            return None
+
+    # ------------------------------------------------------------------
+    # Расширенный API
+    # ------------------------------------------------------------------
+
+    def batch_save(self, snapshots: Dict[str, Dict[str, Any]], *, fsync: bool = True) -> None:
+        """Дописать несколько снапшотов одним ``write`` и (опционально) ``fsync``."""
+
+        if not snapshots:
+            return
+
+        buffer = self._buffer
+        del buffer[:]
+        entries: Dict[str, Tuple[int, int, int]] = {}
+        for key, snapshot in snapshots.items():
+            record_start = len(buffer)
+            data_start, data_len = _encode_record_into(buffer, key, snapshot)
+            entries[key] = (data_start, data_len, len(buffer) - record_start)
+
+        try:
+            self._append(buffer, entries)
+            if fsync:
+                os.fsync(self._file.fileno())
+            log_stage(
+                "STATE",
+                "Снапшоты state дописаны в лог",
+                count=len(entries),
+                path=str(self._path),
+            )
+        except OSError as exc:  # pragma: no cover - защитный путь
+            log_stage(
+                "ERROR",
+                "Не удалось дописать снапшоты state в лог",
+                count=len(entries),
+                path=str(self._path),
+                error=str(exc),
+            )
+            return
+
+        self._maybe_compact()
+
+    def compact(self) -> None:
+        """Переписать лог, оставив только последние записи каждого ключа."""
+
+        live: Dict[str, bytes] = {}
+        for key, (offset, length) in self._index.items():
+            self._file.seek(offset)
+            live[key] = self._file.read(length)
+
+        tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        with open(tmp_path, "wb") as tmp:
+            for key, data in live.items():
+                key_bytes = key.encode("utf-8")
+                tmp.write(_HEADER.pack(len(key_bytes), len(data)) + key_bytes + data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+
+        before = self._size
+        self._file.close()
+        os.replace(tmp_path, self._path)
+        self._file = self._open_and_rebuild_index()
+        log_stage(
+            "STATE",
+            "Лог снапшотов state компактирован",
+            path=str(self._path),
+            size_before=before,
+            size_after=self._size,
+        )
+
+    def close(self) -> None:
+        """Закрыть файл лога."""
+
+        self._file.close()
+
+
+__all__ = ["AggregatedFileStateSnapshotStore"]
@@ -3,34 +3,66 @@ from __future__ import annotations
 """Файловая реализация хранилища снапшотов state.
 
 Снапшоты сохраняются в JSON‑файлы в директории ``local_run/state`` по
-умолчанию. Имя файла формируется из ключа (``key``) путём простой
+умолчанию (``<key>.json``, а со сжатием — ``<key>.json.zst``). Имя файла формируется из ключа (``key``) путём простой
 "очистки" символов, чтобы позже можно было заменить backend на Redis,
 не меняя контракт :class:`IStateSnapshotStore`.
 """
 
-import json
+import mmap
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from src.domain.interfaces.state_snapshot_store import IStateSnapshotStore
 from src.infrastructure.logging.logging_setup import log_stage
+from src.infrastructure.state.snapshot_codec import (
+    ZSTD_AVAILABLE,
+    ZstdSnapshotCodec,
+    decode_snapshot,
+    encode_snapshot,
+)
 
+# Таблица замены символов ключа за один проход ``str.translate``.
+_FILENAME_TRANS = str.maketrans({"\\": "__", "/": "__", ":": "_", " ": "_"})
 
+_ZSTD_SUFFIX = ".zst"
+
+
+@lru_cache(maxsize=1024)
 def _key_to_filename(key: str) -> str:
     """Преобразовать строковый ключ в безопасное имя файла.
 
     На данном этапе достаточно заменить ``/``, ``\\`` и ``:`` на
     безопасные символы и удалить пробелы. Формат имени стабилен и
-    детерминирован.
+    детерминирован, поэтому результат кэшируется: набор ключей
+    (по одному на пару/окружение) мал и не меняется.
     """
 
-    cleaned = (
-        key.replace("\\", "__")
-        .replace("/", "__")
-        .replace(":", "_")
-        .replace(" ", "_")
-    )
-    return f"{cleaned}.json"
+    return f"{key.translate(_FILENAME_TRANS)}.json"
+
+
+def _write_all(fd: int, data: bytes, offset: int = 0) -> None:
+    """Дописать ``data`` в ``fd`` начиная с ``offset`` (обработка short write)."""
+
+    view = memoryview(data)
+    while offset < len(view):
+        offset += os.pwrite(fd, view[offset:], offset)
+
+
+def _open_tmp(path: str) -> int:
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+
+def _write_files_sync(items: List[Tuple[str, bytes]]) -> None:
+    """Записать ``(path, data)`` последовательными системными вызовами."""
+
+    for path, data in items:
+        fd = _open_tmp(path)
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
 
 
 class FileStateSnapshotStore(IStateSnapshotStore):  # type: ignore[misc]
@@ -38,53 +70,149 @@ class FileStateSnapshotStore(IStateSnapshotStore):  # type: ignore[misc]
 
     Используется ранним прототипом; в будущем его можно заменить на
     Redis‑реализацию с тем же интерфейсом.
+
+    При ``compress=True`` снапшоты пишутся сжатыми zstd в
+    ``<key>.json.zst``. Если ``zstandard`` не установлен, хранилище
+    предупреждает и продолжает писать обычный JSON.
     """
 
-    def __init__(self, base_dir: str | Path | None = None) -> None:
+    def __init__(self, base_dir: str | Path | None = None, *, compress: bool = False) -> None:
         if base_dir is None:
             base_dir = Path("storage") / "state"
         self._base_dir = Path(base_dir)
         self._base_dir.mkdir(parents=True, exist_ok=True)
 
-    def _path_for_key(self, key: str) -> Path:
-        return self._base_dir / _key_to_filename(key)
+        if compress and not ZSTD_AVAILABLE:
+            log_stage(
+                "WARN",
+                "zstandard не установлен, снапшоты state пишутся без сжатия",
+                path=str(self._base_dir),
+            )
+            compress = False
+        self._zstd: ZstdSnapshotCodec | None = ZstdSnapshotCodec() if compress else None
+        self._encode = self._zstd.encode if self._zstd is not None else encode_snapshot
+        # ``base_dir`` не меняется после создания, поэтому пути по ключам
+        # (целевой файл и его ``.tmp``) можно вычислить один раз и хранить
+        # строками, без построения ``Path`` на каждом сохранении.
+        self._paths: Dict[str, Tuple[str, str]] = {}
+
+    def _path_for_key(self, key: str) -> Tuple[str, str]:
+        paths = self._paths.get(key)
+        if paths is None:
+            path = os.path.join(self._base_dir, _key_to_filename(key))
+            if self._zstd is not None:
+                path += _ZSTD_SUFFIX
+            paths = self._paths[key] = (path, path + ".tmp")
+        return paths
 
     def save_snapshot(self, key: str, snapshot: Dict[str, Any]) -> None:  # type: ignore[override]
-        path = self._path_for_key(key)
+        path, tmp_path = self._path_for_key(key)
         try:
-            tmp_path = path.with_suffix(path.suffix + ".tmp")
-            tmp_path.write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
-            tmp_path.replace(path)
+            _write_files_sync([(tmp_path, self._encode(snapshot))])
+            os.replace(tmp_path, path)
             log_stage(
                 "STATE",
                 "Снапшот state сохранён в файл",
                 key=key,
-                path=str(path),
+                path=path,
             )
         except OSError as exc:  # pragma: no cover - защитный путь
             log_stage(
                 "ERROR",
                 "Не удалось сохранить снапшот state",
                 key=key,
-                path=str(path),
+                path=path,
                 error=str(exc),
             )
 
+    def batch_save(self, snapshots: Dict[str, Dict[str, Any]]) -> None:
+        """Сохранить несколько снапшотов за один проход.
+
+        Сначала пишутся все ``.tmp``‑файлы, затем они атомарно
+        переименовываются в целевые файлы.
+        """
+
+        if not snapshots:
+            return
+
+        encode = self._encode
+        items: List[Tuple[str, bytes]] = []
+        targets: List[str] = []
+        for key, snapshot in snapshots.items():
+            path, tmp_path = self._path_for_key(key)
+            items.append((tmp_path, encode(snapshot)))
+            targets.append(path)
+
+        try:
+            _write_files_sync(items)
+            for (tmp_path, _), path in zip(items, targets):
+                os.replace(tmp_path, path)
+            log_stage(
+                "STATE",
+                "Батч снапшотов state сохранён в файлы",
+                count=len(items),
+            )
+        except OSError as exc:  # pragma: no cover - защитный путь
+            log_stage(
+                "ERROR",
+                "Не удалось сохранить батч снапшотов state",
+                count=len(items),
+                error=str(exc),
+            )
+
+    def _read_snapshot(self, path: str, *, compressed: bool) -> Any:
+        """Прочитать и разобрать файл снапшота через ``mmap``.
+
+        Декодер (msgspec/zstd) читает страницы файла напрямую, без
+        промежуточной копии всего файла в ``bytes`` — это заметно на
+        снапшотах с длинными историями при рестарте воркера. Отображение
+        закрывается сразу после разбора: декодер копирует строки и числа
+        в собственные объекты.
+
+        Кодек выбирается по суффиксу файла (``compressed``), а не по
+        режиму записи хранилища.
+        """
+
+        zstd = self._zstd
+        if compressed and zstd is None:
+            if not ZSTD_AVAILABLE:
+                raise ValueError("zstandard is not installed, cannot read compressed snapshot")
+            zstd = ZstdSnapshotCodec()
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("Snapshot file is empty")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if compressed:
+                    return zstd.decode(mm)  # type: ignore[union-attr]
+                return decode_snapshot(mm)
+
     def load_snapshot(self, key: str) -> Dict[str, Any] | None:  # type: ignore[override]
-        path = self._path_for_key(key)
-        if not path.is_file():
-            return None
+        path, _ = self._path_for_key(key)
+        compressed = path.endswith(_ZSTD_SUFFIX)
+        if not os.path.isfile(path):
+            # Режим сжатия могли переключить на уже работающем окружении:
+            # читаем снапшот, записанный в другом формате, чтобы не
+            # потерять state. Следующее сохранение пишет уже новый формат.
+            other = path[: -len(_ZSTD_SUFFIX)] if compressed else path + _ZSTD_SUFFIX
+            if not os.path.isfile(other):
+                return None
+            log_stage(
+                "WARN",
+                "Снапшот state найден в другом формате сжатия",
+                key=key,
+                path=other,
+            )
+            path, compressed = other, not compressed
 
         try:
-            text = path.read_text(encoding="utf-8")
-            snapshot = json.loads(text)
+            snapshot = self._read_snapshot(path, compressed=compressed)
             if not isinstance(snapshot, dict):
                 raise ValueError("Snapshot root must be a JSON object")
             log_stage(
                 "LOAD",
                 "Снапшот state загружен из файла",
                 key=key,
-                path=str(path),
+                path=path,
             )
             return snapshot
         except (OSError, ValueError) as exc:  # pragma: no cover - защитный путь
@@ -92,7 +220,7 @@ class FileStateSnapshotStore(IStateSnapshotStore):  # type: ignore[misc]
                 "ERROR",
                 "Не удалось загрузить снапшот state",
                 key=key,
-                path=str(path),
+                path=path,
                 error=str(exc),
             )
             return None
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+"""Кодек JSON для снапшотов state.
+
+Оба файловых хранилища пишут снапшоты в JSON. Если установлен
+``msgspec``, кодирование и разбор идут через его C‑реализацию
+(``msgspec.json``) — она в разы быстрее стандартного ``json`` на
+больших историях intents/decisions. Формат на диске от этого не
+меняется: UTF‑8 JSON без экранирования не‑ASCII, поэтому старые файлы
+читаются новым кодеком и наоборот.
+
+Опционально JSON сжимается ``zstandard`` (уровень 3): повторяющиеся
+ключи intents/decisions сжимаются в разы, а на запись и ``fsync``
+уходит меньше байт.
+"""
+
+import json
+from typing import Any, Dict, Union
+
+# Вход декодера: ``bytes`` или любой буфер (``memoryview``, ``mmap``).
+Buffer = Union[bytes, bytearray, memoryview, Any]
+
+try:  # pragma: no cover - msgspec есть не во всех окружениях
+    import msgspec  # type: ignore[import]
+except Exception:  # pragma: no cover - без msgspec работаем на стандартном json
+    msgspec = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - zstandard есть не во всех окружениях
+    import zstandard  # type: ignore[import]
+except Exception:  # pragma: no cover - без zstandard сжатие недоступно
+    zstandard = None  # type: ignore[assignment]
+
+
+ZSTD_AVAILABLE = zstandard is not None
+ZSTD_LEVEL = 3
+
+
+if msgspec is not None:  # pragma: no cover - нужен msgspec
+    _ENCODER = msgspec.json.Encoder()
+    _DECODER = msgspec.json.Decoder()
+
+    def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+        """Сериализовать снапшот в UTF‑8 JSON."""
+
+        return _ENCODER.encode(snapshot)
+
+    def encode_snapshot_into(snapshot: Dict[str, Any], buffer: bytearray, offset: int) -> None:
+        """Сериализовать снапшот прямо в ``buffer`` начиная с ``offset``.
+
+        Буфер обрезается по концу сообщения, но его память msgspec не
+        освобождает — повторное использование одного ``bytearray`` не
+        аллоцирует заново.
+        """
+
+        _ENCODER.encode_into(snapshot, buffer, offset)
+
+    def decode_snapshot(data: Buffer) -> Any:
+        """Разобрать UTF‑8 JSON; ошибки формата — ``ValueError``.
+
+        msgspec читает любой буфер напрямую, без копии в ``bytes``.
+        """
+
+        try:
+            return _DECODER.decode(data)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+else:
+
+    def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+        """Сериализовать снапшот в UTF‑8 JSON."""
+
+        return json.dumps(snapshot, ensure_ascii=False).encode("utf-8")
+
+    def encode_snapshot_into(snapshot: Dict[str, Any], buffer: bytearray, offset: int) -> None:
+        """Сериализовать снапшот в ``buffer`` начиная с ``offset``."""
+
+        buffer[offset:] = encode_snapshot(snapshot)
+
+    def decode_snapshot(data: Buffer) -> Any:
+        """Разобрать UTF‑8 JSON; ошибки формата — ``ValueError``."""
+
+        # ``json.loads`` принимает только str/bytes/bytearray.
+        if not isinstance(data, (bytes, bytearray)):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class ZstdSnapshotCodec:
+    """Сжатие/распаковка закодированных снапшотов через zstd.
+
+    Компрессор и декомпрессор создаются один раз на экземпляр и не
+    потокобезопасны: экземпляр принадлежит одному хранилищу, в которое
+    пишет один поток.
+    """
+
+    __slots__ = ("_compressor", "_decompressor")
+
+    def __init__(self, level: int = ZSTD_LEVEL) -> None:
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, snapshot: Dict[str, Any]) -> bytes:
+        """Сериализовать снапшот в JSON и сжать его."""
+
+        return self._compressor.compress(encode_snapshot(snapshot))
+
+    def decode(self, data: Buffer) -> Any:
+        """Распаковать и разобрать снапшот; ошибки формата — ``ValueError``."""
+
+        try:
+            raw = self._decompressor.decompress(data)
+        except zstandard.ZstdError as exc:
+            raise ValueError(str(exc)) from exc
+        return decode_snapshot(raw)
+
+
+__all__ = [
+    "ZSTD_AVAILABLE",
+    "ZSTD_LEVEL",
+    "ZstdSnapshotCodec",
+    "decode_snapshot",
+    "encode_snapshot",
+    "encode_snapshot_into",
+]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+"""Общие фейки и фикстуры для тестов торгового цикла.
+
+Фейковые конвейер и сервис снапшотов копят вызовы, поэтому создаются
+заново для каждого теста; неизменяемый набор тиков строится один раз
+на сессию.
+"""
+
+from typing import Any
+
+import pytest
+
+from src.config.config import AppConfig
+
+
+class FakePipeline:
+    """Заглушка TickPipelineService, записывающая параметры вызовов."""
+
+    __slots__ = ("calls",)
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+
+    def process_tick(
+        self,
+        context: dict[str, Any],
+        *,
+        symbol: str,
+        ticker_id: int,
+        price: float,
+        ts: int,
+    ) -> None:  # type: ignore[override]
+        self.calls.append(
+            {
+                "context": context,
+                "symbol": symbol,
+                "ticker_id": ticker_id,
+                "price": price,
+                "ts": ts,
+            }
+        )
+
+
+class FakeSnapshotService:
+    """Заглушка StateSnapshotService без файловой системы.
+
+    ``load()`` всегда возвращает 0, ``maybe_save()`` записывает только
+    ``ticker_id``, ``close()`` отмечает остановку.
+    """
+
+    __slots__ = ("loaded", "saved_ids", "closed")
+
+    def __init__(self) -> None:
+        self.loaded: list[dict[str, Any]] = []
+        self.saved_ids: list[int] = []
+        self.closed = False
+
+    def load(self, context: dict[str, Any]) -> int:  # type: ignore[override]
+        self.loaded.append({"context": context})
+        return 0
+
+    def maybe_save(self, context: dict[str, Any], *, ticker_id: int) -> None:  # type: ignore[override]
+        self.saved_ids.append(ticker_id)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(scope="session")
+def base_cfg() -> AppConfig:
+    """Неизменяемый конфиг по умолчанию; переопределения — через replace()."""
+
+    return AppConfig()
+
+
+@pytest.fixture(scope="session")
+def fake_tick_batch() -> tuple[dict[str, Any], ...]:
+    """Канонические два тика BTC/USDT (только для чтения)."""
+
+    return (
+        {
+            "symbol": "BTC/USDT",
+            "timestamp": 1,
+            "datetime": "2020-01-01T00:00:00Z",
+            "last": 100.0,
+        },
+        {
+            "symbol": "BTC/USDT",
+            "timestamp": 2,
+            "datetime": "2020-01-01T00:00:01Z",
+            "last": 101.0,
+        },
+    )
+
+
+@pytest.fixture
+def fake_pipeline() -> FakePipeline:
+    return FakePipeline()
+
+
+@pytest.fixture
+def fake_snapshot() -> FakeSnapshotService:
+    return FakeSnapshotService()
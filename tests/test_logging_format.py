@@ -15,9 +15,16 @@ from __future__ import annotations
 """
 
 import logging
+import time
 from pathlib import Path
 
-from src.infrastructure.logging.logging_setup import setup_logging, log_stage
+from src.infrastructure.logging.logging_setup import (
+    LINE_FORMAT,
+    StageFallbackFormatter,
+    _logger_for,
+    log_stage,
+    setup_logging,
+)
 
 
 def test_log_stage_format_includes_milliseconds(tmp_path: Path) -> None:
@@ -66,3 +73,44 @@ def test_log_stage_format_includes_milliseconds(tmp_path: Path) -> None:
     hhmmss, msec = time_part.split(",")
     assert hhmmss.count(":") == 2
     assert len(msec) == 3
+
+
+def test_stage_formatter_time_has_comma_milliseconds() -> None:
+    """Стандартный ``formatTime`` даёт ``YYYY-MM-DD HH:MM:SS,mmm``."""
+
+    created = 1_700_000_000.0
+    record = logging.makeLogRecord({"created": created, "msecs": 42.0})
+
+    formatted = StageFallbackFormatter(LINE_FORMAT).formatTime(record)
+
+    expected = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created)) + ",042"
+    assert formatted == expected
+
+
+def test_setup_logging_is_idempotent(tmp_path: Path) -> None:
+    """Повторный вызов с теми же параметрами не дублирует хендлеры."""
+
+    log_file = str(tmp_path / "idempotent.log")
+
+    setup_logging(log_file)
+    first = list(logging.getLogger().handlers)
+    setup_logging(log_file)
+    second = list(logging.getLogger().handlers)
+
+    assert len(first) == 2
+    assert second == first
+
+    setup_logging(str(tmp_path / "other.log"))
+    third = logging.getLogger().handlers
+    assert len(third) == 2
+    assert third[0] is first[0]
+    assert third[1] is not first[1]
+
+
+def test_logger_lookup_is_memoized_per_name() -> None:
+    """Логгеры по имени берутся из кэша и совпадают с logging.getLogger."""
+
+    assert _logger_for("autotrade.test") is logging.getLogger("autotrade.test")
+    assert _logger_for("autotrade.test") is _logger_for("autotrade.test")
+    assert _logger_for(None) is logging.getLogger()
+    assert _logger_for("") is logging.getLogger()
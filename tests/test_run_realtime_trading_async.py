@@ -1,14 +1,26 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, AsyncIterator
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
 
 import pytest
 
 from src.application.use_cases import run_realtime_trading
+from src.config.config import AppConfig
+from src.infrastructure.state.aggregated_file_state_snapshot_store import AggregatedFileStateSnapshotStore
+from src.infrastructure.state.file_state_snapshot_store import FileStateSnapshotStore
+
+if TYPE_CHECKING:
+    from tests.conftest import FakePipeline, FakeSnapshotService
 
 
 class _FakeTickSource:
+    __slots__ = ("_ticks",)
+
     def __init__(self, ticks: list[dict[str, Any]]) -> None:
         self._ticks = ticks
 
@@ -17,65 +29,46 @@ class _FakeTickSource:
             yield t
 
 
-class _FakePipeline:
-    def __init__(self) -> None:
-        self.calls: list[dict[str, Any]] = []
-
-    def process_tick(
-        self,
-        context: dict[str, Any],
-        *,
-        symbol: str,
-        ticker_id: int,
-        price: float,
-        ts: int,
-    ) -> None:  # type: ignore[override]
-        self.calls.append(
-            {
-                "context": context,
-                "symbol": symbol,
-                "ticker_id": ticker_id,
-                "price": price,
-                "ts": ts,
-            }
-        )
+class _TupleTickSource:
+    """Источник тиков в виде кортежей ``(symbol, timestamp, last)``."""
 
+    __slots__ = ("_ticks",)
 
-class _FakeSnapshotService:
-    def __init__(self) -> None:
-        self.saved_ids: list[int] = []
+    def __init__(self, ticks: list[tuple[str, int, float]]) -> None:
+        self._ticks = ticks
 
-    def maybe_save(self, context: dict[str, Any], *, ticker_id: int) -> None:  # type: ignore[override]
-        self.saved_ids.append(ticker_id)
+    async def stream(self) -> AsyncIterator[tuple[str, int, float]]:
+        for t in self._ticks:
+            yield t
+
+
+def _as_tuples(ticks: tuple[dict[str, Any], ...]) -> list[tuple[str, int, float]]:
+    return [(t["symbol"], t["timestamp"], t["last"]) for t in ticks]
 
 
 @pytest.mark.asyncio
-async def test_run_realtime_core_processes_all_ticks_and_saves_snapshots() -> None:
+@pytest.mark.parametrize(
+    "make_source",
+    [
+        lambda ticks: _FakeTickSource(list(ticks)),
+        lambda ticks: _TupleTickSource(_as_tuples(ticks)),
+    ],
+    ids=["dict", "tuple"],
+)
+async def test_run_realtime_core_processes_all_ticks_and_saves_snapshots(
+    make_source: Callable[[tuple[dict[str, Any], ...]], Any],
+    fake_tick_batch: tuple[dict[str, Any], ...],
+    fake_pipeline: FakePipeline,
+    fake_snapshot: FakeSnapshotService,
+) -> None:
     """Проверяет core-логику async-конвейера без реальной сети/CCXT.
 
     Тестирует функцию ``_run_realtime_core`` напрямую, используя
-    фейковые ticker_source/pipeline/snapshot_svc.
+    фейковые ticker_source/pipeline/snapshot_svc. Dict‑тикеры и кортежи
+    от TupleTickSource должны обрабатываться одинаково.
     """
 
-    # --- подготовка фейковых тиков ---
-    ticks = [
-        {
-            "symbol": "BTC/USDT",
-            "timestamp": 1,
-            "datetime": "2020-01-01T00:00:00Z",
-            "last": 100.0,
-        },
-        {
-            "symbol": "BTC/USDT",
-            "timestamp": 2,
-            "datetime": "2020-01-01T00:00:01Z",
-            "last": 101.0,
-        },
-    ]
-
-    fake_source = _FakeTickSource(ticks)
-    fake_pipeline = _FakePipeline()
-    fake_snapshot = _FakeSnapshotService()
+    fake_source = make_source(fake_tick_batch)
 
     context: dict[str, Any] = {}
 
@@ -94,5 +87,114 @@ async def test_run_realtime_core_processes_all_ticks_and_saves_snapshots() -> No
 
     # --- проверки ---
     # Для двух тиков должны быть ticker_id == 11 и 12.
-    assert [c["ticker_id"] for c in fake_pipeline.calls] == [11, 12]
+    assert [(c["ticker_id"], c["price"], c["ts"]) for c in fake_pipeline.calls] == [
+        (11, 100.0, 1),
+        (12, 101.0, 2),
+    ]
     assert fake_snapshot.saved_ids == [11, 12]
+
+
+class _FakeConnector:
+    """Коннектор без сети: отдаёт заранее заданные тики и запоминает close()."""
+
+    __slots__ = ("_ticks", "closed")
+
+    def __init__(self, ticks: tuple[dict[str, Any], ...]) -> None:
+        self._ticks = ticks
+        self.closed = False
+
+    async def stream_ticks(self, symbol: str) -> AsyncIterator[dict[str, Any]]:
+        for t in self._ticks:
+            yield {
+                **t,
+                "open": t["last"],
+                "high": t["last"],
+                "low": t["last"],
+                "close": t["last"],
+                "bid": t["last"],
+                "ask": t["last"],
+                "baseVolume": 1.0,
+                "quoteVolume": t["last"],
+            }
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def _fake_worker(*_: Any, stop_event: asyncio.Event, **__: Any) -> None:
+    # Ждём события остановки без периодических пробуждений event loop.
+    await stop_event.wait()
+
+
+@pytest.mark.asyncio
+async def test_run_realtime_from_exchange_pipeline_and_snapshots(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_tick_batch: tuple[dict[str, Any], ...],
+    fake_pipeline: FakePipeline,
+    fake_snapshot: FakeSnapshotService,
+) -> None:
+    """Боевой сценарий прогоняет тики коннектора через конвейер и снапшоты."""
+
+    from src.infrastructure.connectors import ccxt_pro_exchange_connector
+
+    connector = _FakeConnector(fake_tick_batch)
+    monkeypatch.setattr(
+        ccxt_pro_exchange_connector, "CcxtProExchangeConnector", lambda cfg: connector
+    )
+    monkeypatch.setattr(run_realtime_trading, "_run_order_book_refresh_worker", _fake_worker)
+    monkeypatch.setattr(run_realtime_trading, "FileStateSnapshotStore", lambda **_: None)
+    monkeypatch.setattr(
+        run_realtime_trading, "StateSnapshotService", lambda store, cfg: fake_snapshot
+    )
+    monkeypatch.setattr(run_realtime_trading, "TickPipelineService", lambda cfg: fake_pipeline)
+
+    await run_realtime_trading.run_realtime_from_exchange(symbol="BTC/USDT")
+
+    assert [(c["ticker_id"], c["symbol"], c["price"]) for c in fake_pipeline.calls] == [
+        (1, "BTC/USDT", 100.0),
+        (2, "BTC/USDT", 101.0),
+    ]
+    assert fake_snapshot.saved_ids == [1, 2]
+    assert len(fake_snapshot.loaded) == 1
+    assert fake_snapshot.closed
+    assert connector.closed
+
+
+def test_build_snapshot_store_selects_backend(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cfg = AppConfig()
+
+    assert isinstance(run_realtime_trading._build_snapshot_store(cfg), FileStateSnapshotStore)
+
+    store = run_realtime_trading._build_snapshot_store(replace(cfg, state_snapshot_backend="aggregated"))
+    try:
+        assert isinstance(store, AggregatedFileStateSnapshotStore)
+    finally:
+        run_realtime_trading._close_snapshot_store(store)
+    # У файлового хранилища нет ``close`` — закрытие ничего не делает
+    run_realtime_trading._close_snapshot_store(FileStateSnapshotStore(base_dir=tmp_path))
+
+
+def test_tick_loop_stats_aggregates_interval_and_resets() -> None:
+    stats = run_realtime_trading.TickLoopStats()
+    for elapsed in (2.0, 1.0, 3.0):
+        stats.add(elapsed)
+
+    assert (stats.count, stats.min_ms, stats.max_ms) == (3, 1.0, 3.0)
+    assert stats.avg_ms == pytest.approx(2.0)
+    assert not hasattr(stats, "__dict__")
+
+    stats.reset_interval()
+    assert stats.count == 0 and stats.avg_ms == 0.0
+
+
+def test_realtime_module_does_not_import_ccxt_connector_eagerly() -> None:
+    """Коннектор ccxt.pro подгружается только внутри run_realtime_from_exchange."""
+
+    code = (
+        "import sys\n"
+        "import src.application.use_cases.run_realtime_trading as m\n"
+        "assert not hasattr(m, 'CcxtProExchangeConnector')\n"
+        "assert 'src.infrastructure.connectors.ccxt_pro_exchange_connector' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[1])
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List
 
 import pytest
 
 from src.application.use_cases import run_realtime_trading
+from src.config.config import AppConfig
+
+if TYPE_CHECKING:
+    from tests.conftest import FakePipeline, FakeSnapshotService
 
 
 class _FakeTick:
+    __slots__ = ("data",)
+
     def __init__(self, symbol: str, price: float, ts: int) -> None:
         self.data = {"symbol": symbol, "price": price, "ts": ts}
 
@@ -19,49 +26,6 @@ def _make_ticks(symbol: str, prices: Iterable[float]) -> List[Dict[str, Any]]:
     ]
 
 
-class _FakePipeline:
-    def __init__(self) -> None:
-        self.calls: list[dict[str, Any]] = []
-
-    def process_tick(
-        self,
-        context: dict[str, Any],
-        *,
-        symbol: str,
-        ticker_id: int,
-        price: float,
-        ts: int,
-    ) -> None:  # type: ignore[override]
-        self.calls.append(
-            {
-                "context": context,
-                "symbol": symbol,
-                "ticker_id": ticker_id,
-                "price": price,
-                "ts": ts,
-            }
-        )
-
-
-class _DummySnapshotService:
-    """Заглушка StateSnapshotService без файловой системы.
-
-    Используется только для run_demo_offline: load() всегда возвращает 0,
-    maybe_save() записывает только ticker_id в список, не трогая диски.
-    """
-
-    def __init__(self) -> None:
-        self.loaded: list[dict[str, Any]] = []
-        self.saved_ids: list[int] = []
-
-    def load(self, context: dict[str, Any]) -> int:  # type: ignore[override]
-        self.loaded.append({"context": context})
-        return 0
-
-    def maybe_save(self, context: dict[str, Any], *, ticker_id: int) -> None:  # type: ignore[override]
-        self.saved_ids.append(ticker_id)
-
-
 def _fake_generate_ticks(symbol: str, max_ticks: int, sleep_sec: float):  # type: ignore[override]
     # sleep_sec игнорируется – в тестах не должно быть задержек
     del sleep_sec
@@ -75,6 +39,9 @@ def _fake_generate_ticks(symbol: str, max_ticks: int, sleep_sec: float):  # type
 def test_run_demo_offline_uses_pipeline_for_each_generated_tick(
     monkeypatch: pytest.MonkeyPatch,
     max_ticks: int,
+    fake_pipeline: FakePipeline,
+    fake_snapshot: FakeSnapshotService,
+    base_cfg: AppConfig,
 ) -> None:
     """run_demo_offline прогоняет все фейковые тики через TickPipelineService.
 
@@ -98,32 +65,26 @@ def test_run_demo_offline_uses_pipeline_for_each_generated_tick(
         ),
     )
 
-    fake_pipeline = _FakePipeline()
     monkeypatch.setattr(
         run_realtime_trading,
         "TickPipelineService",
         lambda cfg: fake_pipeline,
     )
 
-    dummy_snapshot = _DummySnapshotService()
     monkeypatch.setattr(
         run_realtime_trading,
         "StateSnapshotService",
-        lambda store, cfg: dummy_snapshot,
+        lambda store, cfg: fake_snapshot,
     )
 
     # --- запуск сценария ---
     # max_ticks контролируется через AppConfig, поэтому подменим load_config,
     # чтобы вернуть конфиг с нужным параметром.
-    from src.config.config import AppConfig
-
     def fake_load_config(symbol: str | None = None) -> AppConfig:  # type: ignore[override]
-        cfg = AppConfig()
+        overrides = {"max_ticks": max_ticks, "ticker_sleep_sec": 0.0}
         if symbol is not None:
-            cfg.symbol = symbol
-        cfg.max_ticks = max_ticks
-        cfg.ticker_sleep_sec = 0.0
-        return cfg
+            overrides["symbol"] = symbol
+        return replace(base_cfg, **overrides)
 
     monkeypatch.setattr(run_realtime_trading, "load_config", fake_load_config)
 
@@ -140,4 +101,4 @@ def test_run_demo_offline_uses_pipeline_for_each_generated_tick(
 
     # maybe_save должен вызываться хотя бы для каждого тика – детали
     # интервала тестируются отдельно в unit-тестах StateSnapshotService.
-    assert dummy_snapshot.saved_ids == list(range(1, max_ticks + 1))
+    assert fake_snapshot.saved_ids == list(range(1, max_ticks + 1))
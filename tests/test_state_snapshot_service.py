@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from dataclasses import replace
+import threading
 from typing import Any, Dict, List, Tuple
 
 import pytest
@@ -27,11 +29,11 @@ class DummySnapshotStore:
         return self.loaded_snapshot
 
 
+_BASE_CFG = AppConfig()
+
+
 def _make_cfg(**overrides: Any) -> AppConfig:
-    cfg = AppConfig()
-    for k, v in overrides.items():
-        setattr(cfg, k, v)
-    return cfg
+    return replace(_BASE_CFG, **overrides)
 
 
 def test_load_returns_zero_and_keeps_context_when_snapshot_missing() -> None:
@@ -119,6 +121,7 @@ def test_maybe_save_does_nothing_when_interval_non_positive(monkeypatch: pytest.
 
     svc = StateSnapshotService(store, cfg)
     svc.maybe_save(context, ticker_id=10)
+    svc.close()
 
     assert store.saved == []
 
@@ -145,6 +148,7 @@ def test_maybe_save_calls_save_when_ticker_matches_interval(monkeypatch: pytest.
 
     # ticker_id кратен интервалу – должен сохраниться снапшот
     svc.maybe_save(context, ticker_id=10)
+    svc.flush()
 
     assert len(store.saved) == 1
     key, snapshot = store.saved[0]
@@ -153,5 +157,82 @@ def test_maybe_save_calls_save_when_ticker_matches_interval(monkeypatch: pytest.
 
     # ticker_id не кратен интервалу – не должно быть дополнительных сохранений
     svc.maybe_save(context, ticker_id=11)
+    svc.close()
     assert len(store.saved) == 1
 
+
+def test_maybe_save_writes_in_background_and_keeps_latest_snapshot() -> None:
+    """Снапшоты пишутся фоновым потоком; ожидающий заменяется более новым."""
+
+    cfg = _make_cfg(state_snapshot_interval_ticks=1)
+    release = threading.Event()
+
+    class SlowStore(DummySnapshotStore):
+        def save_snapshot(self, key: str, snapshot: Dict[str, Any]) -> None:  # type: ignore[override]
+            release.wait(timeout=5)
+            super().save_snapshot(key, snapshot)
+
+    store = SlowStore()
+    svc = StateSnapshotService(store, cfg)
+    context: Dict[str, Any] = {"metrics": {"ticks": 0}}
+
+    # Хранилище «висит», но тики не блокируются.
+    for ticker_id in range(1, 5):
+        context["metrics"]["ticks"] = ticker_id
+        svc.maybe_save(context, ticker_id=ticker_id)
+    assert store.saved == []
+
+    release.set()
+    svc.close()
+
+    saved_ids = [snapshot["ticker_id"] for _, snapshot in store.saved]
+    # Пока писался первый снапшот, 2 и 3 вытеснены более новым 4.
+    assert saved_ids[-1] == 4
+    assert len(saved_ids) <= 2
+    # Снапшот отвязан от контекста: метрики зафиксированы на момент тика.
+    assert [snapshot["metrics"]["ticks"] for _, snapshot in store.saved] == saved_ids
+
+
+def test_writer_survives_store_errors() -> None:
+    """Ошибка хранилища логируется, фоновый поток продолжает писать."""
+
+    cfg = _make_cfg(state_snapshot_interval_ticks=2)
+
+    class FlakyStore(DummySnapshotStore):
+        def save_snapshot(self, key: str, snapshot: Dict[str, Any]) -> None:  # type: ignore[override]
+            if snapshot["ticker_id"] == 2:
+                raise OSError("disk full")
+            super().save_snapshot(key, snapshot)
+
+    store = FlakyStore()
+    svc = StateSnapshotService(store, cfg)
+    context: Dict[str, Any] = {"metrics": {"ticks": 0}}
+
+    for ticker_id in (2, 3, 4):
+        svc.maybe_save(context, ticker_id=ticker_id)
+        svc.flush()
+    svc.close()
+
+    assert [snapshot["ticker_id"] for _, snapshot in store.saved] == [4]
+
+
+def test_writer_uses_batch_save_when_store_provides_it() -> None:
+    cfg = _make_cfg(environment="local", symbol="BTC/USDT", state_snapshot_interval_ticks=1)
+
+    class BatchStore(DummySnapshotStore):
+        def __init__(self) -> None:
+            super().__init__()
+            self.batches: List[Dict[str, Dict[str, Any]]] = []
+
+        def batch_save(self, snapshots: Dict[str, Dict[str, Any]]) -> None:
+            self.batches.append(snapshots)
+
+    store = BatchStore()
+    svc = StateSnapshotService(store, cfg)
+
+    svc.maybe_save({"metrics": {"ticks": 0}}, ticker_id=1)
+    svc.close()
+
+    assert store.saved == []
+    assert [list(batch) for batch in store.batches] == [["local:BTC/USDT"]]
+    assert store.batches[0]["local:BTC/USDT"]["ticker_id"] == 1
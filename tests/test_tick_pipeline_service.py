@@ -6,18 +6,18 @@ import pytest
 
 from src.application.services.ticker_pipeline_service import TickPipelineService
 from src.config.config import AppConfig
+from src.domain.entities import TickEvent
 from src.domain.services.context.state import init_context
 
 
 @pytest.fixture()
-def base_context() -> Dict[str, Any]:
+def base_context(base_cfg: AppConfig) -> Dict[str, Any]:
     """Базовый in-memory контекст для тестов конвейера по тику."""
 
-    cfg = AppConfig()
-    return init_context(cfg)
+    return init_context(base_cfg)
 
 
-def test_process_ticker_does_not_execute_on_hold(monkeypatch, base_context) -> None:
+def test_process_ticker_does_not_execute_on_hold(monkeypatch, base_context, base_cfg) -> None:
     """При действии HOLD execute не должен вызываться."""
 
     import src.application.services.ticker_pipeline_service as tps
@@ -63,7 +63,7 @@ def test_process_ticker_does_not_execute_on_hold(monkeypatch, base_context) -> N
     monkeypatch.setattr(tps, "decide", fake_decide)
     monkeypatch.setattr(tps, "execute", fake_execute)
 
-    cfg = AppConfig()
+    cfg = base_cfg
     service = TickPipelineService(cfg)
 
     ticker_id = 1
@@ -99,7 +99,7 @@ def test_process_ticker_does_not_execute_on_hold(monkeypatch, base_context) -> N
     assert base_context["metrics"]["ticks"] == ticker_id
 
 
-def test_process_ticker_executes_on_non_hold(monkeypatch, base_context) -> None:
+def test_process_ticker_executes_on_non_hold(monkeypatch, base_context, base_cfg) -> None:
     """При действии BUY/SELL execute вызывается ровно один раз с корректными параметрами."""
 
     import src.application.services.ticker_pipeline_service as tps
@@ -146,7 +146,7 @@ def test_process_ticker_executes_on_non_hold(monkeypatch, base_context) -> None:
     monkeypatch.setattr(tps, "decide", fake_decide)
     monkeypatch.setattr(tps, "execute", fake_execute)
 
-    cfg = AppConfig()
+    cfg = base_cfg
     service = TickPipelineService(cfg)
 
     ticker_id = 5
@@ -181,3 +181,62 @@ def test_process_ticker_executes_on_non_hold(monkeypatch, base_context) -> None:
 
     # Метрики обновлены.
     assert base_context["metrics"]["ticks"] == ticker_id
+
+
+def test_process_event_matches_process_tick(base_context, base_cfg) -> None:
+    """process_event(TickEvent) проходит тот же конвейер, что и process_tick."""
+
+    cfg = base_cfg
+    service = TickPipelineService(cfg)
+    event = TickEvent(symbol=cfg.symbol, ticker_id=3, price=101.5, ts=1_700_000_000_000)
+
+    service.process_event(base_context, event)
+
+    expected = init_context(cfg)
+    service.process_tick(expected, symbol=event.symbol, ticker_id=event.ticker_id, price=event.price, ts=event.ts)
+
+    assert base_context["market"][cfg.symbol] == {"last_price": 101.5, "ts": event.ts}
+    assert base_context["market"] == expected["market"]
+    assert base_context["metrics"] == expected["metrics"] == {"ticks": 3}
+    for section in ("intents_history", "decisions_history"):
+        assert list(base_context[section][cfg.symbol]) == list(expected[section][cfg.symbol])
+    assert len(base_context["decisions_history"][cfg.symbol]) == 1
+
+
+def test_process_and_emit_returns_decision(base_context, base_cfg) -> None:
+    """process_and_emit прогоняет STRAT → ORCH → EXEC и возвращает решение."""
+
+    cfg = base_cfg
+    service = TickPipelineService(cfg)
+
+    decision = service.process_and_emit(base_context, symbol=cfg.symbol, ticker_id=1, price=100.0)
+
+    assert decision is base_context["decisions"][cfg.symbol]
+    assert decision["action"] in {"BUY", "SELL", "HOLD"}
+    # Метрики обновляет только process_tick.
+    assert base_context["metrics"].get("ticks", 0) == 0
+
+
+def test_process_batch_matches_per_tick_semantics(base_cfg) -> None:
+    """process_batch даёт тот же state, что и N последовательных process_tick."""
+
+    cfg = base_cfg
+    service = TickPipelineService(cfg)
+    events = [
+        TickEvent(symbol=cfg.symbol, ticker_id=ticker_id, price=100.0 + ticker_id, ts=1_700_000_000_000 + ticker_id)
+        for ticker_id in range(1, 8)
+    ]
+
+    sequential = init_context(cfg)
+    for event in events:
+        service.process_event(sequential, event)
+
+    batched = init_context(cfg)
+    decisions = service.process_batch(batched, events)
+
+    assert decisions == list(sequential["decisions_history"][cfg.symbol])
+    for section in ("intents_history", "decisions_history"):
+        assert list(batched[section][cfg.symbol]) == list(sequential[section][cfg.symbol])
+    assert batched["market"] == sequential["market"]
+    assert batched["metrics"] == sequential["metrics"] == {"ticks": 7}
+    assert service.process_batch(batched, []) == []
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 Тесты здесь фиксируют важное архитектурное требование:
 
-* ``update_orderflow_from_tick`` может вызываться **только** в демо‑сценарии
-  ``run_demo_offline``;
+* симулятор (``make_orderflow_handler``/``update_orderflow_from_tick``)
+  может вызываться **только** в демо‑сценарии ``run_demo_offline``;
 * боевой async‑сценарий ``run_realtime_from_exchange`` не должен ссылаться
   на симулятор стакана ни напрямую, ни через импорт на уровне модуля.
 
@@ -13,11 +13,47 @@ from __future__ import annotations
 симулятора в боевой путь, тест должен упасть уже на этапе импорта.
 """
 
+import ast
+import functools
 import inspect
+from pathlib import Path
+from typing import Callable, FrozenSet
 
 from src.application.use_cases import run_realtime_trading
 
 
+@functools.cache
+def _module_tree(path: str) -> ast.Module:
+    """Разобрать файл модуля один раз на прогон тестов."""
+
+    return ast.parse(Path(path).read_text(encoding="utf-8"), filename=path)
+
+
+def _referenced_names(fn: Callable[..., object]) -> FrozenSet[str]:
+    """Все имена, на которые ссылается тело функции: переменные,
+    атрибуты и импортируемые символы."""
+
+    tree = _module_tree(inspect.getfile(fn))
+    target = next(
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == fn.__name__
+    )
+
+    names = set()
+    for node in ast.walk(target):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, ast.alias):
+            names.add(node.asname or node.name)
+            names.add(node.name)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.update(node.module.split("."))
+    return frozenset(names)
+
+
 def test_update_orderflow_not_imported_in_module_scope() -> None:
     """Модульный scope не содержит прямого импорта симулятора стакана.
 
@@ -28,17 +64,27 @@ def test_update_orderflow_not_imported_in_module_scope() -> None:
 
     # Симулятор не должен быть доступен как глобальный атрибут модуля.
     assert not hasattr(run_realtime_trading, "update_orderflow_from_tick")
+    assert not hasattr(run_realtime_trading, "make_orderflow_handler")
 
 
 def test_run_realtime_from_exchange_source_does_not_reference_simulator() -> None:
-    """В исходном коде async‑функции нет ссылок на симулятор стакана.
+    """В async‑функции нет ссылок на симулятор стакана.
 
-    Мы проверяем текст исходника ``run_realtime_from_exchange`` на
-    отсутствие подстроки ``update_orderflow_from_tick``. Этого достаточно,
-    чтобы зафиксировать отсутствие прямого вызова или импорта внутри
-    функции.
+    По AST тела ``run_realtime_from_exchange`` собираются все имена,
+    атрибуты и импорты; среди них не должно быть точек входа
+    симулятора. Этого достаточно, чтобы зафиксировать
+    отсутствие прямого вызова или импорта внутри функции.
     """
 
-    source = inspect.getsource(run_realtime_trading.run_realtime_from_exchange)
-    assert "update_orderflow_from_tick" not in source
+    names = _referenced_names(run_realtime_trading.run_realtime_from_exchange)
+    assert "update_orderflow_from_tick" not in names
+    assert "make_orderflow_handler" not in names
+    assert "orderflow_simulator" not in names
+
+
+def test_run_demo_offline_references_simulator() -> None:
+    """Санити‑проверка самого AST‑сканера: демо‑сценарий симулятор использует."""
+
+    names = _referenced_names(run_realtime_trading.run_demo_offline)
+    assert "make_orderflow_handler" in names
 
@@ -3,7 +3,10 @@
 Проверяем чистую бизнес-логику без внешнего I/O.
 """
 
+import json
+
 import pytest
+from src.domain.entities import Action
 from src.domain.services.orchestrator.orchestrator import decide
 
 
@@ -124,3 +127,17 @@ def test_decide_downgrades_to_hold_when_risk_limit_exceeded():
     assert result["reason"] == "risk_limit_exceeded"
     # ts для HOLD должен соответствовать последнему тику из контекста
     assert result["ts"] == 3333333333
+
+
+@pytest.mark.unit
+def test_decide_accepts_action_enum_and_plain_strings():
+    """Action — StrEnum: intents со строками из снапшота и с enum равнозначны."""
+    context = {"market": {"BTC/USDT": {"ts": 1}}}
+    enum_intents = [{"action": Action.HOLD}, {"action": Action.SELL, "reason": "down"}]
+    restored_intents = json.loads(json.dumps(enum_intents))
+
+    assert restored_intents[1]["action"] == "SELL"
+    for intents in (enum_intents, restored_intents):
+        result = decide(intents, context, ticker_id=1, symbol="BTC/USDT")
+        assert result["action"] == Action.SELL
+        assert result["reason"] == "down"
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from src.infrastructure.state.aggregated_file_state_snapshot_store import (
+    AggregatedFileStateSnapshotStore,
+)
+
+
+def test_aggregated_store_keeps_latest_snapshot_per_key_across_reopen(tmp_path) -> None:
+    store = AggregatedFileStateSnapshotStore(base_dir=tmp_path)
+    store.save_snapshot("local:BTC/USDT", {"ticker_id": 1})
+    store.batch_save({"local:BTC/USDT": {"ticker_id": 2}, "local:ETH/USDT": {"ticker_id": 7}})
+    store.close()
+
+    assert [p.name for p in tmp_path.iterdir()] == ["state.log"]
+
+    reopened = AggregatedFileStateSnapshotStore(base_dir=tmp_path)
+    assert reopened.load_snapshot("local:BTC/USDT") == {"ticker_id": 2}
+    assert reopened.load_snapshot("local:ETH/USDT") == {"ticker_id": 7}
+    assert reopened.load_snapshot("local:SOL/USDT") is None
+    reopened.close()
+
+
+def test_aggregated_store_drops_truncated_tail_on_startup(tmp_path) -> None:
+    store = AggregatedFileStateSnapshotStore(base_dir=tmp_path)
+    store.save_snapshot("k", {"ticker_id": 1})
+    store.close()
+
+    log_path = tmp_path / "state.log"
+    good_size = log_path.stat().st_size
+    with open(log_path, "ab") as f:
+        f.write(b"\x05\x00\x00\x00garbage")
+
+    reopened = AggregatedFileStateSnapshotStore(base_dir=tmp_path)
+    assert reopened.load_snapshot("k") == {"ticker_id": 1}
+    assert log_path.stat().st_size == good_size
+    reopened.close()
+
+
+def test_aggregated_store_compacts_stale_records(tmp_path) -> None:
+    store = AggregatedFileStateSnapshotStore(base_dir=tmp_path, compact_min_bytes=256)
+    for i in range(50):
+        store.save_snapshot("local:BTC/USDT", {"ticker_id": i})
+
+    assert (tmp_path / "state.log").stat().st_size < 256
+    assert store.load_snapshot("local:BTC/USDT") == {"ticker_id": 49}
+    store.close()
+
+
+def test_aggregated_store_reuses_serialization_buffer(tmp_path) -> None:
+    store = AggregatedFileStateSnapshotStore(base_dir=tmp_path)
+    buffer = store._buffer
+
+    store.batch_save({"local:BTC/USDT": {"ticker_id": 1, "note": "первый"}, "local:ETH/USDT": {"ticker_id": 2}})
+    store.batch_save({"local:BTC/USDT": {"ticker_id": 3}})
+
+    assert store._buffer is buffer
+    assert store.load_snapshot("local:BTC/USDT") == {"ticker_id": 3}
+    assert store.load_snapshot("local:ETH/USDT") == {"ticker_id": 2}
+    store.close()
+
+    reopened = AggregatedFileStateSnapshotStore(base_dir=tmp_path)
+    assert reopened.load_snapshot("local:BTC/USDT") == {"ticker_id": 3}
+    reopened.close()
+
+
+class _ShortWriteFile:
+    """Обёртка над файлом лога, принимающая не больше ``limit`` байт за ``write``."""
+
+    def __init__(self, file, limit: int) -> None:
+        self._file = file
+        self._limit = limit
+
+    def write(self, data) -> int:
+        return self._file.write(data[: self._limit])
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def test_aggregated_store_completes_short_writes(tmp_path) -> None:
+    store = AggregatedFileStateSnapshotStore(tmp_path)
+    store._file = _ShortWriteFile(store._file, limit=7)
+
+    snapshots = {f"local:{symbol}": {"symbol": symbol, "pad": "x" * 50} for symbol in ("BTC/USDT", "ETH/USDT")}
+    store.batch_save(snapshots)
+    for key, snapshot in snapshots.items():
+        assert store.load_snapshot(key) == snapshot
+    store.close()
+
+    reopened = AggregatedFileStateSnapshotStore(tmp_path)
+    for key, snapshot in snapshots.items():
+        assert reopened.load_snapshot(key) == snapshot
+    reopened.close()
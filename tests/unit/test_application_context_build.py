@@ -11,7 +11,7 @@ from src.config.config import AppConfig
 from src.domain.entities.currency_pair import CurrencyPair
 from src.domain.interfaces.cache import IIndicatorStore, IMarketCache
 from src.domain.interfaces.currency_pair_repository import ICurrencyPairRepository
-from src.domain.services.context.state import init_context
+from src.domain.services.context.state import init_context, record_decision
 from src.infrastructure.repositories import InMemoryCurrencyPairRepository
 
 
@@ -69,3 +69,51 @@ def test_build_context_accepts_external_repository() -> None:
     assert ctx["pair_repository"] is repo
     assert set(ctx["pairs"].keys()) == {"BTC/USDT"}
 
+
+def test_build_context_registers_symbols_from_repository() -> None:
+    # Пары из репозитория заранее получают пустые истории в контексте,
+    # а незарегистрированный символ регистрируется при первой записи.
+    repo = InMemoryCurrencyPairRepository.from_symbols(["BTC/USDT", "ETH/USDT"])
+    cfg = AppConfig(symbol="BTC/USDT")
+
+    ctx = build_context(cfg, init_context(cfg), pair_repository=repo)
+
+    for section in ("indicators_history", "intents_history", "decisions_history"):
+        assert {symbol: list(history) for symbol, history in ctx[section].items()} == {
+            "BTC/USDT": [],
+            "ETH/USDT": [],
+        }
+
+    record_decision(ctx, symbol="DOGE/USDT", decision={"action": "HOLD"})
+    assert list(ctx["decisions_history"]["DOGE/USDT"]) == [{"action": "HOLD"}]
+    assert list(ctx["intents_history"]["DOGE/USDT"]) == []
+
+
+def test_build_context_leaves_trade_pool_opt_in() -> None:
+    # Кэши из build_context не переиспользуют dict'ы трейдов: трейд,
+    # полученный из get_trades(), не очищается при вытеснении из окна.
+    pair = CurrencyPair("BTC/USDT", "BTC", "USDT", trades_history_size=2)
+    cfg = AppConfig(symbol="BTC/USDT")
+    ctx = build_context(cfg, init_context(cfg), pair_repository=InMemoryCurrencyPairRepository([pair]))
+    cache = ctx["market_caches"]["BTC/USDT"]
+    assert cache.trade_pool is None
+
+    first = {"price": 100.0, "amount": 1.0, "timestamp": 1}
+    cache.add_trade(first)
+    for i in range(3):
+        cache.add_trade({"price": 101.0 + i, "amount": 1.0, "timestamp": 2 + i})
+
+    assert first == {"price": 100.0, "amount": 1.0, "timestamp": 1}
+
+
+def test_register_symbol_interns_context_keys() -> None:
+    import sys
+
+    from src.domain.services.context.state import register_symbol
+
+    ctx = init_context(AppConfig())
+    raw = "".join(["XRP", "/", "USDT"])
+    register_symbol(ctx, raw)
+
+    key = next(k for k in ctx["decisions_history"] if k == "XRP/USDT")
+    assert key is sys.intern("XRP/USDT")
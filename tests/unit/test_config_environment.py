@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import dataclasses
 import os
 
+import pytest
+
 from src.config.config import AppConfig, load_config
 from src.config import config as config_module
 
@@ -87,3 +90,24 @@ def test_explicit_arguments_override_env(monkeypatch) -> None:
 
     # MAX_TICKS из env должен переопределить явный аргумент max_ticks=3
     assert cfg.max_ticks == 100
+
+
+def test_state_snapshot_backend_from_env_and_validation(monkeypatch) -> None:
+    monkeypatch.setenv("STATE_SNAPSHOT_BACKEND", "aggregated")
+    assert load_config().state_snapshot_backend == "aggregated"
+
+    monkeypatch.setenv("STATE_SNAPSHOT_BACKEND", "redis")
+    with pytest.raises(ValueError, match="state_snapshot_backend"):
+        load_config()
+
+
+def test_app_config_is_frozen_and_supports_replace() -> None:
+    cfg = AppConfig()
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cfg.symbol = "ETH/USDT"  # type: ignore[misc]
+
+    other = dataclasses.replace(cfg, symbol="ETH/USDT")
+    assert other.symbol == "ETH/USDT"
+    assert cfg.symbol == "BTC/USDT"
+    assert not hasattr(cfg, "__dict__")
@@ -85,6 +85,11 @@ def test_currency_pair_serialization():
     assert restored.profit_markup == original.profit_markup
     assert restored.bar_window_size == original.bar_window_size
 
+    # Форма dict — ровно публичные поля; повторная сериализация совпадает.
+    assert list(data) == list(restored.to_dict())
+    assert restored.to_dict() == data
+    assert not any(key.startswith("_") for key in data)
+
 
 def test_currency_pair_repr():
     """Тест строкового представления."""
@@ -101,3 +106,60 @@ def test_currency_pair_repr():
     assert "deal_count=3" in repr_str
     assert "cache≈" in repr_str
     assert "MB" in repr_str
+
+
+def test_currency_pair_from_dict_fills_defaults_and_validates():
+    """from_dict без __init__ всё равно подставляет дефолты и проверяет инварианты."""
+    restored = CurrencyPair.from_dict({"symbol": "SOL/USDT", "base_currency": "SOL"})
+    assert restored.quote_currency == "USDT"
+    assert restored.trades_history_size == 5000
+    assert restored.created_at > 0
+
+    for bad in ({"symbol": "SOLUSDT"}, {"symbol": "SOL/USDT", "price_step": 0}):
+        try:
+            CurrencyPair.from_dict(bad)
+        except ValueError:
+            pass
+        else:  # pragma: no cover - защитный блок
+            raise AssertionError(f"Expected ValueError for {bad}")
+
+
+def test_currency_pair_cache_estimate_is_recomputed_after_size_change():
+    """Оценка кеша кэшируется, но сбрасывается при изменении размеров."""
+    pair = CurrencyPair(symbol="BTC/USDT", base_currency="BTC", quote_currency="USDT")
+
+    before = pair.estimate_cache_size_mb()
+    assert pair.estimate_cache_size_mb() == before
+
+    pair.trades_history_size = 0
+    assert pair.estimate_cache_size_mb() < before
+
+
+def test_currency_pair_repr_is_cached_until_field_changes():
+    """repr кэшируется и пересобирается после изменения полей из repr."""
+    pair = CurrencyPair(symbol="BTC/USDT", base_currency="BTC", quote_currency="USDT")
+
+    first = repr(pair)
+    assert repr(pair) is first
+
+    pair.deal_quota = 40.0
+    assert "deal_quota=40.0" in repr(pair)
+
+    pair.orderbook_depth = 10
+    assert repr(pair) != first
+
+
+def test_currency_pair_uses_slots_and_stays_mutable():
+    pair = CurrencyPair("ETH/USDT", "ETH", "USDT", trades_history_size=7)
+
+    assert not hasattr(pair, "__dict__")
+    try:
+        pair.unknown_field = 1  # type: ignore[attr-defined]
+    except AttributeError:
+        pass
+    else:  # pragma: no cover - защитный блок
+        raise AssertionError("CurrencyPair must not accept unknown attributes")
+
+    pair.trades_history_size = 9
+    assert pair.to_dict()["trades_history_size"] == 9
+    assert CurrencyPair.from_dict(pair.to_dict()).trades_history_size == 9
@@ -7,6 +7,10 @@
 * защита от дубликатов символов.
 """
 
+import sys
+
+import pytest
+
 from src.domain.entities.currency_pair import CurrencyPair
 from src.domain.interfaces.exchange_pair_metadata_provider import PairPrecisions
 from src.infrastructure.repositories import InMemoryCurrencyPairRepository
@@ -51,6 +55,33 @@ def test_list_all_respects_enabled_flag() -> None:
     assert {p.symbol for p in active_only} == {"BTC/USDT"}
 
 
+def test_list_views_are_cached_immutable_sequences() -> None:
+    repo = InMemoryCurrencyPairRepository.from_symbols(["BTC/USDT", "ETH/USDT"])
+
+    assert isinstance(repo.list_all(), tuple)
+    assert repo.list_all() is repo.list_all()
+    assert repo.list_active() is repo.list_active()
+
+
+def test_set_enabled_rebuilds_active_view() -> None:
+    repo = InMemoryCurrencyPairRepository.from_symbols(["BTC/USDT", "ETH/USDT"])
+    before = repo.list_active()
+
+    repo.set_enabled("ETH/USDT", False)
+
+    assert [p.symbol for p in repo.list_active()] == ["BTC/USDT"]
+    assert len(before) == 2
+    assert len(repo.list_all()) == 2
+
+    # Повторное выключение ничего не пересобирает.
+    active = repo.list_active()
+    repo.set_enabled("ETH/USDT", False)
+    assert repo.list_active() is active
+
+    with pytest.raises(KeyError):
+        repo.set_enabled("DOGE/USDT", True)
+
+
 def test_duplicate_symbols_raise_value_error() -> None:
     p1 = CurrencyPair(symbol="BTC/USDT", base_currency="BTC", quote_currency="USDT")
     p2 = CurrencyPair(symbol="BTC/USDT", base_currency="BTC", quote_currency="USDT")
@@ -140,3 +171,49 @@ def test_init_overrides_existing_precisions_from_provider() -> None:
     assert pair.min_step == 0.0001
     assert pair.price_step == 0.01
 
+
+class _BulkPrecisionProvider(_DummyPrecisionProvider):
+    """Мок‑провайдер с пакетным API; одиночные вызовы запрещены."""
+
+    def __init__(self, data: dict[str, PairPrecisions]):
+        super().__init__(data)
+        self.bulk_calls: list[list[str]] = []
+
+    def get_precisions(self, symbol: str) -> PairPrecisions | None:
+        raise AssertionError("get_precisions must not be called for bulk providers")
+
+    def get_precisions_bulk(self, symbols: list[str]) -> dict[str, PairPrecisions]:
+        self.bulk_calls.append(list(symbols))
+        return {s: self._data[s] for s in symbols if s in self._data}
+
+
+def test_bulk_provider_is_queried_once_for_all_pairs() -> None:
+    provider = _BulkPrecisionProvider({"BTC/USDT": {"min_step": 0.001, "price_step": 0.1}})
+
+    repo = InMemoryCurrencyPairRepository.from_symbols(
+        ["BTC/USDT", "ETH/USDT"], precision_provider=provider
+    )
+
+    assert provider.bulk_calls == [["BTC/USDT", "ETH/USDT"]]
+    btc = repo.get_by_symbol("BTC/USDT")
+    eth = repo.get_by_symbol("ETH/USDT")
+    assert btc is not None and btc.price_step == 0.1
+    # Символ без данных в пакетном ответе сохраняет значения по умолчанию.
+    assert eth is not None and eth.price_step == 0.01
+
+
+def test_repository_interns_pair_symbols() -> None:
+    symbol = "".join(["BTC", "/", "USDT"])
+    assert symbol is not sys.intern("BTC/USDT")
+
+    repo = InMemoryCurrencyPairRepository([CurrencyPair(symbol, "BTC", "USDT")])
+
+    assert repo.get_by_symbol("BTC/USDT").symbol is sys.intern("BTC/USDT")
+
+
+def test_get_by_symbol_is_a_direct_dict_lookup() -> None:
+    repo = InMemoryCurrencyPairRepository.from_symbols(["BTC/USDT", "ETH/USDT"])
+
+    assert repo.get_by_symbol("ETH/USDT").symbol == "ETH/USDT"
+    assert repo.get_by_symbol("XRP/USDT") is None
+    assert InMemoryCurrencyPairRepository.get_by_symbol(repo, "BTC/USDT") is repo.get_by_symbol("BTC/USDT")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 from src.config.config import AppConfig
 from src.domain.entities.currency_pair import CurrencyPair
 from src.infrastructure.cache.in_memory import InMemoryIndicatorStore
@@ -28,6 +30,22 @@ def test_indicator_store_uses_intervals_from_config() -> None:
     assert store.should_update_heavy(5)
 
 
+def test_indicator_store_update_policy_matches_modulo_for_any_interval() -> None:
+    pair = CurrencyPair("ETH/USDT", "ETH", "USDT", indicator_window_size=5)
+    cfg = AppConfig(
+        indicator_fast_interval=2,
+        indicator_medium_interval=6,
+        indicator_heavy_interval=8,
+    )
+
+    store = InMemoryIndicatorStore(pair, cfg)
+
+    for ticker_id in range(0, 50):
+        assert store.should_update_fast(ticker_id) == (ticker_id % 2 == 0)
+        assert store.should_update_medium(ticker_id) == (ticker_id % 6 == 0)
+        assert store.should_update_heavy(ticker_id) == (ticker_id % 8 == 0)
+
+
 def test_indicator_store_respects_indicator_window_size() -> None:
     pair = CurrencyPair("ETH/USDT", "ETH", "USDT", indicator_window_size=3)
     cfg = AppConfig()
@@ -39,3 +57,9 @@ def test_indicator_store_respects_indicator_window_size() -> None:
 
     assert len(store.fast_history) == 3
     assert list(store.fast_history) == [7.0, 8.0, 9.0]
+    # Окно доступно как непрерывный float64‑массив в хронологическом порядке
+    window = store.fast_history.as_array()
+    assert window.dtype == np.float64
+    assert window.tolist() == [7.0, 8.0, 9.0]
+    assert len(store.medium_history) == 0
+    assert store.medium_history.as_array().size == 0
@@ -0,0 +1,29 @@
+import asyncio
+import types
+
+import main
+
+
+def test_event_loop_is_uvloop_in_prod(monkeypatch):
+    """При установленном uvloop CLI ставит его политику event loop."""
+
+    class _FakePolicy(asyncio.DefaultEventLoopPolicy):
+        pass
+
+    fake_uvloop = types.SimpleNamespace(EventLoopPolicy=_FakePolicy)
+    monkeypatch.setattr(main, "uvloop", fake_uvloop)
+
+    previous = asyncio.get_event_loop_policy()
+    try:
+        assert main._install_event_loop_policy() == "uvloop"
+        assert isinstance(asyncio.get_event_loop_policy(), _FakePolicy)
+    finally:
+        asyncio.set_event_loop_policy(previous)
+
+
+def test_event_loop_falls_back_to_asyncio_without_uvloop(monkeypatch):
+    monkeypatch.setattr(main, "uvloop", None)
+
+    previous = asyncio.get_event_loop_policy()
+    assert main._install_event_loop_policy() == "asyncio"
+    assert asyncio.get_event_loop_policy() is previous
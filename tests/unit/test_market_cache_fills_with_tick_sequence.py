@@ -7,6 +7,7 @@ from src.domain.services.context.state import init_context
 from src.domain.entities.currency_pair import CurrencyPair
 from src.infrastructure.cache.in_memory import InMemoryMarketCache
 from src.domain.services.market_data.orderflow_simulator import (
+    make_orderflow_handler,
     update_orderflow_from_tick,
 )
 
@@ -49,3 +50,47 @@ def test_ticker_sequence_fills_trades_history_until_window_limit_via_orderflow_s
     expected_first_price = 100.0 + (total_ticks - window_size)
     assert trades[0]["price"] == expected_first_price
     assert trades[-1]["price"] == 100.0 + total_ticks - 1
+
+
+def test_orderflow_simulator_recycles_evicted_trades_through_pool() -> None:
+    from src.infrastructure.pool import DictPool
+
+    symbol = "BTC/USDT"
+    ctx = _build_context_with_cache(symbol)
+    pair = ctx["pairs"][symbol]
+    pair.trades_history_size = 4
+    pool = DictPool()
+    cache = InMemoryMarketCache(pair, trade_pool=pool)
+    ctx["market_caches"] = {symbol: cache}
+
+    first_trade_ids = set()
+    for i in range(12):
+        update_orderflow_from_tick(ctx, symbol=symbol, price=100.0 + i, ts=1_000 + i)
+        if i < 5:
+            first_trade_ids.update(id(trade) for trade in cache.get_trades())
+
+    trades = cache.get_trades()
+    assert [trade["price"] for trade in trades] == [108.0, 109.0, 110.0, 111.0]
+    assert all(trade["symbol"] == symbol for trade in trades)
+    # Новые трейды берутся из вытесненных dict'ов: новых объектов не появляется
+    assert {id(trade) for trade in trades} <= first_trade_ids
+    assert len(pool) == 1
+
+
+def test_orderflow_handler_is_bound_to_cache_at_creation() -> None:
+    symbol = "BTC/USDT"
+    ctx = _build_context_with_cache(symbol)
+    cache: InMemoryMarketCache = ctx["market_caches"][symbol]
+
+    handle = make_orderflow_handler(ctx, symbol)
+    assert handle is not None
+    assert make_orderflow_handler(ctx, "ETH/USDT") is None
+
+    # Обработчик больше не читает context: кэш и пара замкнуты в нём
+    ctx["market_caches"] = {}
+    handle(100.0, 1_000)
+    handle(101.0, 1_001)
+
+    assert [trade["price"] for trade in cache.get_trades()] == [100.0, 101.0]
+    orderbook = cache.get_orderbook()
+    assert orderbook is not None and orderbook["timestamp"] == 1_001
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from typing import Dict, Any
 
+import numpy as np
+
 from src.domain.entities.currency_pair import CurrencyPair
+from src.domain.interfaces.cache import is_indicator_store, is_market_cache
 from src.infrastructure.cache.in_memory import InMemoryMarketCache
 
 
@@ -40,6 +43,12 @@ def test_market_cache_respects_pair_window_sizes() -> None:
     assert len(trades) == 7
     assert trades[0]["id"] == 8
 
+    # Трейды без price/amount/timestamp дают nan/0 в колонках
+    prices, amounts, timestamps = cache.get_trade_columns()
+    assert len(prices) == 7
+    assert np.isnan(prices).all() and np.isnan(amounts).all()
+    assert not timestamps.any()
+
     # Orderbook is trimmed to depth
     ob = _make_orderbook(levels=20)
     cache.update_orderbook(ob)
@@ -47,6 +56,16 @@ def test_market_cache_respects_pair_window_sizes() -> None:
     assert trimmed is not None
     assert len(trimmed["bids"]) == 5
     assert len(trimmed["asks"]) == 5
+    # Берутся лучшие уровни (префикс отсортированных сторон), исходник не меняется
+    assert trimmed["bids"][0] == [100.0, 1.0] and trimmed["asks"][-1] == [104.0, 5.0]
+    assert len(ob["bids"]) == 20
+
+    # Кортежи уровней приводятся к списку
+    cache.update_orderbook({"bids": tuple(ob["bids"]), "asks": ()})
+    trimmed = cache.get_orderbook()
+    assert trimmed is not None
+    assert trimmed["bids"] == ob["bids"][:5]
+    assert trimmed["asks"] == []
 
 
 def test_market_cache_ticker_roundtrip() -> None:
@@ -64,3 +83,78 @@ def test_market_cache_ticker_roundtrip() -> None:
 
     assert stored is not None
     assert stored["last"] == 100.5
+
+
+def test_memoized_protocol_checks_match_isinstance() -> None:
+    pair = CurrencyPair("ETH/USDT", "ETH", "USDT")
+    cache = InMemoryMarketCache(pair)
+
+    # Повторная проверка того же типа берётся из кэша и даёт тот же ответ.
+    assert is_market_cache(cache)
+    assert is_market_cache(InMemoryMarketCache(pair))
+
+    assert not is_market_cache(None)
+    assert not is_market_cache({"symbol": "ETH/USDT"})
+    assert not is_indicator_store(cache)
+
+
+def test_market_cache_trade_columns_follow_ring_window() -> None:
+    pair = CurrencyPair("ETH/USDT", "ETH", "USDT", trades_history_size=5)
+    cache = InMemoryMarketCache(pair)
+
+    # 11 трейдов в кольцо ёмкостью 8 с окном 5: окно переходит через конец буфера
+    for i in range(11):
+        cache.add_trade({"price": 100.0 + i, "amount": 1.0 + i, "timestamp": 1_000 + i})
+
+    prices, amounts, timestamps = cache.get_trade_columns()
+    assert prices.tolist() == [trade["price"] for trade in cache.get_trades()]
+    assert prices.tolist() == [106.0, 107.0, 108.0, 109.0, 110.0]
+    assert amounts.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert timestamps.dtype == np.int64
+    assert timestamps.tolist() == [1_006, 1_007, 1_008, 1_009, 1_010]
+
+    last_prices, _, _ = cache.get_trade_columns(limit=2)
+    assert last_prices.tolist() == [109.0, 110.0]
+    assert cache.get_prices(limit=2).tolist() == [109.0, 110.0]
+    assert cache.get_prices().tolist() == prices.tolist()
+    assert cache.get_prices().flags["C_CONTIGUOUS"]
+
+    # Возвращаются копии: правка массива не меняет кэш
+    prices[:] = 0.0
+    assert cache.get_trade_columns()[0][0] == 106.0
+
+
+def test_market_cache_trade_columns_with_single_trade_window() -> None:
+    pair = CurrencyPair("ETH/USDT", "ETH", "USDT", trades_history_size=1)
+    cache = InMemoryMarketCache(pair)
+
+    # Окно 1: ёмкость кольца 1, head не сдвигается, но колонки пишутся
+    for i in range(3):
+        cache.add_trade({"price": 100.0 + i, "amount": 1.0, "timestamp": 1_000 + i})
+
+    assert [trade["price"] for trade in cache.get_trades()] == [102.0]
+    assert cache.get_prices()[-1] == 102.0
+    prices, _, timestamps = cache.get_trade_columns()
+    assert prices.tolist() == [102.0]
+    assert timestamps.tolist() == [1_002]
+
+
+def test_object_ring_keeps_window_and_returns_evicted_items() -> None:
+    from src.infrastructure.cache.in_memory import _ObjectRing
+
+    ring = _ObjectRing(3)
+    assert ring.capacity == 4
+
+    evicted = [ring.append({"i": i}) for i in range(6)]
+
+    assert evicted[:3] == [None, None, None]
+    assert [item["i"] for item in evicted[3:]] == [0, 1, 2]
+    assert [item["i"] for item in ring.to_list()] == [3, 4, 5]
+    assert [item["i"] for item in ring.to_list(2)] == [4, 5]
+    assert len(ring.to_list(0)) == 3
+    # Вытесненные элементы не удерживаются слотами буфера
+    assert sum(slot is not None for slot in ring._items) == 3
+
+    empty = _ObjectRing(0)
+    assert empty.append({"i": 0}) is None
+    assert empty.to_list() == []
@@ -43,3 +43,19 @@ def test_update_market_state_updates_inmemory_market_cache_ticker() -> None:
     assert stored["symbol"] == "ETH/USDT"
     assert stored["last"] == 200.0
     assert stored["timestamp"] == 2222222222
+
+
+def test_update_market_state_reuses_market_view_and_snapshot_copies_it() -> None:
+    from src.domain.services.context.state import make_state_snapshot
+
+    ctx = _build_context_with_cache("BTC/USDT")
+
+    update_market_state(ctx, symbol="BTC/USDT", price=1.0, ts=1)
+    view = ctx["market"]["BTC/USDT"]
+    snapshot = make_state_snapshot(ctx, symbol="BTC/USDT", ticker_id=1)
+
+    update_market_state(ctx, symbol="BTC/USDT", price=2.0, ts=2)
+
+    assert ctx["market"]["BTC/USDT"] is view
+    assert view == {"last_price": 2.0, "ts": 2}
+    assert snapshot["market"] == {"last_price": 1.0, "ts": 1}
@@ -5,6 +5,7 @@ from typing import Any, Dict, List
 from src.domain.interfaces.cache import IMarketCache
 from src.domain.services.market_data.order_book_provider import (
     get_order_book_from_context,
+    resolve_market_cache,
 )
 
 
@@ -71,3 +72,18 @@ def test_get_order_book_from_context_returns_none_when_no_cache() -> None:
     snapshot = get_order_book_from_context(context, symbol=symbol)
 
     assert snapshot is None
+
+
+def test_get_order_book_from_context_uses_resolved_cache() -> None:
+    symbol = "BTC/USDT"
+    cache = FakeMarketCache(symbol, {"bids": [], "asks": [], "symbol": symbol})
+    context: Dict[str, Any] = {"market_caches": {symbol: cache}}
+
+    resolved = resolve_market_cache(context, symbol)
+    assert resolved is cache
+    assert resolve_market_cache(context, "ETH/USDT") is None
+
+    # Контекст не читается, если кэш передан явно
+    snapshot = get_order_book_from_context({}, symbol=symbol, cache=resolved)
+    assert snapshot is not None
+    assert snapshot["symbol"] == symbol
@@ -2,13 +2,21 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
+import pytest
+
 from src.domain.services.context.state import (
     apply_state_snapshot,
     init_context,
     make_state_snapshot,
+    record_decision,
+    register_symbol,
 )
+from src.infrastructure.state import file_state_snapshot_store as store_module
 from src.infrastructure.state.file_state_snapshot_store import FileStateSnapshotStore
+from src.infrastructure.state.snapshot_codec import decode_snapshot, encode_snapshot
 from src.config.config import AppConfig
+from src.domain.entities import Action
+from src.domain.entities.currency_pair import CurrencyPair
 
 
 def test_file_state_snapshot_store_save_and_load(tmp_path) -> None:
@@ -37,6 +45,20 @@ def test_file_state_snapshot_store_save_and_load(tmp_path) -> None:
     assert loaded["market"]["last_price"] == 123.45
 
 
+def test_file_state_snapshot_store_batch_save(tmp_path) -> None:
+    store = FileStateSnapshotStore(base_dir=tmp_path)
+
+    snapshots = {
+        f"local:{symbol}": {"symbol": symbol, "ticker_id": idx}
+        for idx, symbol in enumerate(["BTC/USDT", "ETH/USDT", "SOL/USDT"], start=1)
+    }
+    store.batch_save(snapshots)
+
+    for key, snapshot in snapshots.items():
+        assert store.load_snapshot(key) == snapshot
+    assert not list(tmp_path.glob("*.tmp"))
+
+
 def test_make_and_apply_state_snapshot_roundtrip(tmp_path) -> None:
     symbol = "ETH/USDT"
     cfg = AppConfig(symbol=symbol)
@@ -56,3 +78,104 @@ def test_make_and_apply_state_snapshot_roundtrip(tmp_path) -> None:
     assert new_ctx["market"][symbol]["last_price"] == 10.0
     assert new_ctx["metrics"]["ticks"] == 5
     assert new_ctx["intents"][symbol][0]["action"] == "BUY"
+
+
+def test_decisions_history_is_bounded_by_pair_window() -> None:
+    symbol = "ETH/USDT"
+    context = init_context(AppConfig(symbol=symbol))
+    context["pairs"] = {symbol: CurrencyPair(symbol, "ETH", "USDT", indicator_window_size=3)}
+    register_symbol(context, symbol)
+
+    for ticker_id in range(5):
+        record_decision(context, symbol=symbol, decision={"action": "HOLD", "ts": ticker_id})
+
+    history = context["decisions_history"][symbol]
+    assert history.maxlen == 3
+    assert [d["ts"] for d in history] == [2, 3, 4]
+
+    # В снапшот история уходит обычным списком, обратно — снова с окном.
+    snapshot = make_state_snapshot(context, symbol=symbol, ticker_id=5)
+    assert snapshot["decisions_history"] == list(history)
+
+    apply_state_snapshot(context, symbol=symbol, snapshot=snapshot)
+    assert context["decisions_history"][symbol].maxlen == 3
+
+
+def test_state_snapshot_shares_elements_but_not_containers() -> None:
+    symbol = "ETH/USDT"
+    context = init_context(AppConfig(symbol=symbol))
+    decision = {"action": "HOLD", "ts": 1}
+    record_decision(context, symbol=symbol, decision=decision)
+
+    snapshot = make_state_snapshot(context, symbol=symbol, ticker_id=1)
+    record_decision(context, symbol=symbol, decision={"action": "BUY", "ts": 2})
+
+    # Неглубокая копия: сами решения общие, история в снапшоте не растёт.
+    assert snapshot["decision"] is decision
+    assert snapshot["decisions_history"][0] is decision
+    assert len(snapshot["decisions_history"]) == 1
+
+
+def test_snapshot_codec_roundtrip_keeps_utf8_and_actions() -> None:
+    snapshot = {"symbol": "ETH/USDT", "note": "снапшот", "decision": {"action": Action.BUY}}
+
+    data = encode_snapshot(snapshot)
+
+    assert "снапшот".encode("utf-8") in data
+    assert decode_snapshot(data) == {"symbol": "ETH/USDT", "note": "снапшот", "decision": {"action": "BUY"}}
+    with pytest.raises(ValueError):
+        decode_snapshot(b"{broken")
+
+
+def test_file_state_snapshot_store_compressed_roundtrip(tmp_path) -> None:
+    from src.infrastructure.state.snapshot_codec import ZSTD_AVAILABLE
+
+    store = FileStateSnapshotStore(base_dir=tmp_path, compress=True)
+    snapshot = {"symbol": "BTC/USDT", "decisions_history": [{"action": "HOLD"}] * 50}
+
+    store.save_snapshot("local:BTC/USDT", snapshot)
+
+    assert store.load_snapshot("local:BTC/USDT") == snapshot
+    # Без zstandard хранилище откатывается на обычный JSON.
+    suffix = "*.json.zst" if ZSTD_AVAILABLE else "*.json"
+    assert [p.name for p in tmp_path.glob(suffix)] == ["local_BTC__USDT" + suffix[1:]]
+
+
+class _PassthroughZstdCodec:
+    """Подмена zstd‑кодека без zstandard: файлы ``.zst`` содержат JSON."""
+
+    def encode(self, snapshot: Dict[str, Any]) -> bytes:
+        return encode_snapshot(snapshot)
+
+    def decode(self, data) -> Any:
+        return decode_snapshot(data)
+
+
+def test_file_state_snapshot_store_loads_snapshot_across_compression_switch(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(store_module, "ZSTD_AVAILABLE", True)
+    monkeypatch.setattr(store_module, "ZstdSnapshotCodec", _PassthroughZstdCodec)
+    snapshot = {"symbol": "BTC/USDT", "ticker_id": 42}
+
+    # Снапшот записан без сжатия, затем включили STATE_SNAPSHOT_COMPRESS
+    FileStateSnapshotStore(base_dir=tmp_path).save_snapshot("local:BTC/USDT", snapshot)
+    compressed_store = FileStateSnapshotStore(base_dir=tmp_path, compress=True)
+    assert compressed_store.load_snapshot("local:BTC/USDT") == snapshot
+
+    # И обратно: есть только .zst, сжатие выключили
+    compressed_store.save_snapshot("local:ETH/USDT", snapshot)
+    assert [p.name for p in tmp_path.glob("local_ETH*")] == ["local_ETH__USDT.json.zst"]
+    assert FileStateSnapshotStore(base_dir=tmp_path).load_snapshot("local:ETH/USDT") == snapshot
+
+
+def test_file_state_snapshot_store_load_rejects_empty_and_corrupt_files(tmp_path) -> None:
+    store = FileStateSnapshotStore(base_dir=tmp_path)
+    store.save_snapshot("local:BTC/USDT", {"symbol": "BTC/USDT", "ticker_id": 7})
+    path = tmp_path / "local_BTC__USDT.json"
+
+    assert store.load_snapshot("local:BTC/USDT") == {"symbol": "BTC/USDT", "ticker_id": 7}
+
+    path.write_bytes(b"")
+    assert store.load_snapshot("local:BTC/USDT") is None
+
+    path.write_bytes(b"{not json")
+    assert store.load_snapshot("local:BTC/USDT") is None
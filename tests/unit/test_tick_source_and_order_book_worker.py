@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 from collections import deque
-from typing import Any, AsyncIterator, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
 import pytest
 
@@ -12,7 +12,7 @@ from src.application.workers.order_book_refresh_worker import (
 from src.config.config import AppConfig
 from src.domain.interfaces.cache import IMarketCache
 from src.domain.services.indicators.indicator_engine import compute_indicators
-from src.domain.services.ticker.ticker_source import Ticker, TickSource
+from src.domain.services.ticker.ticker_source import Ticker, TickSource, iter_bursts
 from src.infrastructure.connectors.interfaces.exchange_connector import (
     IExchangeConnector,
 )
@@ -31,22 +31,9 @@ class FakeExchangeConnector(IExchangeConnector):
 
     async def stream_ticks(self, symbol: str) -> AsyncIterator[Ticker]:  # type: ignore[override]
         while self._ticks:
-            # Вернём тик в унифицированном формате, совместимом с доменным Ticker.
-            tick = self._ticks.popleft()
-            yield Ticker(
-                symbol=tick["symbol"],
-                timestamp=tick["timestamp"],
-                datetime=tick["datetime"],
-                last=tick["last"],
-                open=tick["open"],
-                high=tick["high"],
-                low=tick["low"],
-                close=tick["close"],
-                bid=tick["bid"],
-                ask=tick["ask"],
-                baseVolume=tick["baseVolume"],
-                quoteVolume=tick["quoteVolume"],
-            )
+            # Тик уже в унифицированном формате доменного Ticker: отдаём
+            # поверхностную копию, без перепаковки по полям.
+            yield dict(self._ticks.popleft())  # type: ignore[misc]
 
     async def fetch_order_book(self, symbol: str) -> dict:  # type: ignore[override]
         return self._order_book
@@ -154,20 +141,17 @@ def test_order_book_refresh_worker_updates_cache_once() -> None:
 
     cfg = AppConfig(order_book_refresh_interval_seconds=0.0)
 
-    # Флаг остановки после первого цикла
-    calls: List[int] = []
-
-    def is_stopped() -> bool:
-        return bool(calls)
+    # Событие остановки поднято заранее: воркер делает одно обновление
+    stop_event = asyncio.Event()
+    stop_event.set()
 
     async def runner() -> None:
-        calls.append(1)
         await order_book_refresh_worker(
             connector,
             cache,
             symbol,
             cfg,
-            is_stopped=is_stopped,
+            stop_event=stop_event,
         )
 
     asyncio.run(runner())
@@ -177,6 +161,29 @@ def test_order_book_refresh_worker_updates_cache_once() -> None:
     assert cache.orderbook["asks"][0][0] == 11.0
 
 
+@pytest.mark.unit
+def test_order_book_refresh_worker_stops_on_event_without_waiting_interval() -> None:
+    symbol = "ETH/USDT"
+    order_book = {"bids": [[10.0, 1.0]], "asks": [[11.0, 2.0]], "symbol": symbol}
+    connector = FakeExchangeConnector(ticks=[], order_book=order_book)
+    cache = FakeMarketCache(symbol)
+    cfg = AppConfig(order_book_refresh_interval_seconds=60.0)
+
+    async def runner() -> None:
+        stop_event = asyncio.Event()
+        task = asyncio.create_task(
+            order_book_refresh_worker(connector, cache, symbol, cfg, stop_event=stop_event)
+        )
+        await asyncio.sleep(0)
+        stop_event.set()
+        # Интервал 60 с, но воркер просыпается по событию сразу
+        await asyncio.wait_for(task, timeout=1.0)
+
+    asyncio.run(runner())
+
+    assert cache.orderbook is not None
+
+
 @pytest.mark.unit
 def test_compute_indicators_uses_price_history_and_triggers() -> None:
     from src.infrastructure.cache.in_memory import InMemoryIndicatorStore
@@ -208,6 +215,7 @@ def test_compute_indicators_uses_price_history_and_triggers() -> None:
 
     history = context["price_history"][symbol]
     assert len(history) >= 5
+    assert history.tail(3).tolist() == [102.0, 103.0, 104.0]
 
     # На тике 4 medium_interval == 2, поэтому SMA medium должна посчитаться
     snapshot_last = compute_indicators(
@@ -216,3 +224,233 @@ def test_compute_indicators_uses_price_history_and_triggers() -> None:
 
     assert snapshot_last["symbol"] == symbol
     assert "sma_fast_5" in snapshot_last or "sma_medium_20" in snapshot_last
+    # Базовые поля идут первыми, "sma" берётся из SMA‑7
+    assert list(snapshot_last)[:6] == ["symbol", "ticker_id", "price", "sma", "rsi", "ts"]
+    assert snapshot_last["sma"] == snapshot_last["sma_7"]
+    # Каждый тик — отдельный snapshot в истории
+    indicators_history = context["indicators_history"][symbol]
+    assert indicators_history[-1] is snapshot_last
+    assert indicators_history[-2] is not snapshot_last
+    assert indicators_history[-2]["ticker_id"] == 5
+
+
+@pytest.mark.unit
+def test_compute_indicators_skips_layers_when_no_gate_fires() -> None:
+    from src.infrastructure.cache.in_memory import InMemoryIndicatorStore
+    from src.domain.entities.currency_pair import CurrencyPair
+
+    symbol = "BTC/USDT"
+    cfg = AppConfig(indicator_fast_interval=2, indicator_medium_interval=4, indicator_heavy_interval=8)
+    store = InMemoryIndicatorStore(CurrencyPair(symbol, "BTC", "USDT"), cfg)
+    context: Dict[str, Any] = {"market": {symbol: {"ts": 1}}, "indicator_stores": {symbol: store}}
+
+    for tid in range(1, 8):
+        snapshot = compute_indicators(context, ticker_id=tid, symbol=symbol, price=100.0 + tid)
+
+    # Тик 7 нечётный: ни один слой не срабатывает, остаются базовые поля
+    assert list(snapshot) == ["symbol", "ticker_id", "price", "sma", "rsi", "ts"]
+    assert snapshot["sma"] == 107.0
+    assert list(store.fast_history) == [102.0, 104.0, 106.0]
+    assert list(store.medium_history) == [104.0]
+    assert len(store.heavy_history) == 0
+
+
+@pytest.mark.unit
+def test_iter_bursts_preserves_order_and_propagates_errors() -> None:
+    async def ticks() -> AsyncIterator[int]:
+        for i in range(5):
+            yield i
+            if i == 2:
+                # Отдаём управление: дальше приходит новая пачка.
+                await asyncio.sleep(0)
+        raise RuntimeError("stream closed")
+
+    async def collect() -> List[List[int]]:
+        bursts: List[List[int]] = []
+        with pytest.raises(RuntimeError, match="stream closed"):
+            async for burst in iter_bursts(ticks()):
+                bursts.append(burst)
+        return bursts
+
+    bursts = asyncio.run(collect())
+
+    assert [x for burst in bursts for x in burst] == [0, 1, 2, 3, 4]
+    assert len(bursts) < 5
+
+
+@pytest.mark.unit
+def test_iter_bursts_caps_burst_size() -> None:
+    async def ticks() -> AsyncIterator[int]:
+        for i in range(10):
+            yield i
+
+    async def collect() -> List[List[int]]:
+        return [burst async for burst in iter_bursts(ticks(), max_burst=4)]
+
+    bursts = asyncio.run(collect())
+
+    assert [x for burst in bursts for x in burst] == list(range(10))
+    assert max(len(burst) for burst in bursts) <= 4
+
+    with pytest.raises(ValueError, match="max_burst"):
+        asyncio.run(iter_bursts(ticks(), max_burst=0).__anext__())
+
+
+@pytest.mark.unit
+def test_iter_bursts_applies_backpressure_and_closes_source() -> None:
+    produced: List[int] = []
+
+    async def run() -> Tuple[List[int], bool]:
+        source_closed = False
+
+        async def ticks() -> AsyncIterator[int]:
+            nonlocal source_closed
+            try:
+                for i in range(1_000):
+                    produced.append(i)
+                    yield i
+            finally:
+                source_closed = True
+
+        bursts = iter_bursts(ticks(), max_burst=4)
+        first = await bursts.__anext__()
+        # Потребитель «отстал»: источник не должен убежать дальше очереди.
+        for _ in range(10):
+            await asyncio.sleep(0)
+        await bursts.aclose()
+        return first, source_closed
+
+    first, source_closed = asyncio.run(run())
+
+    assert first == [0, 1, 2, 3]
+    # Пачка + полная очередь + элемент, ждущий на put
+    assert len(produced) <= 4 + 4 + 1
+    # aclose() дожидается отмены перекачки: источник уже закрыт
+    assert source_closed
+
+
+def test_generate_ticks_yields_python_floats_for_requested_count() -> None:
+    from src.domain.services.market_data.ticker_source import generate_ticks
+
+    ticks = list(generate_ticks("BTC/USDT", max_ticks=4, sleep_sec=0))
+
+    assert [tick["symbol"] for tick in ticks] == ["BTC/USDT"] * 4
+    assert all(type(tick["price"]) is float for tick in ticks)
+    assert list(generate_ticks("BTC/USDT", max_ticks=0, sleep_sec=0)) == []
+
+
+def test_sma_kernel_matches_plain_average() -> None:
+    import numpy as np
+
+    from src.domain.services.indicators._kernels import sma_last
+
+    prices = np.asarray([100.0, 101.5, 99.25, 102.0, 103.75, 98.5], dtype=np.float64)
+
+    assert sma_last(prices, 1) == 98.5
+    assert sma_last(prices, 5) == sum([101.5, 99.25, 102.0, 103.75, 98.5]) / 5
+    assert sma_last(prices, 6) == sum(prices.tolist()) / 6
+
+
+def test_compute_indicators_falls_back_to_deque_history_without_numpy(monkeypatch) -> None:
+    from collections import deque
+
+    from src.domain.services.indicators import indicator_engine
+    from src.domain.services.indicators._kernels import _sma_last_py
+    from src.infrastructure.cache.in_memory import InMemoryIndicatorStore
+    from src.domain.entities.currency_pair import CurrencyPair
+
+    monkeypatch.setattr(indicator_engine, "FloatRing", None)
+    monkeypatch.setattr(indicator_engine, "sma_last", _sma_last_py)
+
+    symbol = "BTC/USDT"
+    store = InMemoryIndicatorStore(CurrencyPair(symbol, "BTC", "USDT"), AppConfig(indicator_fast_interval=1))
+    context: Dict[str, Any] = {"market": {symbol: {"ts": 1}}, "indicator_stores": {symbol: store}}
+
+    for tid in range(1, 7):
+        snapshot = compute_indicators(context, ticker_id=tid, symbol=symbol, price=100.0 + tid)
+
+    assert isinstance(context["price_history"][symbol], deque)
+    assert snapshot["sma_fast_5"] == sum([102.0, 103.0, 104.0, 105.0, 106.0]) / 5
+    assert type(snapshot["sma_7"]) is float
+
+
+@pytest.mark.unit
+def test_ticker_source_coerces_raw_field_types() -> None:
+    symbol = "BTC/USDT"
+    raw = {
+        "symbol": symbol,
+        "timestamp": "5",
+        "datetime": "2023-01-01T00:00:05Z",
+        "last": "100.5",
+        "open": 100,
+        "high": 101,
+        "low": 99,
+        "close": 100,
+        "bid": 100,
+        "ask": 101,
+        "baseVolume": 1,
+        "quoteVolume": 100,
+        "info": {"ignored": True},
+    }
+    connector = FakeExchangeConnector(ticks=[raw], order_book={})  # type: ignore[list-item]
+
+    out_ticks = asyncio.run(_drain_ticker_source(TickSource(connector, symbol), limit=1))
+
+    assert out_ticks == [
+        {
+            "symbol": symbol,
+            "timestamp": 5,
+            "datetime": "2023-01-01T00:00:05Z",
+            "last": 100.5,
+            "open": 100.0,
+            "high": 101.0,
+            "low": 99.0,
+            "close": 100.0,
+            "bid": 100.0,
+            "ask": 101.0,
+            "baseVolume": 1.0,
+            "quoteVolume": 100.0,
+        }
+    ]
+    assert all(type(out_ticks[0][key]) is float for key in ("last", "open", "baseVolume"))
+
+
+@pytest.mark.unit
+def test_ccxt_pro_connector_normalizes_watched_ticker() -> None:
+    from src.infrastructure.connectors.ccxt_pro_exchange_connector import CcxtProExchangeConnector
+
+    raw = {
+        "timestamp": "7",
+        "datetime": "2025-01-01T00:00:00Z",
+        "last": "10.5",
+        "open": 10,
+        "high": 11,
+        "low": 9,
+        "close": 10,
+        "bid": 10,
+        "ask": 11,
+        "baseVolume": 2,
+        "quoteVolume": 21,
+    }
+
+    class _Exchange:
+        async def watch_tickers(self, symbols: List[str]) -> Dict[str, Any]:
+            return {symbols[0]: raw}
+
+    # Без ccxt.pro конструктор недоступен: собираем объект вручную.
+    connector = object.__new__(CcxtProExchangeConnector)
+    connector._exchange = _Exchange()
+
+    async def first_tick() -> Dict[str, Any]:
+        stream = connector.stream_ticks("BTC/USDT")
+        try:
+            return await stream.__anext__()
+        finally:
+            await stream.aclose()
+
+    tick = asyncio.run(first_tick())
+
+    assert tick["symbol"] == "BTC/USDT"
+    assert tick["timestamp"] == 7
+    assert tick["last"] == 10.5
+    assert type(tick["quoteVolume"]) is float